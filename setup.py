@@ -11,5 +11,8 @@ setup(
         "requests>=2.31.0",
         "packaging>=24.0",
     ],
+    extras_require={
+        "parquet": ["pyarrow>=14.0"],
+    },
     python_requires=">=3.8",
 )
\ No newline at end of file
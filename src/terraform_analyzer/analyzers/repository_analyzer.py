@@ -1,16 +1,33 @@
+import glob
+import hashlib
 import tempfile
 import os
 import shutil
+import time
 import git
-from ..models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
+from dataclasses import replace
+from typing import Callable, List, Optional
+from ..models.repository import RepositoryInfo, AnalysisResult, ProviderVersion, CloneStats
+from ..models.history import HistoryEntry
 from ..models.exceptions import RepositoryAnalysisError
+from ..utils.filesystem import disk_usage
+from ..utils.git_mirror_cache import GitMirrorCache
+from .static_analyzer import LOCK_FILE_NAME, StaticAnalyzer
 from .terraform_analyzer import TerraformAnalyzer
 
 class RepositoryAnalyzer:
-    def __init__(self, repository: RepositoryInfo):
+    CLONE_STRATEGIES = ('full', 'shallow', 'blobless', 'sparse')
+    DEFAULT_CLONE_STRATEGY = 'full'
+
+    def __init__(self, repository: RepositoryInfo, mirror_cache: Optional[GitMirrorCache] = None):
         self.repository = repository
+        self.mirror_cache = mirror_cache
         self.temp_dir = None
         self.repo_path = None
+        self.clone_stats = None
+        self.commit_sha = None
+        self.timings = {}
+        self.checkout_paths = [repository.terraform_path]  # Paths needed from the checkout
 
     def __enter__(self):
         self.temp_dir = tempfile.mkdtemp()
@@ -21,14 +38,53 @@ class RepositoryAnalyzer:
         if self.temp_dir and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
 
+    @property
+    def clone_strategy(self) -> str:
+        strategy = self.repository.clone_strategy or self.DEFAULT_CLONE_STRATEGY
+        if strategy not in self.CLONE_STRATEGIES:
+            raise RepositoryAnalysisError(f"Unknown clone strategy: {strategy}")
+        return strategy
+
+    def _sparse_paths(self) -> List[str]:
+        """Return the checkout paths relative to the repository root, or [] for the whole tree."""
+        paths = [path.strip('/') for path in self.checkout_paths]
+        if any(path in ('', '.') for path in paths):
+            return []
+        return sorted(set(paths))
+
     def _clone_repository(self):
         """Clone the repository to a temporary directory."""
+        strategy = self.clone_strategy
+        branch = self.repository.branch if self.repository.branch else None
+        start = time.monotonic()
         try:
-            git.Repo.clone_from(
-                self.repository.repository,
-                self.repo_path,
-                branch=self.repository.branch if self.repository.branch else None
-            )
+            repo = None
+            if self.mirror_cache is not None:
+                self._checkout_from_mirror(strategy, branch)
+                strategy = f"mirror:{strategy}"
+            elif strategy == 'shallow':
+                repo = git.Repo.clone_from(self.repository.repository, self.repo_path, branch=branch, depth=1)
+            elif strategy == 'blobless':
+                repo = git.Repo.clone_from(self.repository.repository, self.repo_path, branch=branch,
+                                           filter='blob:none')
+            elif strategy == 'sparse':
+                sparse_paths = self._sparse_paths()
+                repo = git.Repo.clone_from(self.repository.repository, self.repo_path, branch=branch,
+                                           depth=1, filter='blob:none', no_checkout=True)
+                # Only the blobs of the terraform paths are downloaded by the checkout
+                if sparse_paths:
+                    repo.git.sparse_checkout('set', *sparse_paths)
+                repo.git.checkout()
+            else:
+                repo = git.Repo.clone_from(
+                    self.repository.repository,
+                    self.repo_path,
+                    branch=branch
+                )
+            if repo is not None:
+                self.commit_sha = repo.head.commit.hexsha
+        except RepositoryAnalysisError:
+            raise
         except git.exc.GitCommandError as e:
             if "not found" in str(e):
                 raise RepositoryAnalysisError(f"Repository not found: {self.repository.repository}")
@@ -39,6 +95,108 @@ class RepositoryAnalyzer:
         except Exception as e:
             raise RepositoryAnalysisError(f"Unexpected error during clone: {str(e)}")
 
+        self.clone_stats = CloneStats(
+            strategy=strategy,
+            duration=time.monotonic() - start,
+            size=disk_usage(self.repo_path)
+        )
+
+    def _checkout_from_mirror(self, strategy: str, branch: Optional[str]):
+        """Fetch the persistent mirror of the repository and export the analyzed tree from it."""
+        mirror_path, commit = self.mirror_cache.update(
+            self.repository.repository,
+            branch,
+            shallow=strategy in ('shallow', 'sparse')
+        )
+        paths = self._sparse_paths() if strategy == 'sparse' else []
+        self.mirror_cache.export(mirror_path, commit, self.repo_path, paths)
+        self.commit_sha = commit
+
+    def _remote_commit(self) -> Optional[str]:
+        """Return the commit the analyzed branch points to on the remote, without cloning."""
+        ref = f"refs/heads/{self.repository.branch}" if self.repository.branch else 'HEAD'
+        try:
+            output = git.cmd.Git().ls_remote(self.repository.repository, ref)
+        except git.exc.GitCommandError:
+            # Fall back to a clone, which reports the error if the repository is unreachable
+            return None
+        for line in output.splitlines():
+            sha, _, name = line.partition('\t')
+            if name == ref:
+                return sha
+        return None
+
+    @staticmethod
+    def _analysis_mode() -> str:
+        return 'static' if TerraformAnalyzer.static_analysis else 'terraform'
+
+    @classmethod
+    def _fingerprint(cls, terraform_path: str) -> str:
+        """Hash what determines the analysis of a Terraform directory.
+
+        The dependency lock file and the `*.tf` files declaring `required_version` are
+        used when the lock file is committed, the whole directory otherwise. The hash is
+        prefixed with the analysis mode, as static and Terraform analyses differ.
+        """
+        lock_file = os.path.join(terraform_path, LOCK_FILE_NAME)
+        digest = hashlib.sha256()
+        if os.path.isfile(lock_file):
+            paths = [lock_file] + sorted(glob.glob(os.path.join(terraform_path, '*.tf')))
+            kind = 'lock'
+        else:
+            paths = []
+            for root, dirs, files in os.walk(terraform_path):
+                dirs[:] = sorted(d for d in dirs if d not in ('.terraform', '.git'))
+                paths.extend(os.path.join(root, name) for name in sorted(files))
+            kind = 'tree'
+
+        for path in paths:
+            digest.update(os.path.relpath(path, terraform_path).encode() + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+            digest.update(b'\0')
+        return f"{cls._analysis_mode()}:{kind}:{digest.hexdigest()}"
+
+    def _matches(self, previous: Optional[HistoryEntry]) -> bool:
+        """Check that a history entry was produced by a successful analysis of the same configuration."""
+        return (
+            previous is not None
+            and not previous.error
+            and previous.repository.repository == self.repository.repository
+            and previous.repository.terraform_path == self.repository.terraform_path
+            and previous.repository.branch == self.repository.branch
+            and (previous.fingerprint or '').startswith(f"{self._analysis_mode()}:")
+        )
+
+    def _reuse(self, previous: HistoryEntry, resolve_latest: bool) -> AnalysisResult:
+        """Build a result from the selections stored in history; only latest versions are refreshed."""
+        provider_versions = {
+            name: ProviderVersion(
+                current_version=info['current_version'],
+                latest_version=None,
+                constraint=info.get('constraint')
+            )
+            for name, info in previous.provider_versions.items()
+        }
+        if resolve_latest:
+            indexes = TerraformAnalyzer.resolve_version_indexes(provider_versions)
+            for name, version in provider_versions.items():
+                if name in indexes:
+                    for field, value in TerraformAnalyzer.describe_version(
+                        indexes[name], version.current_version, version.constraint
+                    ).items():
+                        setattr(version, field, value)
+        return AnalysisResult(
+            repository=self.repository,
+            terraform_version=previous.terraform_version,
+            installed_terraform_version=os.environ.get('TERRAFORM_VERSION'),
+            provider_versions=provider_versions,
+            clone_stats=self.clone_stats,
+            commit_sha=self.commit_sha or previous.commit_sha,
+            fingerprint=previous.fingerprint,
+            unchanged=True
+        )
+
     def _verify_terraform_path(self):
         """Verify that the Terraform directory exists."""
         terraform_path = os.path.join(self.repo_path, self.repository.terraform_path)
@@ -46,38 +204,170 @@ class RepositoryAnalyzer:
             raise RepositoryAnalysisError(f"Terraform path does not exist: {terraform_path}")
         return terraform_path
 
-    def analyze(self):
-        """Analyze the repository."""
+    def _member(self, repository: RepositoryInfo) -> 'RepositoryAnalyzer':
+        """Return an analyzer of another entry sharing this analyzer's checkout."""
+        member = RepositoryAnalyzer(repository, mirror_cache=self.mirror_cache)
+        member.repo_path = self.repo_path
+        member.commit_sha = self.commit_sha
+        return member
+
+    def _discover(self, repository: RepositoryInfo) -> List[RepositoryInfo]:
+        """Expand a discovery entry into one entry per root module found in the checkout."""
+        root = self._verify_terraform_path()
+        modules = StaticAnalyzer.find_root_modules(root)
+        if not modules:
+            raise RepositoryAnalysisError(f"No Terraform root module found under {repository.terraform_path}")
+        return [
+            replace(
+                repository,
+                name=repository.name if module == '.' else f"{repository.name}/{module}",
+                terraform_path=os.path.normpath(os.path.join(repository.terraform_path, module)),
+                discover=False
+            )
+            for module in modules
+        ]
+
+    def _error(self, repository: RepositoryInfo, error: Exception) -> AnalysisResult:
+        return AnalysisResult(
+            repository=repository,
+            terraform_version=None,
+            installed_terraform_version=os.environ.get('TERRAFORM_VERSION'),
+            provider_versions={},
+            error=str(error),
+            clone_stats=self.clone_stats,
+            timings=self.timings
+        )
+
+    def analyze(self, resolve_latest: bool = True, previous: Optional[HistoryEntry] = None):
+        """Analyze the repository.
+
+        With `resolve_latest=False` only the provider selections are extracted and
+        `latest_version` is left empty, to be resolved later for the whole run.
+        When `previous` is the last successful history entry of the repository, the
+        analysis is skipped if the remote commit or the Terraform fingerprint did not change.
+        """
+        if self.repository.discover:
+            return self.analyze_many([self.repository], resolve_latest, lambda repository: previous)[0][0]
         try:
+            if not self._matches(previous):
+                previous = None
+
+            if previous is not None and previous.commit_sha:
+                if self._remote_commit() == previous.commit_sha:
+                    return self._reuse(previous, resolve_latest)
+
             self._clone_repository()
-            terraform_path = self._verify_terraform_path()
-            
+            if self.clone_stats:
+                self.timings['clone'] = self.clone_stats.duration
+            return self._analyze_checkout(resolve_latest, previous)
+        except Exception as e:
+            return self._error(self.repository, e)
+
+    def analyze_many(self, repositories: List[RepositoryInfo], resolve_latest: bool = True,
+                     get_previous: Optional[Callable[[RepositoryInfo], Optional[HistoryEntry]]] = None
+                     ) -> List[List[AnalysisResult]]:
+        """Analyze several entries of this repository and branch from a single checkout.
+
+        Returns one list of results per entry: a discovery entry yields a result per root
+        module found, the others a single result. Clone statistics are reported on the
+        first result only. `get_previous` returns the last successful history entry of an
+        entry, to skip unchanged entries as in `analyze`.
+        """
+        get_previous = get_previous or (lambda repository: None)
+        self.checkout_paths = [repository.terraform_path for repository in repositories]
+        results: List[Optional[List[AnalysisResult]]] = [None] * len(repositories)
+
+        previous_entries = {}
+        for index, repository in enumerate(repositories):
+            if not repository.discover:
+                previous = get_previous(repository)
+                previous_entries[index] = previous if self._member(repository)._matches(previous) else None
+
+        # Entries whose branch did not move are reused without cloning
+        if any(previous is not None and previous.commit_sha for previous in previous_entries.values()):
+            remote_commit = self._remote_commit()
+            for index, previous in previous_entries.items():
+                if previous is not None and previous.commit_sha == remote_commit:
+                    results[index] = [self._member(repositories[index])._reuse(previous, resolve_latest)]
+
+        if all(entry_results is not None for entry_results in results):
+            return results
+
+        try:
+            self._clone_repository()
+        except Exception as e:
+            for index, repository in enumerate(repositories):
+                if results[index] is None:
+                    results[index] = [self._error(repository, e)]
+            return results
+
+        first = True
+        for index, repository in enumerate(repositories):
+            if results[index] is not None:
+                continue
+            try:
+                members = self._member(repository)._discover(repository) if repository.discover else [repository]
+            except Exception as e:
+                results[index] = [self._error(repository, e)]
+                continue
+
+            results[index] = []
+            for member_repository in members:
+                member = self._member(member_repository)
+                if first and self.clone_stats:
+                    member.clone_stats = self.clone_stats
+                    member.timings['clone'] = self.clone_stats.duration
+                    first = False
+                if repository.discover:
+                    previous = get_previous(member_repository)
+                    previous = previous if member._matches(previous) else None
+                else:
+                    previous = previous_entries[index]
+                try:
+                    results[index].append(member._analyze_checkout(resolve_latest, previous))
+                except Exception as e:
+                    results[index].append(member._error(member_repository, e))
+        return results
+
+    def _analyze_checkout(self, resolve_latest: bool, previous: Optional[HistoryEntry]) -> AnalysisResult:
+        """Analyze the Terraform directory of the entry in the checkout."""
+        terraform_path = self._verify_terraform_path()
+        try:
+            fingerprint = self._fingerprint(terraform_path)
+            if previous is not None and previous.fingerprint == fingerprint:
+                return self._reuse(previous, resolve_latest)
+
             # Get installed Terraform version from environment
             installed_terraform_version = os.environ.get('TERRAFORM_VERSION')
-            
-            # Use TerraformAnalyzer as a class method
-            terraform_version, provider_info = TerraformAnalyzer.analyze_directory(terraform_path)
-            
+
+            if resolve_latest:
+                # Use TerraformAnalyzer as a class method
+                terraform_version, provider_info = TerraformAnalyzer.analyze_directory(terraform_path)
+            else:
+                terraform_version, selections = TerraformAnalyzer.extract_directory(terraform_path)
+                constraints = StaticAnalyzer.read_constraints(terraform_path)
+                provider_info = {
+                    name: {'current_version': current_version, 'latest_version': None,
+                           'constraint': constraints.get(name)}
+                    for name, current_version in selections.items()
+                }
+
             # Convert provider info to ProviderVersion objects
             provider_versions = {
-                name: ProviderVersion(
-                    current_version=info['current_version'],
-                    latest_version=info['latest_version']
-                )
+                name: ProviderVersion(**info)
                 for name, info in provider_info.items()
             }
-            
+
             return AnalysisResult(
                 repository=self.repository,
                 terraform_version=terraform_version,
                 installed_terraform_version=installed_terraform_version,
-                provider_versions=provider_versions
+                provider_versions=provider_versions,
+                clone_stats=self.clone_stats,
+                commit_sha=self.commit_sha,
+                fingerprint=fingerprint,
+                timings=self.timings
             )
-        except Exception as e:
-            return AnalysisResult(
-                repository=self.repository,
-                terraform_version=None,
-                installed_terraform_version=os.environ.get('TERRAFORM_VERSION'),
-                provider_versions={},
-                error=str(e)
-            )
\ No newline at end of file
+        finally:
+            # The result shares self.timings, so the terraform timings recorded by the runner land in it
+            self.timings.update(TerraformAnalyzer.runner.pop_timings(terraform_path))
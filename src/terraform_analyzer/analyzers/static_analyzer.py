@@ -0,0 +1,199 @@
+import glob
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from ..models.exceptions import TerraformAnalysisError
+
+LOCK_FILE_NAME = '.terraform.lock.hcl'
+DEFAULT_REGISTRY_HOST = 'registry.terraform.io'
+
+# Strings are matched so that comment markers inside them are left alone
+_TOKEN_PATTERN = re.compile(r'"(?:[^"\\\n]|\\.)*"|#[^\n]*|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_LOCK_PROVIDER_PATTERN = re.compile(r'provider\s+"([^"]+)"\s*\{')
+_TERRAFORM_BLOCK_PATTERN = re.compile(r'(?:^|\n)\s*terraform\s*\{')
+_REQUIRED_VERSION_PATTERN = re.compile(r'required_version\s*=\s*"([^"]*)"')
+_REQUIRED_PROVIDERS_PATTERN = re.compile(r'required_providers\s*\{')
+_PROVIDER_OBJECT_PATTERN = re.compile(r'([A-Za-z_][\w-]*)\s*=\s*\{([^{}]*)\}')
+_PROVIDER_LEGACY_PATTERN = re.compile(r'([A-Za-z_][\w-]*)\s*=\s*"([^"]*)"')
+_LOCAL_MODULE_SOURCE_PATTERN = re.compile(r'source\s*=\s*"(\.\.?/[^"]*)"')
+# Directories never holding analyzed code
+_SKIPPED_DIRECTORIES = {'.git', '.terraform'}
+
+
+def _attribute(body: str, name: str) -> Optional[str]:
+    match = re.search(rf'(?:^|\s){name}\s*=\s*"([^"]*)"', body)
+    return match.group(1) if match else None
+
+
+class StaticAnalyzer:
+    """Extract version information from committed Terraform files, without the terraform binary."""
+
+    @staticmethod
+    def _strip_comments(text: str) -> str:
+        return _TOKEN_PATTERN.sub(lambda m: m.group(0) if m.group(0).startswith('"') else ' ', text)
+
+    @staticmethod
+    def _block_body(text: str, open_brace: int) -> str:
+        """Return the content of the block whose opening brace is at `open_brace`."""
+        depth = 0
+        in_string = False
+        index = open_brace
+        while index < len(text):
+            char = text[index]
+            if in_string:
+                if char == '\\':
+                    index += 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[open_brace + 1:index]
+            index += 1
+        raise TerraformAnalysisError("Unbalanced braces in Terraform file")
+
+    @staticmethod
+    def normalize_source(source: str) -> str:
+        """Expand a provider source (e.g. "hashicorp/aws") into its full address."""
+        parts = source.strip().lower().split('/')
+        if len(parts) == 2:
+            parts.insert(0, DEFAULT_REGISTRY_HOST)
+        return '/'.join(parts)
+
+    @staticmethod
+    def parse_lock_file(content: str) -> Dict[str, Dict[str, Optional[str]]]:
+        """Parse a dependency lock file into {provider address: {'version', 'constraints'}}."""
+        content = StaticAnalyzer._strip_comments(content)
+        providers = {}
+        for match in _LOCK_PROVIDER_PATTERN.finditer(content):
+            body = StaticAnalyzer._block_body(content, match.end() - 1)
+            providers[StaticAnalyzer.normalize_source(match.group(1))] = {
+                'version': _attribute(body, 'version'),
+                'constraints': _attribute(body, 'constraints')
+            }
+        return providers
+
+    @staticmethod
+    def parse_terraform_blocks(content: str) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+        """Parse the `terraform {}` blocks of a file into (required_version, {provider address: constraint})."""
+        content = StaticAnalyzer._strip_comments(content)
+        required_version = None
+        required_providers = {}
+        for match in _TERRAFORM_BLOCK_PATTERN.finditer(content):
+            body = StaticAnalyzer._block_body(content, match.end() - 1)
+
+            providers_match = _REQUIRED_PROVIDERS_PATTERN.search(body)
+            providers_body = ''
+            if providers_match:
+                providers_body = StaticAnalyzer._block_body(body, providers_match.end() - 1)
+                for name, provider_body in _PROVIDER_OBJECT_PATTERN.findall(providers_body):
+                    source = _attribute(provider_body, 'source') or f"hashicorp/{name}"
+                    required_providers[StaticAnalyzer.normalize_source(source)] = _attribute(provider_body, 'version')
+                # Terraform < 0.13 syntax: aws = "~> 2.0"
+                legacy_body = _PROVIDER_OBJECT_PATTERN.sub('', providers_body)
+                for name, constraint in _PROVIDER_LEGACY_PATTERN.findall(legacy_body):
+                    required_providers[StaticAnalyzer.normalize_source(f"hashicorp/{name}")] = constraint
+
+            if required_version is None:
+                version_match = _REQUIRED_VERSION_PATTERN.search(body.replace(providers_body, ''))
+                if version_match:
+                    required_version = version_match.group(1)
+        return required_version, required_providers
+
+    @staticmethod
+    def parse_directory(terraform_path: str) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+        """Parse the `*.tf` files of a root module into (required_version, {provider address: constraint})."""
+        required_version = None
+        required_providers = {}
+        for path in sorted(glob.glob(os.path.join(terraform_path, '*.tf'))):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                file_version, file_providers = StaticAnalyzer.parse_terraform_blocks(f.read())
+            required_version = required_version or file_version
+            for provider, constraint in file_providers.items():
+                required_providers[provider] = required_providers.get(provider) or constraint
+        return required_version, required_providers
+
+    @staticmethod
+    def can_analyze(terraform_path: str) -> bool:
+        """Check that the committed lock file covers every provider required by the root module."""
+        lock_path = os.path.join(terraform_path, LOCK_FILE_NAME)
+        if not os.path.isfile(lock_path):
+            return False
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                locked = StaticAnalyzer.parse_lock_file(f.read())
+            _, required_providers = StaticAnalyzer.parse_directory(terraform_path)
+        except Exception:
+            # Let terraform report what it makes of the files
+            return False
+        # A provider missing from the lock file would be added by terraform init
+        return all(provider in locked for provider in required_providers)
+
+    @staticmethod
+    def analyze_directory(terraform_path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Return the required Terraform version and the locked provider versions of a directory."""
+        try:
+            with open(os.path.join(terraform_path, LOCK_FILE_NAME), 'r', encoding='utf-8') as f:
+                locked = StaticAnalyzer.parse_lock_file(f.read())
+            required_version, _ = StaticAnalyzer.parse_directory(terraform_path)
+        except TerraformAnalysisError:
+            raise
+        except Exception as e:
+            raise TerraformAnalysisError(f"Failed to parse Terraform directory: {str(e)}")
+
+        provider_versions = {
+            provider: info['version']
+            for provider, info in locked.items()
+            if info['version']
+        }
+        return required_version, provider_versions
+
+    @staticmethod
+    def read_constraints(terraform_path: str) -> Dict[str, str]:
+        """Return the version constraint of each provider of a root module.
+
+        The constraints recorded in the lock file, which merge those of every module, take
+        precedence over the `required_providers` blocks of the root module.
+        """
+        constraints = {}
+        try:
+            _, required_providers = StaticAnalyzer.parse_directory(terraform_path)
+            constraints.update({provider: constraint for provider, constraint in required_providers.items() if constraint})
+            lock_path = os.path.join(terraform_path, LOCK_FILE_NAME)
+            if os.path.isfile(lock_path):
+                with open(lock_path, 'r', encoding='utf-8') as f:
+                    locked = StaticAnalyzer.parse_lock_file(f.read())
+                constraints.update({provider: info['constraints'] for provider, info in locked.items() if info['constraints']})
+        except Exception:
+            # Constraints are only reported, they never fail an analysis
+            pass
+        return constraints
+
+    @staticmethod
+    def find_root_modules(root: str) -> List[str]:
+        """Return the directories under `root` holding a root module, relative to `root` and sorted.
+
+        A directory is a module when it has a lock file or a `terraform {}` block. Modules
+        used as a local `source` by another module are child modules and are left out.
+        """
+        modules = set()
+        children = set()
+        for directory, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in _SKIPPED_DIRECTORIES)
+            is_module = LOCK_FILE_NAME in files
+            for name in files:
+                if not name.endswith('.tf'):
+                    continue
+                with open(os.path.join(directory, name), 'r', encoding='utf-8', errors='replace') as f:
+                    content = StaticAnalyzer._strip_comments(f.read())
+                is_module = is_module or bool(_TERRAFORM_BLOCK_PATTERN.search(content))
+                for source in _LOCAL_MODULE_SOURCE_PATTERN.findall(content):
+                    children.add(os.path.normpath(os.path.join(directory, source)))
+            if is_module:
+                modules.add(os.path.normpath(directory))
+
+        return sorted(os.path.relpath(module, root) for module in modules - children)
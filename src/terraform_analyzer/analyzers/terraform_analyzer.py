@@ -1,9 +1,12 @@
-import json
-import subprocess
-import requests
-from packaging import version
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 from ..models.exceptions import TerraformAnalysisError
+from ..utils.registry_client import RegistryClient
+from ..utils.registry_cache import RegistryCache
+from ..utils.registry_snapshot import RegistrySnapshot
+from ..utils.plugin_cache import PluginCache
+from .static_analyzer import StaticAnalyzer
+from .terraform_runner import TerraformRunner
+from .version_index import ProviderVersionIndex, is_prerelease
 
 class RepositoryAnalysisError(Exception):
     """Custom exception for repository analysis errors"""
@@ -12,42 +15,130 @@ class RepositoryAnalysisError(Exception):
 class TerraformAnalyzer:
     REGISTRY_API_URL = "https://registry.terraform.io/v1/providers"
     include_prerelease = False  # Class level flag to control prerelease versions
+    static_analysis = False  # Class level flag to read lock files instead of running terraform
+    registry_client = RegistryClient(REGISTRY_API_URL)  # Shared by all analyses of a run
+    plugin_cache: Optional[PluginCache] = None  # Shared TF_PLUGIN_CACHE_DIR for terraform init
+    runner = TerraformRunner()  # Runs terraform commands with timeouts and memoized outputs
 
     @classmethod
     def set_include_prerelease(cls, value: bool):
         """Set whether to include prerelease versions."""
         cls.include_prerelease = value
 
+    @classmethod
+    def set_static_analysis(cls, value: bool):
+        """Set whether committed lock files are parsed instead of running terraform."""
+        cls.static_analysis = value
+
+    @classmethod
+    def set_terraform_timeout(cls, seconds: float):
+        """Set the timeout of each terraform command."""
+        cls.runner.timeout = seconds
+
+    @classmethod
+    def set_plugin_cache(cls, plugin_cache: Optional[PluginCache]):
+        """Set the provider plugin cache shared by terraform init (None disables it)."""
+        cls.plugin_cache = plugin_cache
+
+    @classmethod
+    def set_registry_concurrency(cls, max_workers: int):
+        """Set how many registry lookups may run concurrently."""
+        client = cls.registry_client
+        client.close()
+        cls.registry_client = RegistryClient(client.base_url, max_workers=max_workers, cache=client.cache,
+                                             protocol=client.protocol)
+
+    @classmethod
+    def set_registry_url(cls, url: str, protocol: str = 'registry'):
+        """Set the registry looked up, or a provider network mirror with the 'mirror' protocol."""
+        client = cls.registry_client
+        client.close()
+        cls.registry_client = RegistryClient(url, max_workers=client.max_workers, cache=client.cache,
+                                             protocol=protocol)
+
+    @classmethod
+    def set_registry_snapshot(cls, path: str):
+        """Look provider versions up in a snapshot file or provider mirror directory instead of the registry."""
+        cls.registry_client.close()
+        cls.registry_client = RegistrySnapshot.load(path)
+
+    @classmethod
+    def set_registry_cache(cls, cache: Optional[RegistryCache]):
+        """Set the persistent cache used for registry lookups (None disables it)."""
+        cls.registry_client.cache = cache
+
     @staticmethod
     def analyze_directory(terraform_path: str) -> Tuple[Optional[str], Dict[str, Dict[str, str]]]:
         """Analyze a Terraform directory to extract version information."""
+        terraform_version, provider_versions = TerraformAnalyzer.extract_directory(terraform_path)
+        constraints = StaticAnalyzer.read_constraints(terraform_path)
+        try:
+            indexes = TerraformAnalyzer.resolve_version_indexes(provider_versions)
+        except Exception as e:
+            raise TerraformAnalysisError(f"Failed to analyze Terraform directory: {str(e)}")
+
+        # Combine current and latest versions
+        provider_info = {}
+        for provider, current_version in provider_versions.items():
+            provider_info[provider] = {
+                "current_version": current_version,
+                "latest_version": None,
+                "constraint": constraints.get(provider)
+            }
+            if provider in indexes:
+                provider_info[provider].update(TerraformAnalyzer.describe_version(
+                    indexes[provider], current_version, constraints.get(provider)
+                ))
+
+        return terraform_version, provider_info
+
+    @staticmethod
+    def extract_directory(terraform_path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Extract the Terraform version and provider selections of a directory, without registry lookups.
+
+        In static mode, the committed lock file is parsed and terraform only runs when it is
+        missing or incomplete; the Terraform version is then the `required_version` constraint.
+        """
+        if TerraformAnalyzer.static_analysis and StaticAnalyzer.can_analyze(terraform_path):
+            return StaticAnalyzer.analyze_directory(terraform_path)
         try:
-            terraform_init_result = TerraformAnalyzer._terraform_init(terraform_path)
+            TerraformAnalyzer._terraform_init(terraform_path)
             terraform_version = TerraformAnalyzer._get_terraform_version(terraform_path)
             provider_versions = TerraformAnalyzer._get_provider_versions(terraform_path)
-            latest_versions = TerraformAnalyzer._get_latest_provider_versions(provider_versions)
-            
-            # Combine current and latest versions
-            provider_info = {}
-            for provider, current_version in provider_versions.items():
-                provider_info[provider] = {
-                    "current_version": current_version,
-                    "latest_version": latest_versions.get(provider)
-                }
-
-            return terraform_version, provider_info
+            return terraform_version, provider_versions
         except Exception as e:
             raise TerraformAnalysisError(f"Failed to analyze Terraform directory: {str(e)}")
+        finally:
+            TerraformAnalyzer.runner.forget(terraform_path)
+
+    @classmethod
+    def resolve_version_indexes(cls, providers: Iterable[str]) -> Dict[str, ProviderVersionIndex]:
+        """Look each provider address up once and index its releases; unavailable providers are left out."""
+        versions_by_provider = cls.registry_client.get_versions_many(providers)
+        return {
+            provider: ProviderVersionIndex.from_registry(versions_data)
+            for provider, versions_data in versions_by_provider.items()
+        }
+
+    @classmethod
+    def describe_version(cls, index: ProviderVersionIndex, current_version: str,
+                         constraint: Optional[str] = None) -> Dict[str, Optional[object]]:
+        """Return the latest versions of a provider relative to the version in use and its constraint."""
+        return index.describe(current_version, constraint, include_prerelease=cls.include_prerelease)
 
     @staticmethod
     def _terraform_init(terraform_path: str) -> Optional[str]:
         """Init Terraform version from the directory."""
-        init_result = subprocess.run(
-            ['terraform', 'init', '-backend=false'],
-            cwd=terraform_path,
-            capture_output=True,
-            text=True
-        )
+        plugin_cache = TerraformAnalyzer.plugin_cache
+        if plugin_cache is None:
+            init_result = TerraformAnalyzer.runner.run(['terraform', 'init', '-backend=false'], terraform_path)
+        else:
+            with plugin_cache.locked_init(terraform_path):
+                init_result = TerraformAnalyzer.runner.run(
+                    ['terraform', 'init', '-backend=false'],
+                    terraform_path,
+                    env=plugin_cache.environment()
+                )
         
         if init_result.returncode != 0:
             raise TerraformAnalysisError(f"Terraform init failed: {init_result.stderr}")
@@ -56,19 +147,11 @@ class TerraformAnalyzer:
     
     @staticmethod
     def _load_terraform_version(terraform_path: str) -> Optional[str]:
-        """Load terraform version information."""
-        version_result = subprocess.run(
-            ['terraform', 'version', '-json'],
-            cwd=terraform_path,
-            capture_output=True,
-            text=True
-        )
-        
-        if version_result.returncode != 0:
-            raise RepositoryAnalysisError(f"Failed to get terraform version info: {version_result.stderr}")
-        
-        version_data = json.loads(version_result.stdout)
-        return version_data
+        """Load terraform version information, running the command once per directory."""
+        try:
+            return TerraformAnalyzer.runner.run_json(['terraform', 'version', '-json'], terraform_path)
+        except TerraformAnalysisError as e:
+            raise RepositoryAnalysisError(f"Failed to get terraform version info: {str(e)}")
         
     @staticmethod
     def _get_terraform_version(terraform_path: str) -> Optional[str]:
@@ -98,51 +181,17 @@ class TerraformAnalyzer:
     @classmethod
     def _is_prerelease(cls, ver_str: str) -> bool:
         """Check if a version string represents a prerelease version."""
-        return any(x in ver_str.lower() for x in ['alpha', 'beta', 'rc'])
+        return is_prerelease(ver_str)
 
     @classmethod
     def _get_latest_provider_versions(cls, current_providers: Dict[str, str]) -> Dict[str, str]:
         """Get latest versions for all providers from Terraform Registry."""
         latest_versions = {}
-        
-        for provider in current_providers.keys():
-            try:
-                # Extract namespace and name from provider string (e.g., "registry.terraform.io/hashicorp/aws")
-                parts = provider.split('/')
-                if len(parts) >= 3:
-                    namespace = parts[-2]
-                    name = parts[-1]
-                    
-                    # Query the registry API
-                    response = requests.get(f"{cls.REGISTRY_API_URL}/{namespace}/{name}/versions")
-                    if response.status_code == 200:
-                        versions_data = response.json().get('versions', [])
-                        if versions_data:
-                            # Find the highest version using semantic versioning comparison
-                            highest_version = None
-                            highest_version_obj = None
-                            
-                            for ver in versions_data:
-                                ver_str = ver.get('version')
-                                if ver_str:
-                                    # Skip prerelease versions unless explicitly included
-                                    if not cls.include_prerelease and cls._is_prerelease(ver_str):
-                                        continue
-                                        
-                                    try:
-                                        ver_obj = version.parse(ver_str)
-                                        if (highest_version_obj is None or 
-                                            ver_obj > highest_version_obj):
-                                            highest_version = ver_str
-                                            highest_version_obj = ver_obj
-                                    except version.InvalidVersion:
-                                        # Skip invalid versions
-                                        continue
-                            
-                            if highest_version:
-                                latest_versions[provider] = highest_version
-            except Exception as e:
-                # Log error but continue with other providers
-                print(f"Failed to get latest version for provider {provider}: {str(e)}")
-                
-        return latest_versions
\ No newline at end of file
+
+        # All providers of the directory are looked up concurrently over the pooled session
+        for provider, index in cls.resolve_version_indexes(current_providers.keys()).items():
+            highest_version = index.latest(cls.include_prerelease)
+            if highest_version:
+                latest_versions[provider] = highest_version
+
+        return latest_versions
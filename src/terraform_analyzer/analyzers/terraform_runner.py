@@ -0,0 +1,93 @@
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from ..models.exceptions import TerraformAnalysisError
+
+
+@dataclass
+class CommandResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float  # seconds
+
+
+class TerraformRunner:
+    """Run terraform commands with a timeout, memoizing JSON outputs and timing each command.
+
+    Each command runs in its own process group so that a timeout also kills the
+    provider plugins and other children it spawned.
+    """
+
+    DEFAULT_TIMEOUT = 600  # seconds
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._json_outputs: Dict[Tuple[str, Tuple[str, ...]], dict] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, args: List[str], cwd: str, env: Optional[Dict[str, str]] = None) -> CommandResult:
+        """Run a command in `cwd`, killing its whole process group if it exceeds the timeout."""
+        start = time.monotonic()
+        process = subprocess.Popen(
+            args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.communicate()
+            self._record(cwd, args, time.monotonic() - start)
+            raise TerraformAnalysisError(f"{' '.join(args)} timed out after {self.timeout:g}s")
+
+        duration = time.monotonic() - start
+        self._record(cwd, args, duration)
+        return CommandResult(returncode=process.returncode, stdout=stdout, stderr=stderr, duration=duration)
+
+    def run_json(self, args: List[str], cwd: str, env: Optional[Dict[str, str]] = None) -> dict:
+        """Run a command printing JSON once per directory and return its parsed output."""
+        key = (cwd, tuple(args))
+        with self._lock:
+            if key in self._json_outputs:
+                return self._json_outputs[key]
+
+        result = self.run(args, cwd, env=env)
+        if result.returncode != 0:
+            raise TerraformAnalysisError(f"{' '.join(args)} failed: {result.stderr}")
+        output = json.loads(result.stdout)
+        with self._lock:
+            self._json_outputs[key] = output
+        return output
+
+    def _record(self, cwd: str, args: List[str], duration: float):
+        # "terraform init -backend=false" is recorded as "init"
+        command = args[1] if len(args) > 1 else args[0]
+        with self._lock:
+            timings = self._timings.setdefault(cwd, {})
+            timings[command] = timings.get(command, 0.0) + duration
+
+    def forget(self, cwd: str):
+        """Drop the memoized outputs of a directory once its analysis is over."""
+        with self._lock:
+            for key in [key for key in self._json_outputs if key[0] == cwd]:
+                del self._json_outputs[key]
+
+    def pop_timings(self, cwd: str) -> Dict[str, float]:
+        """Return and clear the wall time spent per command in a directory."""
+        with self._lock:
+            return self._timings.pop(cwd, {})
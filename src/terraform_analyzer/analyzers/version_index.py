@@ -0,0 +1,132 @@
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from packaging import version
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+
+_CONSTRAINT_PATTERN = re.compile(r'^\s*(~>|>=|<=|!=|=|>|<)?\s*v?([0-9][^\s]*)\s*$')
+
+
+def is_prerelease(ver_str: str) -> bool:
+    """Check if a version string represents a prerelease version."""
+    return any(x in ver_str.lower() for x in ['alpha', 'beta', 'rc'])
+
+
+@lru_cache(maxsize=1024)
+def parse_constraint(constraint: Optional[str]) -> Optional[SpecifierSet]:
+    """Convert a Terraform version constraint (e.g. "~> 4.0, != 4.2.0") to a specifier set.
+
+    `~>` becomes `~=`, except with a single component ("~> 4" allows any version from 4),
+    and `=` becomes `==`. Return None for a missing or invalid constraint.
+    """
+    if not constraint:
+        return None
+    specifiers = []
+    for part in constraint.split(','):
+        match = _CONSTRAINT_PATTERN.match(part)
+        if not match:
+            return None
+        operator, ver_str = match.groups()
+        if operator == '~>':
+            operator = '~=' if '.' in ver_str else '>='
+        elif operator in (None, '='):
+            operator = '=='
+        specifiers.append(f'{operator}{ver_str}')
+    try:
+        return SpecifierSet(','.join(specifiers))
+    except InvalidSpecifier:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse(ver_str: Optional[str]) -> Optional[version.Version]:
+    # Versions in use repeat across repositories, each one is parsed once
+    try:
+        return version.parse(ver_str) if ver_str else None
+    except version.InvalidVersion:
+        return None
+
+
+class ProviderVersionIndex:
+    """Releases of a provider parsed once and sorted, answering version queries by bisection.
+
+    Stable releases and prereleases are kept apart: queries consider the stable releases
+    only, unless `include_prerelease` is set. Invalid versions are ignored.
+    """
+
+    def __init__(self, versions: Iterable[str]):
+        self._strings: Dict[version.Version, str] = {}
+        for ver_str in versions:
+            ver_obj = _parse(ver_str)
+            # The first spelling of a version wins ("1.0" and "1.0.0" are the same version)
+            if ver_obj is not None and ver_obj not in self._strings:
+                self._strings[ver_obj] = ver_str
+        self.all: List[version.Version] = sorted(self._strings)
+        self.stable = [ver_obj for ver_obj in self.all if not is_prerelease(self._strings[ver_obj])]
+
+    @classmethod
+    def from_registry(cls, versions_data: List[dict]) -> 'ProviderVersionIndex':
+        """Index the `versions` list published by the registry for a provider."""
+        return cls(ver.get('version') for ver in versions_data)
+
+    def _releases(self, include_prerelease: bool) -> List[version.Version]:
+        return self.all if include_prerelease else self.stable
+
+    def latest(self, include_prerelease: bool = False) -> Optional[str]:
+        releases = self._releases(include_prerelease)
+        return self._strings[releases[-1]] if releases else None
+
+    def latest_in_major(self, current_version: str, include_prerelease: bool = False) -> Optional[str]:
+        """Return the latest release with the same major version as `current_version`."""
+        current = _parse(current_version)
+        if current is None:
+            return None
+        releases = self._releases(include_prerelease)
+        # The lowest possible version of the next major, below its prereleases
+        index = bisect_left(releases, _parse(f'{current.major + 1}.dev0')) - 1
+        if index < 0 or releases[index].major != current.major:
+            return None
+        return self._strings[releases[index]]
+
+    def releases_behind(self, current_version: str, include_prerelease: bool = False) -> Optional[int]:
+        """Return how many releases are newer than `current_version`."""
+        current = _parse(current_version)
+        if current is None:
+            return None
+        releases = self._releases(include_prerelease)
+        return len(releases) - bisect_right(releases, current)
+
+    def latest_allowed(self, constraint: Optional[str], include_prerelease: bool = False) -> Optional[str]:
+        """Return the latest release satisfying a Terraform version constraint."""
+        specifiers = parse_constraint(constraint)
+        if specifiers is None:
+            return None
+        releases = self._releases(include_prerelease)
+        # Releases above an upper bound of the constraint are skipped by bisection
+        end = len(releases)
+        for specifier in specifiers:
+            bound = _parse(specifier.version)
+            if bound is None or '*' in specifier.version:
+                continue
+            if specifier.operator in ('<', '<=', '=='):
+                end = min(end, bisect_right(releases, bound))
+            elif specifier.operator == '~=':
+                # ~=4.1 allows up to 5, ~=4.1.2 up to 4.2
+                upper = list(bound.release[:-1])
+                upper[-1] += 1
+                end = min(end, bisect_left(releases, _parse('.'.join(map(str, upper)))))
+        for index in range(end - 1, -1, -1):
+            if specifiers.contains(releases[index], prereleases=True):
+                return self._strings[releases[index]]
+        return None
+
+    def describe(self, current_version: str, constraint: Optional[str] = None,
+                 include_prerelease: bool = False) -> Dict[str, Optional[object]]:
+        """Return the fields of a ProviderVersion for a provider used at `current_version`."""
+        return {
+            'latest_version': self.latest(include_prerelease),
+            'latest_in_major': self.latest_in_major(current_version, include_prerelease),
+            'releases_behind': self.releases_behind(current_version, include_prerelease),
+            'latest_allowed': self.latest_allowed(constraint, include_prerelease)
+        }
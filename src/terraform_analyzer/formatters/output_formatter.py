@@ -1,194 +1,249 @@
 import json
 import csv
+import textwrap
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence, TextIO, Union
 from io import StringIO
 from ..models.repository import RepositoryInfo, AnalysisResult
+from .status_view import ResultView, build_views
 
 class OutputFormatter(ABC):
-    def _parse_version_component(self, version_str: str, index: int, default: int = 0) -> int:
-        """
-        Safely parse a version component to an integer
-        Args:
-            version_str: The full version string (e.g. "1.2.3-pre2")
-            index: Which component to parse (0 for major, 1 for minor, 2 for patch)
-            default: Default value if parsing fails
-        Returns:
-            The parsed integer value
-        """
-        try:
-            parts = version_str.split('.')
-            if len(parts) > index:
-                # Split on '-' to remove pre-release identifiers and take first part
-                return int(parts[index].split('-')[0])
-            return default
-        except (ValueError, IndexError):
-            return default
-
-    def _compare_versions(self, current_version: str, latest_version: str) -> tuple[bool, bool, float]:
-        """
-        Compare version strings and return major update status and version progress.
-        Returns: (is_major_update, has_update, progress_percentage)
-        """
-        try:
-            # Parse version components
-            current_major = self._parse_version_component(current_version, 0)
-            current_minor = self._parse_version_component(current_version, 1)
-            current_patch = self._parse_version_component(current_version, 2)
-            
-            latest_major = self._parse_version_component(latest_version, 0)
-            latest_minor = self._parse_version_component(latest_version, 1)
-            latest_patch = self._parse_version_component(latest_version, 2)
-            
-            # Check for major update
-            is_major_update = latest_major > current_major
-            
-            # Calculate version progress
-            current_val = current_major * 10000 + current_minor * 100 + current_patch
-            latest_val = latest_major * 10000 + latest_minor * 100 + latest_patch
-            
-            progress = 0.0
-            if latest_val > 0:
-                progress = min(100, (current_val / latest_val) * 100)
-            
-            return is_major_update, True, progress
-        except (ValueError, IndexError):
-            return False, True, 0.0
+    """Base class of the report formatters.
+
+    A report is rendered incrementally into a text stream: `begin` writes its header,
+    `emit` the part of one repository and `end` its footer. The stream is flushed after
+    each step, so a report grows while the analysis runs and a run interrupted midway
+    still leaves the repositories analyzed so far. `format` renders a whole report as a
+    string.
+
+    Both accept analysis results or their precomputed status views: when several
+    reports are rendered, each result is turned into a view once and the view is shared.
+    """
+
+    def format(self, results: Sequence[Union[AnalysisResult, ResultView]]) -> str:
+        return self.format_views(build_views(results))
+
+    def format_views(self, views: List[ResultView]) -> str:
+        output = StringIO()
+        self.begin(output)
+        for view in views:
+            self.emit(view)
+        self.end()
+        return output.getvalue()
+
+    def begin(self, stream: TextIO):
+        """Start a report written to `stream`."""
+        self.stream = stream
+        self.records = 0
+        self._begin()
+        self.flush()
+
+    def emit(self, result: Union[AnalysisResult, ResultView]):
+        """Write the part of the report of one repository."""
+        view = result if isinstance(result, ResultView) else ResultView.from_result(result)
+        self._emit(view)
+        self.records += 1
+        self.flush()
+
+    def end(self):
+        """Finish the report."""
+        self._end()
+        self.flush()
+
+    def flush(self):
+        self.stream.flush()
+
+    def _begin(self):
+        pass
+
+    @abstractmethod
+    def _emit(self, view: ResultView):
+        pass
+
+    def _end(self):
+        pass
+
+class LineFormatter(OutputFormatter):
+    """Formatter of a report made of lines: a header, a block of lines per repository and a footer."""
+
+    def _begin(self):
+        self._started = False
+        self._write_lines(self._header_lines())
+
+    def _emit(self, view: ResultView):
+        self._write_lines(self._record_lines(view))
+
+    def _end(self):
+        self._write_lines(self._footer_lines())
+
+    def _write_lines(self, lines: List[str]):
+        if not lines:
+            return
+        # Lines are separated, not terminated, by newlines
+        if self._started:
+            self.stream.write('\n')
+        self.stream.write('\n'.join(lines))
+        self._started = True
+
+    def _header_lines(self) -> List[str]:
+        return []
 
     @abstractmethod
-    def format(self, results: List[AnalysisResult]) -> str:
+    def _record_lines(self, view: ResultView) -> List[str]:
         pass
 
-class TextFormatter(OutputFormatter):
-    def format(self, results: List[AnalysisResult]) -> str:
+    def _footer_lines(self) -> List[str]:
+        return []
+
+class TextFormatter(LineFormatter):
+    def _record_lines(self, view: ResultView) -> List[str]:
         _display_progress = False
         output = []
-        for result in results:
-            output.append(f"Repository: {result.repository.name}")
-            output.append(f"URL: {result.repository.repository}")
-            output.append(f"Terraform Path: {result.repository.terraform_path}")
-            if result.repository.branch:
-                output.append(f"Branch: {result.repository.branch}")
+        result = view.result
+        output.append(f"Repository: {result.repository.name}")
+        output.append(f"URL: {result.repository.repository}")
+        output.append(f"Terraform Path: {result.repository.terraform_path}")
+        if result.repository.branch:
+            output.append(f"Branch: {result.repository.branch}")
             
-            if result.error:
-                output.append(f"Error: {result.error}")
+        if result.error:
+            output.append(f"Error: {result.error}")
+        else:
+            output.append(f"\nTerraform:")
+            output.append(f"  Required version: {result.terraform_version}")
+            output.append(f"  Installed version: {result.installed_terraform_version or 'N/A'}")
+            if view.providers:
+                output.append("\nProvider Versions:")
+                output.append(f"  Total providers: {len(view.providers)}")
+                if view.major_updates > 0:
+                    output.append(f"  Major updates needed: {view.major_updates}")
+                if view.minor_updates > 0:
+                    output.append(f"  Minor updates available: {view.minor_updates}")
+                output.append("")
+
+                for status in view.providers:
+                    output.append(f"  - {status.provider}:")
+                    output.append(f"      Current version: {status.current_version}")
+                    output.append(f"      Latest version: {status.latest_version or 'N/A'}")
+                    if status.latest_in_major and status.latest_in_major != status.latest_version:
+                        output.append(f"      Latest in current major: {status.latest_in_major}")
+                    if status.releases_behind:
+                        output.append(f"      Releases behind: {status.releases_behind}")
+                    if status.constraint:
+                        output.append(f"      Constraint: {status.constraint} (latest allowed: {status.latest_allowed or 'N/A'})")
+                    if status.needs_update:
+                        label = "⚠️ Major update required!" if status.is_major_update else "⚠️ Update available"
+                        output.append(f"      Status: {label}")
+                        if _display_progress and status.progress > 0:
+                            output.append(f"      Progress: {status.progress:.1f}%")
             else:
-                output.append(f"\nTerraform:")
-                output.append(f"  Required version: {result.terraform_version}")
-                output.append(f"  Installed version: {result.installed_terraform_version or 'N/A'}")
-                if result.provider_versions:
-                    # Count updates
-                    major_updates = 0
-                    minor_updates = 0
-                    for provider, version in result.provider_versions.items():
-                        if version.latest_version and version.current_version != version.latest_version:
-                            is_major, _, _ = self._compare_versions(version.current_version, version.latest_version)
-                            if is_major:
-                                major_updates += 1
-                            else:
-                                minor_updates += 1
-
-                    output.append("\nProvider Versions:")
-                    output.append(f"  Total providers: {len(result.provider_versions)}")
-                    if major_updates > 0:
-                        output.append(f"  Major updates needed: {major_updates}")
-                    if minor_updates > 0:
-                        output.append(f"  Minor updates available: {minor_updates}")
-                    output.append("")
-
-                    for provider, version in result.provider_versions.items():
-                        output.append(f"  - {provider}:")
-                        output.append(f"      Current version: {version.current_version}")
-                        output.append(f"      Latest version: {version.latest_version or 'N/A'}")
-                        if version.latest_version and version.current_version != version.latest_version:
-                            is_major, _, progress = self._compare_versions(version.current_version, version.latest_version)
-                            status = "⚠️ Major update required!" if is_major else "⚠️ Update available"
-                            output.append(f"      Status: {status}")
-                            if _display_progress and progress > 0:
-                                output.append(f"      Progress: {progress:.1f}%")
-                else:
-                    output.append("\nNo provider versions found")
+                output.append("\nNo provider versions found")
             
-            output.append("")
-        return "\n".join(output)
+        output.append("")
+        return output
 
 class JsonFormatter(OutputFormatter):
-    def format(self, results: List[AnalysisResult]) -> str:
-        output = []
-        for result in results:
-            major_updates = 0
-            minor_updates = 0
-            provider_details = {}
-
-            for provider, version in result.provider_versions.items():
-                is_major = False
-                progress = 0.0
-                if version.latest_version and version.current_version != version.latest_version:
-                    is_major, _, progress = self._compare_versions(version.current_version, version.latest_version)
-                    if is_major:
-                        major_updates += 1
-                    else:
-                        minor_updates += 1
-
-                provider_details[provider] = {
-                    'current_version': version.current_version,
-                    'latest_version': version.latest_version,
-                    'needs_update': version.latest_version and version.current_version != version.latest_version,
-                    'is_major_update': is_major,
-                    'version_progress': round(progress, 1) if progress > 0 else 0
-                }
-
-            entry = {
-                'repository': {
-                    'name': result.repository.name,
-                    'url': result.repository.repository,
-                    'terraform_path': result.repository.terraform_path,
-                    'branch': result.repository.branch
-                },
-                'terraform': {
-                    'required_version': result.terraform_version,
-                    'installed_version': result.installed_terraform_version
-                },
-                'summary': {
-                    'total_providers': len(result.provider_versions),
-                    'major_updates': major_updates,
-                    'minor_updates': minor_updates
-                },
-                'provider_versions': provider_details,
-                'error': result.error
+    """JSON array of the repositories, written one element at a time."""
+
+    def _begin(self):
+        self.stream.write('[')
+
+    def _emit(self, view: ResultView):
+        entry = self.entry(view)
+        self.stream.write((',' if self.records else '') + '\n' + textwrap.indent(json.dumps(entry, indent=2), '  '))
+
+    def _end(self):
+        self.stream.write('\n]' if self.records else ']')
+
+    @staticmethod
+    def entry(view: ResultView) -> dict:
+        result = view.result
+        provider_details = {}
+
+        for status in view.providers:
+            provider_details[status.provider] = {
+                'current_version': status.current_version,
+                'latest_version': status.latest_version,
+                'needs_update': status.latest_version and status.needs_update,
+                'is_major_update': status.is_major_update,
+                'version_progress': round(status.progress, 1) if status.progress > 0 else 0,
+                'latest_in_major': status.latest_in_major,
+                'releases_behind': status.releases_behind,
+                'constraint': status.constraint,
+                'latest_allowed': status.latest_allowed
             }
-            output.append(entry)
-        return json.dumps(output, indent=2)
+
+        entry = {
+            'repository': {
+                'name': result.repository.name,
+                'url': result.repository.repository,
+                'terraform_path': result.repository.terraform_path,
+                'branch': result.repository.branch
+            },
+            'terraform': {
+                'required_version': result.terraform_version,
+                'installed_version': result.installed_terraform_version
+            },
+            'summary': {
+                'total_providers': len(view.providers),
+                'major_updates': view.major_updates,
+                'minor_updates': view.minor_updates
+            },
+            'provider_versions': provider_details,
+            'error': result.error
+        }
+        return entry
 
 class CsvFormatter(OutputFormatter):
-    def format(self, results: List[AnalysisResult]) -> str:
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['repository', 'repository_url', 'terraform_path', 'branch', 
-                        'required_terraform', 'installed_terraform', 'provider', 
-                        'current_version', 'latest_version', 'update_status', 'version_progress', 'error'])
-        
-        # Write data
-        for result in results:
-            if result.error:
+    def _begin(self):
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow(['repository', 'repository_url', 'terraform_path', 'branch',
+                              'required_terraform', 'installed_terraform', 'provider',
+                              'current_version', 'latest_version', 'update_status', 'version_progress', 'error',
+                              'latest_in_major', 'releases_behind', 'constraint', 'latest_allowed'])
+
+    def _emit(self, view: ResultView):
+        writer = self.writer
+        result = view.result
+        if result.error:
+            writer.writerow([
+                result.repository.name,
+                result.repository.repository,
+                result.repository.terraform_path,
+                result.repository.branch or '',
+                '',  # required_terraform
+                result.installed_terraform_version or '',  # installed_terraform
+                '',  # provider
+                '',  # current_version
+                '',  # latest_version
+                '',  # update_status
+                '',  # version_progress
+                result.error,
+                '', '', '', ''  # latest_in_major, releases_behind, constraint, latest_allowed
+            ])
+        else:
+            if not view.providers:
                 writer.writerow([
                     result.repository.name,
                     result.repository.repository,
                     result.repository.terraform_path,
                     result.repository.branch or '',
-                    '',  # required_terraform
-                    result.installed_terraform_version or '',  # installed_terraform
+                    result.terraform_version or '',
+                    result.installed_terraform_version or '',
                     '',  # provider
                     '',  # current_version
                     '',  # latest_version
                     '',  # update_status
                     '',  # version_progress
-                    result.error
+                    '',  # error
+                    '', '', '', ''  # latest_in_major, releases_behind, constraint, latest_allowed
                 ])
             else:
-                if not result.provider_versions:
+                for status in view.providers:
+                    update_status = 'Up to date'
+                    if status.needs_update:
+                        update_status = 'Major update required' if status.is_major_update else 'Update available'
+                        
                     writer.writerow([
                         result.repository.name,
                         result.repository.repository,
@@ -196,249 +251,226 @@ class CsvFormatter(OutputFormatter):
                         result.repository.branch or '',
                         result.terraform_version or '',
                         result.installed_terraform_version or '',
-                        '',  # provider
-                        '',  # current_version
-                        '',  # latest_version
-                        '',  # update_status
-                        '',  # version_progress
-                        ''   # error
+                        status.provider,
+                        status.current_version,
+                        status.latest_version or 'N/A',
+                        update_status,
+                        f'{status.progress:.1f}%' if status.progress > 0 else '',
+                        '',  # error
+                        status.latest_in_major or '',
+                        '' if status.releases_behind is None else status.releases_behind,
+                        status.constraint or '',
+                        status.latest_allowed or ''
                     ])
-                else:
-                    for provider, version in result.provider_versions.items():
-                        update_status = 'Up to date'
-                        progress = 0.0
-                        
-                        if version.latest_version and version.current_version != version.latest_version:
-                            is_major, _, progress = self._compare_versions(version.current_version, version.latest_version)
-                            update_status = 'Major update required' if is_major else 'Update available'
-                        
-                        writer.writerow([
-                            result.repository.name,
-                            result.repository.repository,
-                            result.repository.terraform_path,
-                            result.repository.branch or '',
-                            result.terraform_version or '',
-                            result.installed_terraform_version or '',
-                            provider,
-                            version.current_version,
-                            version.latest_version or 'N/A',
-                            update_status,
-                            f'{progress:.1f}%' if progress > 0 else '',
-                            ''  # error
-                        ])
-        
-        return output.getvalue()
 
-class HtmlFormatter(OutputFormatter):
-    def format(self, results: List[AnalysisResult]) -> str:
-        html = ['<!DOCTYPE html>',
-               '<html>',
-               '<head>',
-               '<title>Terraform Analysis Results</title>',
-               '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
-               '<style>',
-               ':root { --primary: #5c4ee5; --success: #28a745; --warning: #ffc107; --danger: #dc3545; --secondary: #6c757d; }',
-               'body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif; margin: 0; padding: 0; line-height: 1.5; color: #212529; background: #f8f9fa; }',
-               '.container { max-width: 1200px; margin: 0 auto; padding: 2rem; }',
-               'h1 { text-align: center; color: var(--primary); font-size: 2.5rem; margin-bottom: 2rem; }',
-               '.repository-card { background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 2rem; overflow: hidden; }',
-               '.repository-header { background: var(--primary); color: white; padding: 1.5rem; position: relative; }',
-               '.repository-header h2 { margin: 0; font-size: 1.75rem; }',
-               '.repository-header .meta { opacity: 0.9; font-size: 0.9rem; margin-top: 0.5rem; }',
-               '.repository-content { padding: 1.5rem; }',
-               '.status-badge { display: inline-block; padding: 0.25rem 0.75rem; border-radius: 50px; font-size: 0.875rem; font-weight: 500; }',
-               '.status-success { background: var(--success); color: white; }',
-               '.status-warning { background: var(--warning); color: black; }',
-               '.status-danger { background: var(--danger); color: white; }',
-               '.status-error { background: var(--danger); color: white; }',
-               '.info-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1rem; margin: 1rem 0; }',
-               '.info-item { background: #f8f9fa; padding: 1rem; border-radius: 6px; }',
-               '.info-item h4 { margin: 0 0 0.5rem 0; color: var(--secondary); }',
-               '.info-item p { margin: 0; font-size: 1.1rem; }',
-               '.provider-table { width: 100%; border-collapse: collapse; margin: 1rem 0; }',
-               '.provider-table th { background: #f8f9fa; padding: 0.75rem; text-align: left; border-bottom: 2px solid #dee2e6; }',
-               '.provider-table td { padding: 0.75rem; border-bottom: 1px solid #dee2e6; }',
-               '.version-bar { background: #e9ecef; height: 6px; border-radius: 3px; margin-top: 0.25rem; }',
-               '.version-bar-fill { background: var(--primary); height: 100%; border-radius: 3px; transition: width 0.3s ease; }',
-               '.version-outdated .version-bar-fill { background: var(--warning); }',
-               '.version-major-update .version-bar-fill { background: var(--danger); }',
-               '@media (max-width: 768px) { .info-grid { grid-template-columns: 1fr; } }',
-               '</style>',
-               '</head>',
-               '<body>',
-               '<div class="container">',
-               '<h1>Terraform Analysis Results</h1>']
-
-        for result in results:
-            # Start repository card
-            html.append('<div class="repository-card">')
+class HtmlFormatter(LineFormatter):
+    def _header_lines(self) -> List[str]:
+        return ['<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<title>Terraform Analysis Results</title>',
+                '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
+                '<style>',
+                ':root { --primary: #5c4ee5; --success: #28a745; --warning: #ffc107; --danger: #dc3545; --secondary: #6c757d; }',
+                'body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif; margin: 0; padding: 0; line-height: 1.5; color: #212529; background: #f8f9fa; }',
+                '.container { max-width: 1200px; margin: 0 auto; padding: 2rem; }',
+                'h1 { text-align: center; color: var(--primary); font-size: 2.5rem; margin-bottom: 2rem; }',
+                '.repository-card { background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 2rem; overflow: hidden; }',
+                '.repository-header { background: var(--primary); color: white; padding: 1.5rem; position: relative; }',
+                '.repository-header h2 { margin: 0; font-size: 1.75rem; }',
+                '.repository-header .meta { opacity: 0.9; font-size: 0.9rem; margin-top: 0.5rem; }',
+                '.repository-content { padding: 1.5rem; }',
+                '.status-badge { display: inline-block; padding: 0.25rem 0.75rem; border-radius: 50px; font-size: 0.875rem; font-weight: 500; }',
+                '.status-success { background: var(--success); color: white; }',
+                '.status-warning { background: var(--warning); color: black; }',
+                '.status-danger { background: var(--danger); color: white; }',
+                '.status-error { background: var(--danger); color: white; }',
+                '.info-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1rem; margin: 1rem 0; }',
+                '.info-item { background: #f8f9fa; padding: 1rem; border-radius: 6px; }',
+                '.info-item h4 { margin: 0 0 0.5rem 0; color: var(--secondary); }',
+                '.info-item p { margin: 0; font-size: 1.1rem; }',
+                '.provider-table { width: 100%; border-collapse: collapse; margin: 1rem 0; }',
+                '.provider-table th { background: #f8f9fa; padding: 0.75rem; text-align: left; border-bottom: 2px solid #dee2e6; }',
+                '.provider-table td { padding: 0.75rem; border-bottom: 1px solid #dee2e6; }',
+                '.version-bar { background: #e9ecef; height: 6px; border-radius: 3px; margin-top: 0.25rem; }',
+                '.version-bar-fill { background: var(--primary); height: 100%; border-radius: 3px; transition: width 0.3s ease; }',
+                '.version-outdated .version-bar-fill { background: var(--warning); }',
+                '.version-major-update .version-bar-fill { background: var(--danger); }',
+                '@media (max-width: 768px) { .info-grid { grid-template-columns: 1fr; } }',
+                '</style>',
+                '</head>',
+                '<body>',
+                '<div class="container">',
+                '<h1>Terraform Analysis Results</h1>']
+
+
+    def _record_lines(self, view: ResultView) -> List[str]:
+        html = []
+        result = view.result
+        # Start repository card
+        html.append('<div class="repository-card">')
             
-            # Repository header
-            html.append('<div class="repository-header">')
-            html.append(f'<h2>{result.repository.name}</h2>')
-            html.append('<div class="meta">')
-            html.append(f'<div>Repository: {result.repository.repository}</div>')
-            html.append(f'<div>Path: {result.repository.terraform_path}</div>')
-            if result.repository.branch:
-                html.append(f'<div>Branch: {result.repository.branch}</div>')
-            html.append('</div>')
-            html.append('</div>')
+        # Repository header
+        html.append('<div class="repository-header">')
+        html.append(f'<h2>{result.repository.name}</h2>')
+        html.append('<div class="meta">')
+        html.append(f'<div>Repository: {result.repository.repository}</div>')
+        html.append(f'<div>Path: {result.repository.terraform_path}</div>')
+        if result.repository.branch:
+            html.append(f'<div>Branch: {result.repository.branch}</div>')
+        html.append('</div>')
+        html.append('</div>')
 
-            # Repository content
-            html.append('<div class="repository-content">')
+        # Repository content
+        html.append('<div class="repository-content">')
 
-            if result.error:
-                html.append('<div class="status-badge status-error">')
-                html.append(f'Error: {result.error}')
-                html.append('</div>')
-            else:
-                # Info grid
-                html.append('<div class="info-grid">')
-                
-                # Required Terraform Version
-                html.append('<div class="info-item">')
-                html.append('<h4>Required Terraform Version</h4>')
-                html.append(f'<p>{result.terraform_version}</p>')
-                html.append('</div>')
-                
-                # Installed Terraform Version
-                html.append('<div class="info-item">')
-                html.append('<h4>Installed Terraform Version</h4>')
-                html.append(f'<p>{result.installed_terraform_version or "N/A"}</p>')
-                html.append('</div>')
+        if result.error:
+            html.append('<div class="status-badge status-error">')
+            html.append(f'Error: {result.error}')
+            html.append('</div>')
+        else:
+            # Info grid
+            html.append('<div class="info-grid">')
                 
-                # Add summary info with major updates count
-                provider_count = len(result.provider_versions)
-                major_updates = 0
-                minor_updates = 0
+            # Required Terraform Version
+            html.append('<div class="info-item">')
+            html.append('<h4>Required Terraform Version</h4>')
+            html.append(f'<p>{result.terraform_version}</p>')
+            html.append('</div>')
                 
-                for v in result.provider_versions.values():
-                    if v.latest_version and v.current_version != v.latest_version:
-                        is_major, _, _ = self._compare_versions(v.current_version, v.latest_version)
-                        if is_major:
-                            major_updates += 1
-                        else:
-                            minor_updates += 1
+            # Installed Terraform Version
+            html.append('<div class="info-item">')
+            html.append('<h4>Installed Terraform Version</h4>')
+            html.append(f'<p>{result.installed_terraform_version or "N/A"}</p>')
+            html.append('</div>')
                 
-                html.append('<div class="info-item">')
-                html.append('<h4>Providers</h4>')
-                html.append(f'<p>{provider_count} Total / {major_updates} Major Updates / {minor_updates} Minor Updates</p>')
-                html.append('</div>')
-                html.append('</div>')
-
-                if result.provider_versions:
-                    html.append('<table class="provider-table">')
-                    html.append('<tr>')
-                    html.append('<th>Provider</th>')
-                    html.append('<th>Current Version</th>')
-                    html.append('<th>Latest Version</th>')
-                    html.append('<th>Status</th>')
-                    html.append('</tr>')
+            # Add summary info with major updates count
+            html.append('<div class="info-item">')
+            html.append('<h4>Providers</h4>')
+            html.append(f'<p>{len(view.providers)} Total / {view.major_updates} Major Updates / '
+                        f'{view.minor_updates} Minor Updates</p>')
+            html.append('</div>')
+            html.append('</div>')
+
+            if view.providers:
+                html.append('<table class="provider-table">')
+                html.append('<tr>')
+                html.append('<th>Provider</th>')
+                html.append('<th>Current Version</th>')
+                html.append('<th>Latest Version</th>')
+                html.append('<th>Latest in Major</th>')
+                html.append('<th>Releases Behind</th>')
+                html.append('<th>Constraint</th>')
+                html.append('<th>Status</th>')
+                html.append('</tr>')
                     
-                    for provider, version in result.provider_versions.items():
-                        is_outdated = version.latest_version and version.current_version != version.latest_version
-                        
-                        if is_outdated:
-                            is_major, _, _ = self._compare_versions(version.current_version, version.latest_version)
-                            version_class = 'version-major-update' if is_major else 'version-outdated'
-                        else:
-                            version_class = ''
+                for status in view.providers:
+                    if status.needs_update:
+                        version_class = 'version-major-update' if status.is_major_update else 'version-outdated'
+                    else:
+                        version_class = ''
                         
-                        html.append(f'<tr class="{version_class}">')
-                        html.append(f'<td>{provider}</td>')
-                        html.append(f'<td>{version.current_version}</td>')
-                        html.append(f'<td>{version.latest_version or "N/A"}</td>')
+                    html.append(f'<tr class="{version_class}">')
+                    html.append(f'<td>{status.provider}</td>')
+                    html.append(f'<td>{status.current_version}</td>')
+                    html.append(f'<td>{status.latest_version or "N/A"}</td>')
+                    html.append(f'<td>{status.latest_in_major or "N/A"}</td>')
+                    html.append(f'<td>{"N/A" if status.releases_behind is None else status.releases_behind}</td>')
+                    if status.constraint:
+                        html.append(f'<td>{status.constraint} (latest allowed: {status.latest_allowed or "N/A"})</td>')
+                    else:
+                        html.append('<td>N/A</td>')
                         
-                        if is_outdated:
-                            badge_class = 'status-danger' if is_major else 'status-warning'
-                            badge_text = '🚨 Major Update Required!' if is_major else '⚠️ Update Available'
+                    if status.needs_update:
+                        badge_class = 'status-danger' if status.is_major_update else 'status-warning'
+                        badge_text = '🚨 Major Update Required!' if status.is_major_update else '⚠️ Update Available'
                             
-                            html.append('<td>')
-                            html.append(f'<div class="status-badge {badge_class}">{badge_text}</div>')
+                        html.append('<td>')
+                        html.append(f'<div class="status-badge {badge_class}">{badge_text}</div>')
                             
-                            # Add version progress bar
-                            _, _, progress = self._compare_versions(version.current_version, version.latest_version)
-                            if progress > 0:
-                                html.append('<div class="version-bar">')
-                                html.append(f'<div class="version-bar-fill" style="width: {progress}%;"></div>')
-                                html.append('</div>')
-                            html.append('</td>')
-                        else:
-                            html.append('<td><div class="status-badge status-success">✓ Up to date</div></td>')
+                        # Add version progress bar
+                        if status.progress > 0:
+                            html.append('<div class="version-bar">')
+                            html.append(f'<div class="version-bar-fill" style="width: {status.progress}%;"></div>')
+                            html.append('</div>')
+                        html.append('</td>')
+                    else:
+                        html.append('<td><div class="status-badge status-success">✓ Up to date</div></td>')
                         
-                        html.append('</tr>')
+                    html.append('</tr>')
                     
-                    html.append('</table>')
-                else:
-                    html.append('<p>No provider versions found</p>')
-            
-            html.append('</div>')  # End repository-content
-            html.append('</div>')  # End repository-card
-
-        html.extend(['</div>', '</body>', '</html>'])
-        return '\n'.join(html)
-
-class MarkdownFormatter(OutputFormatter):
-    def format(self, results: List[AnalysisResult]) -> str:
-        md = ['# Terraform Analysis Results\n']
-
-        for result in results:
-            md.append(f'## Repository: {result.repository.name}\n')
-            md.append(f'- **URL**: {result.repository.repository}')
-            md.append(f'- **Terraform Path**: {result.repository.terraform_path}')
-            if result.repository.branch:
-                md.append(f'- **Branch**: {result.repository.branch}')
-            md.append('')
-
-            if result.error:
-                md.append(f'**Error**: {result.error}\n')
+                html.append('</table>')
             else:
-                md.append('### Terraform Versions')
-                md.append(f'- **Required Version**: {result.terraform_version}')
-                md.append(f'- **Installed Version**: {result.installed_terraform_version or "N/A"}\n')
-
-                if result.provider_versions:
-                    # Add summary info
-                    provider_count = len(result.provider_versions)
-                    major_updates = 0
-                    minor_updates = 0
-                    
-                    for v in result.provider_versions.values():
-                        if v.latest_version and v.current_version != v.latest_version:
-                            is_major, _, _ = self._compare_versions(v.current_version, v.latest_version)
-                            if is_major:
-                                major_updates += 1
-                            else:
-                                minor_updates += 1
-
-                    md.append('### Provider Summary')
-                    md.append(f'- Total Providers: {provider_count}')
-                    if major_updates > 0:
-                        md.append(f'- 🚨 **Major Updates Required**: {major_updates}')
-                    if minor_updates > 0:
-                        md.append(f'- ⚠️ Minor Updates Available: {minor_updates}')
-                    md.append('')
-
-                    md.append('### Provider Versions\n')
-                    md.append('| Provider | Current Version | Latest Version | Status |')
-                    md.append('|----------|-----------------|----------------|---------|')
+                html.append('<p>No provider versions found</p>')
+            
+        html.append('</div>')  # End repository-content
+        html.append('</div>')  # End repository-card
+        return html
+
+    def _footer_lines(self) -> List[str]:
+        return ['</div>', '</body>', '</html>']
+
+class MarkdownFormatter(LineFormatter):
+    def _header_lines(self) -> List[str]:
+        return ['# Terraform Analysis Results\n']
+
+    def _record_lines(self, view: ResultView) -> List[str]:
+        md = []
+        result = view.result
+        md.append(f'## Repository: {result.repository.name}\n')
+        md.append(f'- **URL**: {result.repository.repository}')
+        md.append(f'- **Terraform Path**: {result.repository.terraform_path}')
+        if result.repository.branch:
+            md.append(f'- **Branch**: {result.repository.branch}')
+        md.append('')
+
+        if result.error:
+            md.append(f'**Error**: {result.error}\n')
+        else:
+            md.append('### Terraform Versions')
+            md.append(f'- **Required Version**: {result.terraform_version}')
+            md.append(f'- **Installed Version**: {result.installed_terraform_version or "N/A"}\n')
+
+            if view.providers:
+                # Add summary info
+                md.append('### Provider Summary')
+                md.append(f'- Total Providers: {len(view.providers)}')
+                if view.major_updates > 0:
+                    md.append(f'- 🚨 **Major Updates Required**: {view.major_updates}')
+                if view.minor_updates > 0:
+                    md.append(f'- ⚠️ Minor Updates Available: {view.minor_updates}')
+                md.append('')
+
+                md.append('### Provider Versions\n')
+                md.append('| Provider | Current Version | Latest Version | Latest in Major | Releases Behind | Constraint | Status |')
+                md.append('|----------|-----------------|----------------|-----------------|-----------------|------------|---------|')
                     
-                    for provider, version in result.provider_versions.items():
-                        status = '✅ Up to date'
-                        if version.latest_version and version.current_version != version.latest_version:
-                            is_major, _, _ = self._compare_versions(version.current_version, version.latest_version)
-                            if is_major:
-                                status = '🚨 **Major Update Required!**'
-                            else:
-                                status = '⚠️ Update Available'
+                for status in view.providers:
+                    label = '✅ Up to date'
+                    if status.needs_update:
+                        if status.is_major_update:
+                            label = '🚨 **Major Update Required!**'
+                        else:
+                            label = '⚠️ Update Available'
                         
-                        md.append(f'| {provider} | {version.current_version} | {version.latest_version or "N/A"} | {status} |')
-                else:
-                    md.append('No provider versions found\n')
+                    behind = 'N/A' if status.releases_behind is None else status.releases_behind
+                    constraint = f'`{status.constraint}` → {status.latest_allowed or "N/A"}' if status.constraint else 'N/A'
+                    md.append(f'| {status.provider} | {status.current_version} | {status.latest_version or "N/A"} | '
+                              f'{status.latest_in_major or "N/A"} | {behind} | {constraint} | {label} |')
+            else:
+                md.append('No provider versions found\n')
             
-            md.append('\n---\n')
+        md.append('\n---\n')
+        return md
+
+class NdjsonFormatter(OutputFormatter):
+    """Newline-delimited JSON: one line per repository, with the fields of the JSON format.
+
+    Every line is a complete document, so the report stays valid when a run is interrupted.
+    """
 
-        return '\n'.join(md)
+    def _emit(self, view: ResultView):
+        self.stream.write(json.dumps(JsonFormatter.entry(view)) + '\n')
 
 class FormatterFactory:
     _formatters = {
@@ -446,7 +478,8 @@ class FormatterFactory:
         'json': JsonFormatter,
         'csv': CsvFormatter,
         'html': HtmlFormatter,
-        'markdown': MarkdownFormatter
+        'markdown': MarkdownFormatter,
+        'ndjson': NdjsonFormatter
     }
     
     @classmethod
@@ -0,0 +1,137 @@
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Iterable, List, Optional, Union
+from ..models.repository import AnalysisResult
+from .output_formatter import OutputFormatter
+from .status_view import ResultView
+
+# Views queued for a sink ahead of its rendering thread
+SINK_QUEUE_SIZE = 64
+
+_END = object()
+
+
+class OutputSink:
+    """A report rendered by its own thread and streamed to a file, or to stdout when `path` is None or '-'."""
+
+    def __init__(self, formatter: OutputFormatter, path: Optional[str] = None):
+        self.formatter = formatter
+        self.path = path
+        self.spool = False  # Render to a temporary file copied to stdout on close
+        self.error: Optional[Exception] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=SINK_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._ended = False
+
+    @property
+    def to_stdout(self) -> bool:
+        return self.path in (None, '-')
+
+    def open(self):
+        """Open the output file, raising now rather than once results are rendered."""
+        if not self.to_stdout and self._file is None:
+            self._file = open(self.path, 'w')
+
+    def discard(self):
+        """Close the output file of a sink that will not be started."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def start(self):
+        self.open()
+        self._thread = threading.Thread(target=self._render, daemon=True)
+        self._thread.start()
+
+    def put(self, view: ResultView):
+        self._queue.put(view)
+
+    def close(self):
+        """Finish the report and wait for it to be written."""
+        self._queue.put(_END)
+        self._thread.join()
+
+    def _render(self):
+        try:
+            if not self.to_stdout:
+                with self._file as f:
+                    self._write(f)
+            elif self.spool:
+                with tempfile.TemporaryFile('w+') as f:
+                    self._write(f)
+                    f.seek(0)
+                    shutil.copyfileobj(f, sys.stdout)
+                    sys.stdout.write('\n')
+            else:
+                self._write(sys.stdout)
+                # Like print()
+                sys.stdout.write('\n')
+        except Exception as e:
+            self.error = e
+            # Keep consuming so that the producer is never blocked by a failed sink
+            while not self._ended:
+                self._ended = self._queue.get() is _END
+
+    def _write(self, stream):
+        self.formatter.begin(stream)
+        while True:
+            view = self._queue.get()
+            if view is _END:
+                self._ended = True
+                break
+            self.formatter.emit(view)
+        self.formatter.end()
+
+
+class OutputPipeline:
+    """Fan the results out to several sinks, computing the status view of each result once.
+
+    Each sink renders its report in its own thread as results arrive: no report is held
+    in memory as a whole. Reports sent to stdout are printed one after the other.
+    """
+
+    def __init__(self, sinks: List[OutputSink]):
+        self.sinks = sinks
+        for sink in [sink for sink in sinks if sink.to_stdout][1:]:
+            # The first report streams to stdout; the next ones would interleave with it
+            sink.spool = True
+
+    def start(self):
+        """Open every output file, then start rendering; nothing is rendered if a file cannot be opened."""
+        try:
+            for sink in self.sinks:
+                sink.open()
+        except BaseException:
+            for sink in self.sinks:
+                sink.discard()
+            raise
+        for sink in self.sinks:
+            sink.start()
+
+    def emit(self, result: Union[AnalysisResult, ResultView]):
+        view = result if isinstance(result, ResultView) else ResultView.from_result(result)
+        for sink in self.sinks:
+            sink.put(view)
+
+    def close(self):
+        """Finish every report, then raise the first error of a sink."""
+        for sink in self.sinks:
+            sink.close()
+        for sink in self.sinks:
+            if sink.error:
+                raise sink.error
+
+
+def render_reports(results: Iterable[Union[AnalysisResult, ResultView]], sinks: List[OutputSink]):
+    """Walk the results once and render them to every sink."""
+    pipeline = OutputPipeline(sinks)
+    pipeline.start()
+    try:
+        for result in results:
+            pipeline.emit(result)
+    finally:
+        pipeline.close()
@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Union
+from ..models.repository import AnalysisResult, ProviderVersion, RepositoryInfo
+
+
+def parse_version(version_str: Optional[str]) -> Tuple[int, int, int]:
+    """Parse the (major, minor, patch) components of a version, 0 for any missing or invalid one.
+
+    Pre-release identifiers are ignored: "1.2.3-pre2" gives (1, 2, 3).
+    """
+    components = []
+    parts = version_str.split('.') if version_str else []
+    for index in range(3):
+        try:
+            components.append(int(parts[index].split('-')[0]))
+        except (ValueError, IndexError):
+            components.append(0)
+    return components[0], components[1], components[2]
+
+
+@dataclass
+class ProviderStatus:
+    """Update status of a provider, computed once for every report."""
+    provider: str
+    current_version: str
+    latest_version: Optional[str]
+    needs_update: bool = False
+    is_major_update: bool = False
+    progress: float = 0.0  # Current version as a percentage of the latest one
+    # Computed from the provider version index of the run, None when unknown
+    constraint: Optional[str] = None
+    latest_in_major: Optional[str] = None
+    releases_behind: Optional[int] = None
+    latest_allowed: Optional[str] = None
+
+    @classmethod
+    def from_versions(cls, provider: str, current_version: str, latest_version: Optional[str]) -> 'ProviderStatus':
+        status = cls(provider=provider, current_version=current_version, latest_version=latest_version)
+        if latest_version and current_version != latest_version:
+            current_major, current_minor, current_patch = parse_version(current_version)
+            latest_major, latest_minor, latest_patch = parse_version(latest_version)
+            current_val = current_major * 10000 + current_minor * 100 + current_patch
+            latest_val = latest_major * 10000 + latest_minor * 100 + latest_patch
+
+            status.needs_update = True
+            status.is_major_update = latest_major > current_major
+            if latest_val > 0:
+                status.progress = min(100, (current_val / latest_val) * 100)
+        return status
+
+    @classmethod
+    def from_provider_version(cls, provider: str, version: ProviderVersion) -> 'ProviderStatus':
+        status = cls.from_versions(provider, version.current_version, version.latest_version)
+        status.constraint = version.constraint
+        status.latest_in_major = version.latest_in_major
+        status.releases_behind = version.releases_behind
+        status.latest_allowed = version.latest_allowed
+        return status
+
+
+@dataclass
+class ResultView:
+    """An analysis result with the update status of its providers and per-repository counts."""
+    result: AnalysisResult
+    providers: List[ProviderStatus] = field(default_factory=list)
+    major_updates: int = 0
+    minor_updates: int = 0
+
+    @classmethod
+    def from_result(cls, result: AnalysisResult) -> 'ResultView':
+        view = cls(result=result)
+        for provider, version in result.provider_versions.items():
+            status = ProviderStatus.from_provider_version(provider, version)
+            if status.needs_update:
+                if status.is_major_update:
+                    view.major_updates += 1
+                else:
+                    view.minor_updates += 1
+            view.providers.append(status)
+        return view
+
+    @property
+    def repository(self) -> RepositoryInfo:
+        return self.result.repository
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.result.error
+
+
+def build_views(results: Iterable[Union[AnalysisResult, ResultView]]) -> List[ResultView]:
+    """Compute the status view of each result, keeping the views already computed."""
+    return [result if isinstance(result, ResultView) else ResultView.from_result(result) for result in results]
@@ -1,13 +1,30 @@
 import sys
+import os
 import argparse
+import heapq
 import yaml
-from typing import List
-from terraform_analyzer.models.repository import RepositoryInfo
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult
 from terraform_analyzer.models.exceptions import RepositoryAnalysisError
 from terraform_analyzer.analyzers.repository_analyzer import RepositoryAnalyzer
+from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+from terraform_analyzer.analyzers.terraform_runner import TerraformRunner
+from terraform_analyzer.analyzers.version_index import ProviderVersionIndex
 from terraform_analyzer.formatters.output_formatter import FormatterFactory
 from terraform_analyzer.formatters.history_formatter import HistoryFormatter
+from terraform_analyzer.formatters.output_pipeline import OutputPipeline, OutputSink
 from terraform_analyzer.utils.history_manager import HistoryManager
+from terraform_analyzer.utils.history_export import EXPORT_FORMATS, export_history
+from terraform_analyzer.utils.registry_cache import RegistryCache
+from terraform_analyzer.utils.registry_client import RegistryClient
+from terraform_analyzer.utils.registry_snapshot import export_snapshot
+from terraform_analyzer.utils.cache_bundle import DEFAULT_SECTIONS, export_cache, import_cache
+from terraform_analyzer.utils.git_mirror_cache import GitMirrorCache
+from terraform_analyzer.utils.plugin_cache import PluginCache
 
 
 def parse_arguments():
@@ -36,6 +53,10 @@ def parse_arguments():
         "--markdown-output",
         help="Markdown output file path",
     )
+    output_group.add_argument(
+        "--ndjson-output",
+        help="Newline-delimited JSON output file path, one repository per line",
+    )
     
     # Other arguments
     parser.add_argument(
@@ -46,7 +67,49 @@ def parse_arguments():
     parser.add_argument(
         "--history-file",
         default="terraform_history.json",
-        help="Path to the history file",
+        help="Path to the history file (.jsonl for append-only storage, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--migrate-history",
+        metavar="DEST",
+        help="Copy the history file to DEST, converted to the format of its extension, and exit",
+    )
+    parser.add_argument(
+        "--compact-history",
+        action="store_true",
+        help="Merge identical consecutive history entries and downsample old ones, then exit",
+    )
+    parser.add_argument(
+        "--history-downsample-after",
+        type=int,
+        default=90,
+        metavar="DAYS",
+        help="Age from which --compact-history keeps one entry per interval (default: 90, 0 disables)",
+    )
+    parser.add_argument(
+        "--history-downsample-interval",
+        type=int,
+        default=7,
+        metavar="DAYS",
+        help="Interval of the entries kept when downsampling (default: 7)",
+    )
+    parser.add_argument(
+        "--history-retention",
+        type=int,
+        metavar="DAYS",
+        help="Age from which --compact-history drops entries (default: keep everything)",
+    )
+    parser.add_argument(
+        "--export-history",
+        metavar="DIR",
+        help="Export the history as columnar files partitioned by month into DIR, then exit "
+             "(constant memory with a .jsonl history only, a .json history is loaded whole)",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="Format of --export-history (default: csv, parquet requires pyarrow)",
     )
     parser.add_argument("--show-history", action="store_true", help="View scan history")
     parser.add_argument(
@@ -57,6 +120,113 @@ def parse_arguments():
         action="store_true",
         help="Include alpha/beta versions when checking for latest provider versions",
     )
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help="Read provider versions from committed .terraform.lock.hcl files instead of running terraform init",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of repositories analyzed concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--terraform-timeout",
+        type=float,
+        default=TerraformRunner.DEFAULT_TIMEOUT,
+        help="Seconds after which a terraform command is killed (default: 600)",
+    )
+    parser.add_argument(
+        "--registry-concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent Terraform Registry lookups (default: 8)",
+    )
+    parser.add_argument(
+        "--registry-url",
+        default=TerraformAnalyzer.REGISTRY_API_URL,
+        help="Providers endpoint of the registry, or base URL of a provider network mirror "
+             "with --registry-protocol mirror (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--registry-protocol",
+        choices=RegistryClient.PROTOCOLS,
+        default="registry",
+        help="Protocol of --registry-url: provider registry or provider network mirror (default: registry)",
+    )
+    parser.add_argument(
+        "--registry-snapshot",
+        metavar="PATH",
+        help="Read provider versions from a snapshot file or a provider mirror directory, without network calls",
+    )
+    parser.add_argument(
+        "--export-registry-snapshot",
+        metavar="FILE",
+        help="Write the provider versions of the registry cache to a snapshot file, then exit",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".terraform-analyzer-cache",
+        help="Directory holding the analyzer caches",
+    )
+    parser.add_argument(
+        "--cache-export",
+        metavar="FILE",
+        help="Pack the registry and plugin caches into a .tar.gz bundle, then exit",
+    )
+    parser.add_argument(
+        "--cache-export-mirrors",
+        action="store_true",
+        help="Include the git mirrors in --cache-export",
+    )
+    parser.add_argument(
+        "--cache-import",
+        metavar="FILE",
+        help="Verify and restore a bundle written by --cache-export into the cache directory, then exit",
+    )
+    parser.add_argument(
+        "--registry-cache-ttl",
+        type=float,
+        default=RegistryCache.DEFAULT_TTL,
+        help="Seconds a cached registry response is used before being revalidated (default: 3600)",
+    )
+    parser.add_argument(
+        "--no-registry-cache",
+        action="store_true",
+        help="Do not cache Terraform Registry responses on disk",
+    )
+    parser.add_argument(
+        "--no-plugin-cache",
+        action="store_true",
+        help="Do not share a provider plugin cache between terraform init runs",
+    )
+    parser.add_argument(
+        "--provider-mirror",
+        help="Filesystem provider mirror directory used by terraform init before the registry",
+    )
+    parser.add_argument(
+        "--git-mirrors",
+        action="store_true",
+        help="Keep persistent git mirrors in the cache directory and fetch them incrementally",
+    )
+    parser.add_argument(
+        "--git-mirrors-max-size",
+        type=int,
+        default=GitMirrorCache.DEFAULT_MAX_SIZE // 1024 ** 2,
+        help="Disk budget of the git mirrors in MB, least recently used mirrors are evicted (default: 10240)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Constant-memory mode: write each result to history and reports as soon as it is analyzed, "
+             "then drop it (use with a .jsonl history file)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the provider selections stored in history for repositories that did not change",
+    )
     return parser.parse_args()
 
 
@@ -64,15 +234,25 @@ def read_config(config_path: str) -> List[RepositoryInfo]:
     try:
         with open(config_path, "r") as file:
             config = yaml.safe_load(file)
+            default_clone_strategy = config.get("clone-strategy")  # Optionnel
             repos_list = [
                 RepositoryInfo(
                     name=repo["name"],
                     repository=repo["repository"],
-                    terraform_path=repo["terraform-path"],
+                    # Discovery walks the whole repository unless a path is given
+                    terraform_path=repo.get("terraform-path", ".") if repo.get("discover") else repo["terraform-path"],
                     branch=repo.get("branch"),  # Optionnel
+                    clone_strategy=repo.get("clone-strategy", default_clone_strategy),  # Optionnel
+                    discover=bool(repo.get("discover", False)),  # Optionnel
                 )
                 for repo in config["repos"]
             ]
+            for repo in repos_list:
+                if repo.clone_strategy and repo.clone_strategy not in RepositoryAnalyzer.CLONE_STRATEGIES:
+                    raise RepositoryAnalysisError(
+                        f"Invalid clone-strategy for {repo.name}: {repo.clone_strategy} "
+                        f"(expected one of {', '.join(RepositoryAnalyzer.CLONE_STRATEGIES)})"
+                    )
             return sorted(repos_list, key=lambda x: x.name)
     except yaml.YAMLError as e:
         raise RepositoryAnalysisError(f"Error parsing config file: {str(e)}")
@@ -82,18 +262,251 @@ def read_config(config_path: str) -> List[RepositoryInfo]:
         raise RepositoryAnalysisError(f"Missing required field in config: {str(e)}")
 
 
-def analyze_repositories(repositories: List[RepositoryInfo]) -> List[dict]:
-    results = []
-    for repo in repositories:
-        try:
-            with RepositoryAnalyzer(repo) as analyzer:
-                result = analyzer.analyze()
-                results.append(result)
-        except Exception as e:
-            results.append({"repository": repo, "error": str(e)})
+def analyze_group(repos: List[RepositoryInfo], resolve_latest: bool = True,
+                  mirror_cache: Optional[GitMirrorCache] = None,
+                  history_manager: Optional[HistoryManager] = None) -> List[List[AnalysisResult]]:
+    """Analyze entries sharing a repository and branch from a single checkout, one result list per entry."""
+    def get_previous(repo):
+        return history_manager.get_latest_successful_entry(repo.name) if history_manager else None
+
+    try:
+        with RepositoryAnalyzer(repos[0], mirror_cache=mirror_cache) as analyzer:
+            return analyzer.analyze_many(repos, resolve_latest=resolve_latest, get_previous=get_previous)
+    except Exception as e:
+        return [
+            [AnalysisResult(
+                repository=repo,
+                installed_terraform_version=os.environ.get('TERRAFORM_VERSION'),
+                error=str(e)
+            )]
+            for repo in repos
+        ]
+
+
+STREAM_HISTORY_BATCH = 50  # Results written to history at once with --stream
+SUBMITTED_GROUPS_PER_JOB = 2  # Groups queued per worker thread ahead of the results being consumed
+
+
+def group_repositories(repositories: List[RepositoryInfo]) -> List[List[int]]:
+    """Group the indexes of the entries cloning the same repository and branch, in config order."""
+    groups = {}
+    for index, repo in enumerate(repositories):
+        groups.setdefault((repo.repository, repo.branch), []).append(index)
+    return list(groups.values())
+
+
+def iter_extract_repositories(repositories: List[RepositoryInfo], jobs: int = 1,
+                              mirror_cache: Optional[GitMirrorCache] = None,
+                              history_manager: Optional[HistoryManager] = None) -> Iterator[List[AnalysisResult]]:
+    """Yield the extraction results of each entry in config order, as soon as it and the previous entries are done."""
+    if jobs < 1:
+        raise RepositoryAnalysisError(f"Invalid number of jobs: {jobs}")
+
+    groups = group_repositories(repositories)
+
+    def extract(group):
+        return analyze_group([repositories[index] for index in group], resolve_latest=False,
+                             mirror_cache=mirror_cache, history_manager=history_manager)
+
+    entry_results = {}
+    next_index = 0
+
+    def store(group, results):
+        nonlocal next_index
+        for index, results_of_entry in zip(group, results):
+            entry_results[index] = results_of_entry
+        while next_index in entry_results:
+            yield entry_results.pop(next_index)
+            next_index += 1
+
+    if jobs == 1 or len(groups) <= 1:
+        for group in groups:
+            yield from store(group, extract(group))
+    else:
+        # Cloning, terraform and registry calls are I/O bound, threads are enough. Groups
+        # are submitted in order, a few ahead of the one being consumed, so that results
+        # waiting to be consumed stay bounded however many repositories are analyzed.
+        workers = min(jobs, len(groups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            remaining = iter(groups)
+            submitted = deque(
+                (group, executor.submit(extract, group))
+                for group in islice(remaining, workers * SUBMITTED_GROUPS_PER_JOB)
+            )
+            while submitted:
+                group, future = submitted.popleft()
+                results = future.result()
+                for group_to_submit in islice(remaining, 1):
+                    submitted.append((group_to_submit, executor.submit(extract, group_to_submit)))
+                yield from store(group, results)
+
+
+def extract_repositories(repositories: List[RepositoryInfo], jobs: int = 1,
+                         mirror_cache: Optional[GitMirrorCache] = None,
+                         history_manager: Optional[HistoryManager] = None) -> List[AnalysisResult]:
+    """Extraction phase: collect provider selections, optionally with `jobs` worker threads.
+
+    Entries of the same repository and branch are analyzed from a single clone. Results
+    are returned in the same order as `repositories`, discovery entries being replaced by
+    the results of the root modules they found. With a `history_manager`, repositories
+    that did not change since their last successful analysis are not re-analyzed.
+    """
+    return [
+        result
+        for results in iter_extract_repositories(repositories, jobs=jobs, mirror_cache=mirror_cache,
+                                                 history_manager=history_manager)
+        for result in results
+    ]
+
+
+def resolve_latest_versions(results: List[AnalysisResult],
+                            resolved: Optional[Dict[str, Optional[ProviderVersionIndex]]] = None) -> List[AnalysisResult]:
+    """Resolution phase: look up and index the releases of each provider used across the run exactly once.
+
+    When results are resolved batch by batch, `resolved` carries the version indexes
+    already built from one batch to the next.
+    """
+    resolved = {} if resolved is None else resolved
+    providers = sorted({
+        provider
+        for result in results if not result.error
+        for provider in result.provider_versions
+    } - resolved.keys())
+    if providers:
+        indexes = TerraformAnalyzer.resolve_version_indexes(providers)
+        resolved.update({provider: indexes.get(provider) for provider in providers})
+
+    for result in results:
+        for provider, version in result.provider_versions.items():
+            index = resolved.get(provider)
+            if index is not None:
+                for name, value in TerraformAnalyzer.describe_version(
+                    index, version.current_version, version.constraint
+                ).items():
+                    setattr(version, name, value)
     return results
 
 
+def analyze_repositories(repositories: List[RepositoryInfo], jobs: int = 1,
+                         mirror_cache: Optional[GitMirrorCache] = None,
+                         history_manager: Optional[HistoryManager] = None) -> List[AnalysisResult]:
+    """Analyze repositories in two phases: extract every selection, then resolve latest versions."""
+    results = extract_repositories(repositories, jobs=jobs, mirror_cache=mirror_cache,
+                                   history_manager=history_manager)
+    return resolve_latest_versions(results)
+
+
+def iter_analyze_repositories(repositories: List[RepositoryInfo], jobs: int = 1,
+                              mirror_cache: Optional[GitMirrorCache] = None,
+                              history_manager: Optional[HistoryManager] = None) -> Iterator[AnalysisResult]:
+    """Analyze repositories, yielding the results in config order as soon as they are ready.
+
+    The latest versions are resolved entry by entry, each provider still being looked up
+    once per run.
+    """
+    resolved = {}
+    for results in iter_extract_repositories(repositories, jobs=jobs, mirror_cache=mirror_cache,
+                                             history_manager=history_manager):
+        yield from resolve_latest_versions(results, resolved)
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+SLOWEST_REPOSITORIES = 5  # Repositories listed with their timings in the run summary
+
+
+class RunSummary:
+    """Statistics of a run gathered result by result, without keeping the results.
+
+    When `live`, clones are reported on stderr as they happen instead of at the end.
+    """
+
+    def __init__(self, live: bool = False):
+        self.live = live
+        self.analyzed = 0
+        self.failed = 0
+        self.unchanged = 0
+        self.clones: List[str] = []
+        self.clone_count = 0
+        self.clone_size = 0
+        self.clone_duration = 0.0
+        self._slowest: List[tuple] = []  # Heap of the SLOWEST_REPOSITORIES slowest results
+
+    def add(self, result: AnalysisResult):
+        self.analyzed += 1
+        self.failed += bool(result.error)
+        self.unchanged += bool(result.unchanged)
+
+        if result.clone_stats:
+            stats = result.clone_stats
+            self.clone_count += 1
+            self.clone_size += stats.size
+            self.clone_duration += stats.duration
+            line = (f"Clone {result.repository.name} [{stats.strategy}]: "
+                    f"{_format_size(stats.size)} in {stats.duration:.1f}s")
+            if self.live:
+                print(line, file=sys.stderr)
+            else:
+                self.clones.append(line)
+
+        if result.timings:
+            # Among results as slow, the first analyzed ranks first
+            item = (sum(result.timings.values()), -self.analyzed, result.repository.name, result.timings)
+            heapq.heappush(self._slowest, item)
+            if len(self._slowest) > SLOWEST_REPOSITORIES:
+                heapq.heappop(self._slowest)
+
+    def slowest(self) -> List[tuple]:
+        """Return the (name, timings) of the slowest results, slowest first."""
+        return [(name, timings) for _, _, name, timings in sorted(self._slowest, reverse=True)]
+
+
+def print_run_summary(summary: RunSummary, registry_cache: Optional[RegistryCache] = None,
+                      evicted_mirror_bytes: Optional[int] = None, plugin_cache: Optional[PluginCache] = None):
+    """Print a short summary of the run on stderr, keeping stdout for reports."""
+    print(
+        f"Run summary: {summary.analyzed} repositories analyzed, {summary.failed} failed, "
+        f"{summary.unchanged} unchanged",
+        file=sys.stderr
+    )
+
+    for line in summary.clones:
+        print(line, file=sys.stderr)
+    if summary.clone_count:
+        print(
+            f"Clones total: {_format_size(summary.clone_size)} in {summary.clone_duration:.1f}s",
+            file=sys.stderr
+        )
+    for name, timings in summary.slowest():
+        steps = ", ".join(f"{step} {duration:.1f}s" for step, duration in timings.items())
+        print(
+            f"Slow {name}: {sum(timings.values()):.1f}s ({steps})",
+            file=sys.stderr
+        )
+    if registry_cache is not None:
+        stats = registry_cache.stats()
+        print(
+            f"Registry cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} misses",
+            file=sys.stderr
+        )
+    if plugin_cache is not None:
+        stats = plugin_cache.stats()
+        print(
+            f"Plugin cache: {_format_size(stats['downloaded'])} downloaded, "
+            f"{_format_size(stats['from_cache'])} served from cache",
+            file=sys.stderr
+        )
+    if evicted_mirror_bytes:
+        print(f"Git mirrors: {_format_size(evicted_mirror_bytes)} evicted", file=sys.stderr)
+
+
 def show_history(history_manager: HistoryManager):
     """Affiche l'historique des analyses."""
     for repo_name in history_manager.get_repository_names():
@@ -115,13 +528,49 @@ def main():
 
     try:
         # Set include_prerelease flag on TerraformAnalyzer
-        from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
         TerraformAnalyzer.set_include_prerelease(args.include_prerelease)
+        TerraformAnalyzer.set_static_analysis(args.static)
+        TerraformAnalyzer.set_terraform_timeout(args.terraform_timeout)
+        TerraformAnalyzer.set_registry_concurrency(args.registry_concurrency)
+        TerraformAnalyzer.set_registry_url(args.registry_url, args.registry_protocol)
 
         # Initialize history manager
         history_manager = HistoryManager(args.history_file)
 
         # If we want to see history or changes, do it and exit
+        if args.migrate_history:
+            count = history_manager.migrate(args.migrate_history)
+            print(f"Migrated {count} history entries to {args.migrate_history}", file=sys.stderr)
+            return
+        if args.export_history:
+            count = export_history(history_manager.iter_entries(), args.export_history, args.export_format)
+            print(f"Exported {count} rows to {args.export_history}", file=sys.stderr)
+            return
+        if args.cache_export:
+            sections = DEFAULT_SECTIONS + (('mirrors',) if args.cache_export_mirrors else ())
+            manifest = export_cache(args.cache_dir, args.cache_export, sections)
+            size = sum(info['size'] for info in manifest['files'].values())
+            print(f"Exported {len(manifest['files'])} cache files ({_format_size(size)}) to {args.cache_export}",
+                  file=sys.stderr)
+            return
+        if args.cache_import:
+            manifest = import_cache(args.cache_dir, args.cache_import)
+            print(f"Imported {len(manifest['files'])} cache files ({', '.join(manifest['sections'])}) "
+                  f"into {args.cache_dir}", file=sys.stderr)
+            return
+        if args.export_registry_snapshot:
+            count = export_snapshot(RegistryCache(os.path.join(args.cache_dir, 'registry')),
+                                    args.export_registry_snapshot)
+            print(f"Exported {count} providers to {args.export_registry_snapshot}", file=sys.stderr)
+            return
+        if args.compact_history:
+            before, after = history_manager.compact(
+                downsample_after=timedelta(days=args.history_downsample_after) if args.history_downsample_after else None,
+                downsample_interval=timedelta(days=args.history_downsample_interval),
+                retention=timedelta(days=args.history_retention) if args.history_retention else None
+            )
+            print(f"Compacted history from {before} to {after} entries", file=sys.stderr)
+            return
         if args.show_history:
             show_history(history_manager)
             return
@@ -132,12 +581,26 @@ def main():
         # Read configuration
         repositories = read_config(args.config)
 
-        # Analyze repositories
-        results = analyze_repositories(repositories)
+        registry_cache = None
+        if args.registry_snapshot:
+            # Offline: every lookup is answered by the snapshot
+            TerraformAnalyzer.set_registry_snapshot(args.registry_snapshot)
+        elif not args.no_registry_cache:
+            registry_cache = RegistryCache(
+                os.path.join(args.cache_dir, 'registry'), ttl=args.registry_cache_ttl
+            )
+        TerraformAnalyzer.set_registry_cache(registry_cache)
+
+        plugin_cache = None
+        if not args.no_plugin_cache:
+            plugin_cache = PluginCache(os.path.join(args.cache_dir, 'plugins'), mirror_dir=args.provider_mirror)
+        TerraformAnalyzer.set_plugin_cache(plugin_cache)
 
-        # Add results to history
-        for result in results:
-            history_manager.add_entry(result)
+        mirror_cache = None
+        if args.git_mirrors:
+            mirror_cache = GitMirrorCache(
+                os.path.join(args.cache_dir, 'mirrors'), max_size=args.git_mirrors_max_size * 1024 ** 2
+            )
 
         # Generate outputs for each requested format
         output_formats = {
@@ -145,25 +608,55 @@ def main():
             'json': args.json_output,
             'csv': args.csv_output,
             'html': args.html_output,
-            'markdown': args.markdown_output
+            'markdown': args.markdown_output,
+            'ndjson': args.ndjson_output
         }
 
         # Check if any output format was specified
         if not any(output_formats.values()):
             # Default to text output to console
-            formatter = FormatterFactory.get_formatter('text')
-            print(formatter.format(results))
+            sinks = [OutputSink(FormatterFactory.get_formatter('text'))]
         else:
-            # Generate each requested output format
-            for format_type, output_file in output_formats.items():
-                if output_file is not None:
-                    formatter = FormatterFactory.get_formatter(format_type)
-                    output = formatter.format(results)
-                    if output_file == '-':
-                        print(output)
-                    else:
-                        with open(output_file, "w") as f:
-                            f.write(output)
+            sinks = [
+                OutputSink(FormatterFactory.get_formatter(format_type), output_file)
+                for format_type, output_file in output_formats.items()
+                if output_file is not None
+            ]
+
+        # Analyze repositories, each report growing as repositories finish. If the run
+        # fails midway, the reports are still completed with the results obtained so far.
+        # In stream mode, results are written to history in batches and dropped once
+        # reported; otherwise they are all kept and written to history in one write.
+        results = []
+        summary = RunSummary(live=args.stream)
+        pipeline = OutputPipeline(sinks)
+        # Output files are opened before any repository is analyzed, so that a bad path fails fast
+        pipeline.start()
+        try:
+            for result in iter_analyze_repositories(
+                repositories,
+                jobs=args.jobs,
+                mirror_cache=mirror_cache,
+                history_manager=history_manager if args.incremental else None
+            ):
+                results.append(result)
+                if args.stream and len(results) >= STREAM_HISTORY_BATCH:
+                    history_manager.add_entries(results)
+                    results = []
+                pipeline.emit(result)
+                summary.add(result)
+            # Add the results of the completed run to history in one write, overlapping
+            # with the end of the rendering of the reports
+            history_manager.add_entries(results, background=True)
+        finally:
+            try:
+                pipeline.close()
+            finally:
+                # A failed report does not lose the history of the run
+                history_manager.flush()
+
+        evicted_mirror_bytes = mirror_cache.evict() if mirror_cache is not None else None
+        print_run_summary(summary, registry_cache, evicted_mirror_bytes, plugin_cache)
 
     except Exception as e:
         print(f"Erreur : {str(e)}")
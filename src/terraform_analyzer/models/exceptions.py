@@ -4,4 +4,19 @@ class RepositoryAnalysisError(Exception):
 
 class TerraformAnalysisError(Exception):
     """Custom exception for Terraform analysis errors"""
-    pass 
\ No newline at end of file
+    pass 
+
+
+class HistoryError(Exception):
+    """Custom exception for history storage and export errors"""
+    pass
+
+
+class RegistryError(Exception):
+    """Custom exception for registry lookups and snapshots"""
+    pass
+
+
+class CacheBundleError(Exception):
+    """Custom exception for cache bundle export and import errors"""
+    pass
@@ -35,6 +35,10 @@ class HistoryEntry:
     terraform_version: Optional[str]
     provider_versions: Dict[str, Dict[str, str]]  # Store as dict for JSON serialization
     error: Optional[str]
+    commit_sha: Optional[str] = None
+    fingerprint: Optional[str] = None
+    run_count: int = 1  # Consecutive identical runs merged into this entry by compaction
+    first_seen: Optional[datetime] = None  # Timestamp of the first of these runs, `timestamp` being the last
 
     @classmethod
     def from_analysis_result(cls, result, timestamp=None):
@@ -42,20 +46,23 @@ class HistoryEntry:
             timestamp = datetime.now()
             
         # Convert ProviderVersion objects to dictionary format
-        provider_versions = {
-            provider: {
+        provider_versions = {}
+        for provider, version in result.provider_versions.items():
+            provider_versions[provider] = {
                 'current_version': version.current_version,
                 'latest_version': version.latest_version
             }
-            for provider, version in result.provider_versions.items()
-        }
+            if version.constraint:
+                provider_versions[provider]['constraint'] = version.constraint
         
         return cls(
             timestamp=timestamp,
             repository=result.repository,
             terraform_version=result.terraform_version,
             provider_versions=provider_versions,
-            error=result.error
+            error=result.error,
+            commit_sha=result.commit_sha,
+            fingerprint=result.fingerprint
         )
 
     def to_dict(self) -> dict:
@@ -69,7 +76,11 @@ class HistoryEntry:
             },
             'terraform_version': self.terraform_version,
             'provider_versions': self.provider_versions,
-            'error': self.error
+            'error': self.error,
+            'commit_sha': self.commit_sha,
+            'fingerprint': self.fingerprint,
+            'run_count': self.run_count,
+            'first_seen': self.first_seen.isoformat() if self.first_seen else None
         }
 
     @classmethod
@@ -84,5 +95,9 @@ class HistoryEntry:
             ),
             terraform_version=data['terraform_version'],
             provider_versions=data['provider_versions'],
-            error=data['error']
+            error=data['error'],
+            commit_sha=data.get('commit_sha'),
+            fingerprint=data.get('fingerprint'),
+            run_count=data.get('run_count', 1),
+            first_seen=datetime.fromisoformat(data['first_seen']) if data.get('first_seen') else None
         )
\ No newline at end of file
@@ -5,6 +5,10 @@ from typing import Dict, Optional
 class ProviderVersion:
     current_version: str
     latest_version: Optional[str]
+    constraint: Optional[str] = None  # Version constraint of the module (lock file or required_providers)
+    latest_in_major: Optional[str] = None  # Latest release of the major version in use
+    releases_behind: Optional[int] = None  # Number of releases newer than the version in use
+    latest_allowed: Optional[str] = None  # Latest release satisfying the constraint
 
 @dataclass
 class RepositoryInfo:
@@ -12,6 +16,14 @@ class RepositoryInfo:
     repository: str
     terraform_path: str
     branch: Optional[str] = None
+    clone_strategy: Optional[str] = None  # full, shallow, blobless or sparse (default: full)
+    discover: bool = False  # Analyze every root module found under terraform_path
+
+@dataclass
+class CloneStats:
+    strategy: str
+    duration: float  # seconds
+    size: int  # bytes on disk, including .git
 
 @dataclass
 class AnalysisResult:
@@ -19,4 +31,9 @@ class AnalysisResult:
     terraform_version: Optional[str] = None
     installed_terraform_version: Optional[str] = None  # Added field for installed version
     provider_versions: Dict[str, ProviderVersion] = field(default_factory=dict)
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    clone_stats: Optional[CloneStats] = None
+    commit_sha: Optional[str] = None  # Analyzed commit
+    fingerprint: Optional[str] = None  # Hash of the lock file or of the Terraform directory
+    unchanged: bool = False  # Selections reused from history because nothing changed
+    timings: Dict[str, float] = field(default_factory=dict)  # Wall time per step (clone, init, version), in seconds
\ No newline at end of file
@@ -0,0 +1,200 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, Sequence, Tuple
+from ..models.exceptions import CacheBundleError
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+CACHE_SECTIONS = ('registry', 'plugins', 'mirrors')  # Subdirectories of the cache directory
+DEFAULT_SECTIONS = ('registry', 'plugins')  # Git mirrors are large, they are only bundled on request
+_READ_SIZE = 1024 * 1024
+# Lock files, temporary files and the CLI configuration (which holds an absolute path) stay local
+_EXCLUDED_NAMES = ('.lock', '.terraformrc')
+_EXCLUDED_SUFFIXES = ('.lock', '.tmp')
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _archive_name(cache_dir: str, path: str) -> str:
+    return os.path.relpath(path, cache_dir).replace(os.sep, '/')
+
+
+def _iter_cache_directories(cache_dir: str, sections: Sequence[str]) -> Iterator[str]:
+    """Yield the archive names of the directories of the sections (git needs empty ones, e.g. refs/tags)."""
+    for section in sections:
+        for root, dirs, _ in os.walk(os.path.join(cache_dir, section)):
+            dirs.sort()
+            for name in dirs:
+                if not os.path.islink(os.path.join(root, name)):
+                    yield _archive_name(cache_dir, os.path.join(root, name))
+
+
+def _iter_cache_files(cache_dir: str, sections: Sequence[str]) -> Iterator[Tuple[str, str]]:
+    """Yield the (archive name, path) of the regular files of the sections, in a stable order."""
+    for section in sections:
+        section_dir = os.path.join(cache_dir, section)
+        for root, dirs, files in os.walk(section_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if name in _EXCLUDED_NAMES or name.endswith(_EXCLUDED_SUFFIXES) or name.startswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                yield _archive_name(cache_dir, path), path
+
+
+def export_cache(cache_dir: str, bundle_path: str, sections: Sequence[str] = DEFAULT_SECTIONS) -> dict:
+    """Pack the cache sections into a gzipped tar bundle and return its manifest.
+
+    The manifest, first member of the bundle, lists the directories and the sha256, size
+    and mode of every file. The bundle is written atomically; the caches must not be written meanwhile.
+    """
+    unknown = set(sections) - set(CACHE_SECTIONS)
+    if unknown:
+        raise CacheBundleError(f"Unknown cache sections: {', '.join(sorted(unknown))}")
+
+    files = {}
+    for name, path in _iter_cache_files(cache_dir, sections):
+        files[name] = {
+            'sha256': _hash_file(path),
+            'size': os.path.getsize(path),
+            'mode': os.stat(path).st_mode & 0o755
+        }
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'sections': list(sections),
+        'directories': list(_iter_cache_directories(cache_dir, sections)),
+        'files': files
+    }
+
+    directory = os.path.dirname(os.path.abspath(bundle_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(bundle_path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f, tarfile.open(fileobj=f, mode='w:gz') as tar:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(datetime.now().timestamp())
+            tar.addfile(info, io.BytesIO(data))
+            for name in files:
+                tar.add(os.path.join(cache_dir, name), arcname=name, recursive=False)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, bundle_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return manifest
+
+
+def _read_manifest(tar: tarfile.TarFile) -> dict:
+    member = tar.next()
+    if member is None or member.name != MANIFEST_NAME or not member.isfile():
+        raise CacheBundleError(f"Not a cache bundle: {MANIFEST_NAME} must be its first member")
+    try:
+        manifest = json.load(tar.extractfile(member))
+    except ValueError as e:
+        raise CacheBundleError(f"Invalid cache bundle manifest: {str(e)}")
+    if not isinstance(manifest, dict) or manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise CacheBundleError(f"Unsupported cache bundle (expected format_version {BUNDLE_FORMAT_VERSION})")
+    if not isinstance(manifest.get('files'), dict) or not isinstance(manifest.get('directories', []), list):
+        raise CacheBundleError("Invalid cache bundle manifest: missing file list")
+    sections = manifest.get('sections')
+    if not isinstance(sections, list) or any(section not in CACHE_SECTIONS for section in sections):
+        raise CacheBundleError(f"Invalid cache bundle manifest: sections must be a list of {', '.join(CACHE_SECTIONS)}")
+    for name, info in manifest['files'].items():
+        if not (isinstance(info, dict) and _is_int(info.get('size')) and isinstance(info.get('sha256'), str)
+                and _is_int(info.get('mode', 0))):
+            raise CacheBundleError(f"Invalid cache bundle manifest: bad size or sha256 for {name}")
+    for name in list(manifest['files']) + manifest.get('directories', []):
+        _check_name(name)
+    return manifest
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_name(name: str):
+    """Reject archive names that would be extracted outside of a cache section."""
+    parts = name.split('/')
+    if (name.startswith('/') or '\\' in name or parts[0] not in CACHE_SECTIONS or len(parts) < 2
+            or any(part in ('', '.', '..') for part in parts)):
+        raise CacheBundleError(f"Unsafe path in cache bundle: {name}")
+
+
+def _extract_member(tar: tarfile.TarFile, member: tarfile.TarInfo, expected: dict, destination: str):
+    """Write a member to `destination`, checking its size and hash as it is written."""
+    digest = hashlib.sha256()
+    size = 0
+    source = tar.extractfile(member)
+    with open(destination, 'wb') as f:
+        for block in iter(lambda: source.read(_READ_SIZE), b''):
+            size += len(block)
+            if size > expected['size']:
+                break
+            digest.update(block)
+            f.write(block)
+    if size != expected['size'] or digest.hexdigest() != expected['sha256']:
+        raise CacheBundleError(f"Integrity check failed for {member.name}")
+    os.chmod(destination, expected.get('mode', 0o644) & 0o755)
+
+
+def import_cache(cache_dir: str, bundle_path: str) -> dict:
+    """Restore a cache bundle into the cache directory and return its manifest.
+
+    Every file is extracted to a staging directory and checked against the manifest
+    before any is moved into the cache: a corrupted or tampered bundle leaves the cache
+    untouched. Only regular files listed in the manifest are accepted, under the cache
+    sections. Files already in the cache are replaced by those of the bundle.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix='.import-')
+    try:
+        try:
+            with tarfile.open(bundle_path, mode='r:gz') as tar:
+                manifest = _read_manifest(tar)
+                expected: Dict[str, dict] = manifest['files']
+                extracted = set()
+                # Iterating a tar file starts over from its first member, the manifest
+                for member in islice(tar, 1, None):
+                    if member.isdir():
+                        continue
+                    if not member.isfile() or member.name not in expected:
+                        raise CacheBundleError(f"Unexpected member in cache bundle: {member.name}")
+                    if member.name in extracted:
+                        raise CacheBundleError(f"Duplicate member in cache bundle: {member.name}")
+                    destination = os.path.join(staging, *member.name.split('/'))
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    _extract_member(tar, member, expected[member.name], destination)
+                    extracted.add(member.name)
+        except (tarfile.TarError, EOFError, OSError) as e:
+            raise CacheBundleError(f"Cannot read cache bundle {bundle_path}: {str(e)}")
+        missing = set(expected) - extracted
+        if missing:
+            raise CacheBundleError(f"Cache bundle is missing {len(missing)} files, e.g. {sorted(missing)[0]}")
+
+        for name in manifest.get('directories', []):
+            os.makedirs(os.path.join(cache_dir, *name.split('/')), exist_ok=True)
+        for name in sorted(extracted):
+            target = os.path.join(cache_dir, *name.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(os.path.join(staging, *name.split('/')), target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return manifest
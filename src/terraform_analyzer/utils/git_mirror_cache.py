@@ -0,0 +1,150 @@
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence, Set, Tuple
+from ..models.exceptions import RepositoryAnalysisError
+from .filesystem import disk_usage
+
+
+class GitMirrorCache:
+    """Persistent bare mirrors of analyzed repositories.
+
+    The first use of a repository clones it into the cache, later uses only fetch
+    the analyzed branch. Mirrors are evicted least recently used first once the
+    cache grows over `max_size` bytes.
+    """
+
+    DEFAULT_MAX_SIZE = 10 * 1024 ** 3  # 10 GB
+    GIT_TIMEOUT = 600  # seconds
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._used: Set[str] = set()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def mirror_path(self, url: str) -> str:
+        """Return the mirror directory of a repository URL."""
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', url.rstrip('/').split('/')[-1])
+        if name.endswith('.git'):
+            name = name[:-4]
+        digest = hashlib.sha256(url.encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}-{digest}.git")
+
+    @contextmanager
+    def _locked(self, mirror_path: str, blocking: bool = True):
+        """Lock a mirror against other threads and processes; yield False if busy and not blocking."""
+        with self._locks_lock:
+            thread_lock = self._locks.setdefault(mirror_path, threading.Lock())
+        if not thread_lock.acquire(blocking):
+            yield False
+            return
+        try:
+            with open(mirror_path + '.lock', 'w') as lock_file:
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                try:
+                    fcntl.flock(lock_file, flags)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            thread_lock.release()
+
+    def _git(self, *args: str, cwd: Optional[str] = None) -> str:
+        result = subprocess.run(
+            ['git', *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=self.GIT_TIMEOUT
+        )
+        if result.returncode != 0:
+            raise RepositoryAnalysisError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def update(self, url: str, branch: Optional[str] = None, shallow: bool = False) -> Tuple[str, str]:
+        """Create or fetch the mirror of a repository and return (mirror_path, commit_sha) of the branch."""
+        mirror_path = self.mirror_path(url)
+        ref = branch or 'HEAD'
+        with self._locked(mirror_path):
+            if not os.path.exists(os.path.join(mirror_path, 'HEAD')):
+                shutil.rmtree(mirror_path, ignore_errors=True)
+                self._git('init', '--bare', '--quiet', mirror_path)
+                self._git('remote', 'add', 'origin', url, cwd=mirror_path)
+
+            fetch_args = ['fetch', '--quiet', '--no-tags']
+            if shallow:
+                fetch_args.append('--depth=1')
+            self._git(*fetch_args, 'origin', ref, cwd=mirror_path)
+            commit = self._git('rev-parse', 'FETCH_HEAD^{commit}', cwd=mirror_path)
+            # Keep the analyzed commit referenced so that it survives git gc
+            self._git('update-ref', f"refs/analyzed/{branch or 'HEAD'}", commit, cwd=mirror_path)
+
+            os.utime(mirror_path)
+            with self._locks_lock:
+                self._used.add(mirror_path)
+        return mirror_path, commit
+
+    def export(self, mirror_path: str, commit: str, destination: str, paths: Sequence[str] = ()):
+        """Write the tree of `commit` (or only `paths` within it) to `destination`."""
+        args = ['git', 'archive', '--format=tar', commit]
+        if paths:
+            args += ['--', *paths]
+        os.makedirs(destination, exist_ok=True)
+        process = subprocess.Popen(args, cwd=mirror_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            with tarfile.open(fileobj=process.stdout, mode='r|') as archive:
+                if hasattr(tarfile, 'data_filter'):
+                    archive.extractall(destination, filter='data')
+                else:
+                    archive.extractall(destination)
+        except tarfile.TarError as e:
+            process.kill()
+            raise RepositoryAnalysisError(f"Failed to export {commit} from mirror: {str(e)}")
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors='replace')
+            process.stderr.close()
+            process.wait()
+        if process.returncode != 0:
+            raise RepositoryAnalysisError(f"git archive failed: {stderr.strip()}")
+
+    def evict(self) -> int:
+        """Remove least recently used mirrors until the cache fits its budget, return the bytes freed.
+
+        Mirrors used during this run and mirrors locked by another process are kept.
+        """
+        mirrors = []
+        for entry in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, entry)
+            if entry.endswith('.git') and os.path.isdir(path):
+                mirrors.append((os.path.getmtime(path), path, disk_usage(path)))
+
+        total = sum(size for _, _, size in mirrors)
+        freed = 0
+        for _, path, size in sorted(mirrors):
+            if total <= self.max_size:
+                break
+            if path in self._used:
+                continue
+            with self._locked(path, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+            if os.path.exists(path + '.lock'):
+                os.remove(path + '.lock')
+            total -= size
+            freed += size
+        return freed
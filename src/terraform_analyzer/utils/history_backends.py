@@ -0,0 +1,138 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+from ..models.history import HistoryEntry
+from .filesystem import atomic_write
+from .history_index import HistoryIndex
+
+
+class HistoryBackend(ABC):
+    """Storage of the history entries, grouped by repository name."""
+
+    rewrites_on_append = False  # Whether append() needs the whole history
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def load(self) -> Dict[str, List[HistoryEntry]]:
+        history: Dict[str, List[HistoryEntry]] = {}
+        for entry in self.iter_entries():
+            history.setdefault(entry.repository.name, []).append(entry)
+        return history
+
+    @abstractmethod
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        """Yield the stored entries, oldest first for each repository."""
+
+    @abstractmethod
+    def append(self, entries: List[HistoryEntry], history: Optional[Dict[str, List[HistoryEntry]]]):
+        """Persist new `entries`; `history` is the whole history, entries included, when `rewrites_on_append`."""
+
+    @abstractmethod
+    def rewrite(self, history: Dict[str, List[HistoryEntry]]):
+        """Atomically replace the stored history."""
+
+    def open_index(self) -> Optional[HistoryIndex]:
+        """Return an index to read single entries without loading the history, if the format has one."""
+        return None
+
+
+class JsonHistoryBackend(HistoryBackend):
+    """Original format: a single JSON object mapping repository names to their entries.
+
+    Every write re-serializes the whole history.
+    """
+
+    rewrites_on_append = True
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def load(self) -> Dict[str, List[HistoryEntry]]:
+        return {
+            repo_name: [HistoryEntry.from_dict(entry) for entry in entries]
+            for repo_name, entries in self._read().items()
+        }
+
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        for entries in self._read().values():
+            for entry in entries:
+                yield HistoryEntry.from_dict(entry)
+
+    def append(self, entries: List[HistoryEntry], history: Dict[str, List[HistoryEntry]]):
+        self.rewrite(history)
+
+    def rewrite(self, history: Dict[str, List[HistoryEntry]]):
+        atomic_write(self.path, json.dumps({
+            repo: [entry.to_dict() for entry in entries]
+            for repo, entries in history.items()
+        }, indent=2))
+
+
+class JsonLinesHistoryBackend(HistoryBackend):
+    """Append-only format: one JSON entry per line, only new entries are written."""
+
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last line can be incomplete, after an interrupted write
+                    continue
+                yield HistoryEntry.from_dict(data)
+
+    def append(self, entries: List[HistoryEntry], history: Optional[Dict[str, List[HistoryEntry]]] = None):
+        if not entries:
+            return
+        content = ''.join(json.dumps(entry.to_dict()) + '\n' for entry in entries)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # Start on a new line if a previous write was interrupted mid-line
+            if os.fstat(fd).st_size and not self._ends_with_newline():
+                content = '\n' + content
+            # O_APPEND writes land at the end of the file even if another process appended meanwhile
+            data = content.encode()
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.open_index().close()
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def rewrite(self, history: Dict[str, List[HistoryEntry]]):
+        atomic_write(self.path, ''.join(
+            json.dumps(entry.to_dict()) + '\n'
+            for entries in history.values()
+            for entry in entries
+        ))
+        # Offsets of the previous file are meaningless, index the new one from scratch
+        index = HistoryIndex(self.path)
+        index.update()
+        index.save()
+
+    def open_index(self) -> HistoryIndex:
+        return HistoryIndex.open(self.path)
+
+
+def open_history_backend(path: str) -> HistoryBackend:
+    """Pick the backend of a history file from its extension (.jsonl or JSON)."""
+    if str(path).endswith('.jsonl'):
+        return JsonLinesHistoryBackend(path)
+    return JsonHistoryBackend(path)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from ..models.history import HistoryEntry
+
+
+def same_snapshot(a: HistoryEntry, b: HistoryEntry) -> bool:
+    """Check whether two entries recorded the same versions, whatever their timestamps and commits."""
+    return (
+        a.repository == b.repository
+        and a.terraform_version == b.terraform_version
+        and a.provider_versions == b.provider_versions
+        and a.error == b.error
+    )
+
+
+def merge_unchanged(entries: List[HistoryEntry]) -> List[HistoryEntry]:
+    """Merge runs of consecutive identical snapshots into one entry.
+
+    The merged entry keeps the timestamp, commit and fingerprint of the last run, the
+    timestamp of the first run in `first_seen` and the number of runs in `run_count`.
+    """
+    merged: List[HistoryEntry] = []
+    for entry in entries:
+        if merged and same_snapshot(merged[-1], entry):
+            last = merged[-1]
+            merged[-1] = HistoryEntry(
+                timestamp=entry.timestamp,
+                repository=entry.repository,
+                terraform_version=entry.terraform_version,
+                provider_versions=entry.provider_versions,
+                error=entry.error,
+                commit_sha=entry.commit_sha,
+                fingerprint=entry.fingerprint,
+                run_count=last.run_count + entry.run_count,
+                first_seen=last.first_seen or last.timestamp
+            )
+        else:
+            merged.append(entry)
+    return merged
+
+
+def downsample(entries: List[HistoryEntry], now: datetime, after: Optional[timedelta],
+               interval: timedelta, retention: Optional[timedelta] = None) -> List[HistoryEntry]:
+    """Thin out old entries of a repository, oldest first.
+
+    Entries older than `after` are kept at most once per `interval` (the last entry of
+    each interval is kept), entries older than `retention` are dropped. The latest entry
+    and the last two successful ones are always kept, so that the current state and the
+    last version changes of a repository survive.
+    """
+    protected = {id(entries[-1])} if entries else set()
+    protected.update(id(entry) for entry in [e for e in entries if not e.error][-2:])
+
+    kept = []
+    for position, entry in enumerate(entries):
+        age = now - entry.timestamp
+        if id(entry) in protected:
+            kept.append(entry)
+        elif retention is not None and age > retention:
+            continue
+        elif after is not None and age > after:
+            # Keep the entry only if the next one falls into a later interval
+            following = entries[position + 1] if position + 1 < len(entries) else None
+            if following is None or _interval(following.timestamp, interval) != _interval(entry.timestamp, interval):
+                kept.append(entry)
+        else:
+            kept.append(entry)
+    return kept
+
+
+def _interval(timestamp: datetime, interval: timedelta) -> int:
+    return int((timestamp - datetime(1970, 1, 5)).total_seconds() // interval.total_seconds())  # Weeks start on Monday
+
+
+def compact_entries(entries: List[HistoryEntry], now: Optional[datetime] = None,
+                    downsample_after: Optional[timedelta] = timedelta(days=90),
+                    downsample_interval: timedelta = timedelta(days=7),
+                    retention: Optional[timedelta] = None) -> List[HistoryEntry]:
+    """Compact the entries of a repository: merge unchanged snapshots, then downsample old ones."""
+    return downsample(
+        merge_unchanged(entries),
+        now or datetime.now(),
+        downsample_after,
+        downsample_interval,
+        retention
+    )
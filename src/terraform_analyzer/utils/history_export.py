@@ -0,0 +1,110 @@
+import csv
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+from ..models.exceptions import HistoryError
+from ..models.history import HistoryEntry
+
+COLUMNS = ['timestamp', 'first_seen', 'run_count', 'repository', 'provider', 'current_version', 'latest_version']
+EXPORT_FORMATS = ('csv', 'parquet')
+PARQUET_BATCH_SIZE = 10000  # Rows buffered per month before a Parquet row group is written
+
+
+def history_rows(entries: Iterable[HistoryEntry]) -> Iterator[Tuple[str, Dict]]:
+    """Flatten entries into (month, row) pairs, one row per provider of each successful entry."""
+    for entry in entries:
+        if entry.error:
+            continue
+        month = entry.timestamp.strftime('%Y-%m')
+        for provider, versions in entry.provider_versions.items():
+            yield month, {
+                'timestamp': entry.timestamp,
+                'first_seen': entry.first_seen or entry.timestamp,
+                'run_count': entry.run_count,
+                'repository': entry.repository.name,
+                'provider': provider,
+                'current_version': versions.get('current_version'),
+                'latest_version': versions.get('latest_version')
+            }
+
+
+def _partition_path(directory: str, month: str, extension: str) -> str:
+    # Hive-style partitions are read as a `month` column by pandas/pyarrow datasets
+    partition = os.path.join(directory, f"month={month}")
+    os.makedirs(partition, exist_ok=True)
+    return os.path.join(partition, f"history.{extension}")
+
+
+def export_csv(entries: Iterable[HistoryEntry], directory: str) -> int:
+    """Write one CSV file per month under `directory`; return the number of rows."""
+    files = {}
+    writers = {}
+    count = 0
+    try:
+        for month, row in history_rows(entries):
+            if month not in writers:
+                files[month] = open(_partition_path(directory, month, 'csv'), 'w', newline='')
+                writers[month] = csv.DictWriter(files[month], fieldnames=COLUMNS)
+                writers[month].writeheader()
+            writers[month].writerow({
+                **row,
+                'timestamp': row['timestamp'].isoformat(),
+                'first_seen': row['first_seen'].isoformat()
+            })
+            count += 1
+    finally:
+        for f in files.values():
+            f.close()
+    return count
+
+
+def export_parquet(entries: Iterable[HistoryEntry], directory: str) -> int:
+    """Write one Parquet file per month under `directory`; return the number of rows."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise HistoryError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ('timestamp', pa.timestamp('us')),
+        ('first_seen', pa.timestamp('us')),
+        ('run_count', pa.int64()),
+        ('repository', pa.string()),
+        ('provider', pa.string()),
+        ('current_version', pa.string()),
+        ('latest_version', pa.string()),
+    ])
+    writers = {}
+    batches: Dict[str, List[Dict]] = {}
+    count = 0
+
+    def write(month):
+        rows = batches.pop(month, [])
+        if rows:
+            table = pa.Table.from_pylist(rows, schema=schema)
+            writers[month].write_table(table)
+
+    try:
+        for month, row in history_rows(entries):
+            if month not in writers:
+                writers[month] = pq.ParquetWriter(_partition_path(directory, month, 'parquet'), schema)
+            batches.setdefault(month, []).append(row)
+            if len(batches[month]) >= PARQUET_BATCH_SIZE:
+                write(month)
+            count += 1
+        for month in list(batches):
+            write(month)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return count
+
+
+def export_history(entries: Iterable[HistoryEntry], directory: str, export_format: str = 'csv') -> int:
+    """Stream history entries into a columnar dataset partitioned by month; return the number of rows."""
+    if export_format not in EXPORT_FORMATS:
+        raise HistoryError(f"Unknown export format: {export_format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    os.makedirs(directory, exist_ok=True)
+    if export_format == 'parquet':
+        return export_parquet(entries, directory)
+    return export_csv(entries, directory)
@@ -0,0 +1,131 @@
+import json
+import mmap
+import os
+from typing import Dict, List, Optional
+from ..models.history import HistoryEntry
+from .filesystem import atomic_write
+
+# Successful entries kept per repository: --show-changes compares the last two
+SUCCESSFUL_ENTRIES = 2
+
+
+class HistoryIndex:
+    """Sidecar index of a JSONL history file, stored next to it as `<history file>.idx`.
+
+    For each repository it records the byte offsets of the latest entry and of the last
+    successful ones, so that these entries are read from the memory-mapped history file
+    without parsing the rest of it. The index remembers the size of the history it
+    covers: lines appended since are indexed on open, a rewritten history (new inode or
+    shorter file) is indexed from scratch.
+    """
+
+    VERSION = 1
+
+    def __init__(self, history_path: str):
+        self.history_path = str(history_path)
+        self.path = self.history_path + '.idx'
+        self.inode: Optional[int] = None
+        self.size = 0
+        self.repositories: Dict[str, Dict] = {}
+        self._map: Optional[mmap.mmap] = None
+
+    @classmethod
+    def open(cls, history_path: str) -> 'HistoryIndex':
+        """Load the sidecar index, bring it up to date with the history file and save it if it changed."""
+        index = cls(history_path)
+        index._load()
+        if index.update():
+            index.save()
+        return index
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.VERSION:
+            return
+        self.inode = data['inode']
+        self.size = data['size']
+        self.repositories = data['repositories']
+
+    def _reset(self, inode: Optional[int]):
+        self.inode = inode
+        self.size = 0
+        self.repositories = {}
+
+    def update(self) -> bool:
+        """Index the lines appended to the history file since the last update; return whether anything changed."""
+        try:
+            stat = os.stat(self.history_path)
+        except FileNotFoundError:
+            changed = self.size != 0 or bool(self.repositories)
+            self._reset(None)
+            return changed
+
+        changed = False
+        if stat.st_ino != self.inode or stat.st_size < self.size:
+            self._reset(stat.st_ino)
+            changed = True
+        if stat.st_size == self.size:
+            return changed
+
+        with open(self.history_path, 'rb') as f:
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Incomplete last line of a write in progress or interrupted
+                    break
+                self._index_line(line, offset)
+                offset += len(line)
+        if offset != self.size:
+            self.size = offset
+            changed = True
+        return changed
+
+    def _index_line(self, line: bytes, offset: int):
+        try:
+            data = json.loads(line)
+            name = data['repository']['name']
+        except (ValueError, KeyError, TypeError):
+            return
+        repository = self.repositories.setdefault(name, {'latest': None, 'successful': []})
+        repository['latest'] = offset
+        if not data.get('error'):
+            repository['successful'] = (repository['successful'] + [offset])[-SUCCESSFUL_ENTRIES:]
+
+    def save(self):
+        atomic_write(self.path, json.dumps({
+            'version': self.VERSION,
+            'inode': self.inode,
+            'size': self.size,
+            'repositories': self.repositories
+        }))
+
+    def names(self) -> List[str]:
+        return list(self.repositories)
+
+    def latest(self, repo_name: str) -> Optional[HistoryEntry]:
+        repository = self.repositories.get(repo_name)
+        return self.read(repository['latest']) if repository else None
+
+    def successful(self, repo_name: str) -> List[HistoryEntry]:
+        """Return the last successful entries of a repository, oldest first."""
+        repository = self.repositories.get(repo_name)
+        return [self.read(offset) for offset in repository['successful']] if repository else []
+
+    def read(self, offset: int) -> HistoryEntry:
+        """Parse the entry starting at `offset` in the history file."""
+        if self._map is None or offset >= len(self._map):
+            self.close()
+            with open(self.history_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._map.find(b'\n', offset)
+        return HistoryEntry.from_dict(json.loads(self._map[offset:end if end != -1 else len(self._map)]))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
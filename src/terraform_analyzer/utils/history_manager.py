@@ -1,53 +1,154 @@
-import json
-import os
-from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from ..models.history import HistoryEntry, RepositoryHistory, VersionChange, ProviderVersionHistory
 from ..models.repository import AnalysisResult
+from .history_backends import HistoryBackend, open_history_backend
+from .history_index import HistoryIndex
+from .history_compaction import compact_entries
 
 class HistoryManager:
-    def __init__(self, history_file: str):
+    """Access to the analysis history.
+
+    When the backend has an index (JSONL history files), the history is not loaded:
+    the latest and last successful entries of a repository are read through the index,
+    and the whole history is only loaded if `history` is accessed.
+    """
+
+    def __init__(self, history_file: str, backend: Optional[HistoryBackend] = None):
         self.history_file = history_file
-        self.history: Dict[str, List[HistoryEntry]] = {}
+        # The storage format follows the file extension: .jsonl is append-only, anything else JSON
+        self.backend = backend or open_history_backend(history_file)
+        self._history: Optional[Dict[str, List[HistoryEntry]]] = None
+        self._index: Optional[HistoryIndex] = None
+        self._added: Dict[str, List[HistoryEntry]] = {}  # Entries added since the index was opened
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._writes: List[Future] = []
         self._load_history()
 
     def _load_history(self):
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r') as f:
-                    data = json.load(f)
-                    for repo_name, entries in data.items():
-                        self.history[repo_name] = [
-                            HistoryEntry.from_dict(entry) for entry in entries
-                        ]
-            except json.JSONDecodeError:
-                self.history = {}
-        else:
-            self.history = {}
-
-    def _save_history(self):
-        with open(self.history_file, 'w') as f:
-            json.dump({
-                repo: [entry.to_dict() for entry in entries]
-                for repo, entries in self.history.items()
-            }, f, indent=2)
+        self._index = self.backend.open_index()
+        if self._index is None:
+            self._history = self.backend.load()
+
+    @property
+    def history(self) -> Dict[str, List[HistoryEntry]]:
+        """The whole history, loaded on first access."""
+        if self._history is None:
+            self.flush()
+            self._history = self.backend.load()
+            self._added = {}
+        return self._history
+
+    def _entries(self) -> Dict[str, List[HistoryEntry]]:
+        """Where entries added to the history are kept in memory."""
+        return self._history if self._history is not None else self._added
 
     def add_entry(self, result: AnalysisResult):
-        entry = HistoryEntry.from_analysis_result(result)
-        if result.repository.name not in self.history:
-            self.history[result.repository.name] = []
-        self.history[result.repository.name].append(entry)
-        self._save_history()
+        self.add_entries([result])
+
+    def add_entries(self, results: Iterable[AnalysisResult], background: bool = False) -> List[HistoryEntry]:
+        """Add the results of a run with a single write.
+
+        The entries share one timestamp. With `background=True` the write runs in a
+        writer thread and this returns as soon as the entries are visible in memory;
+        call `flush()` to wait for it.
+        """
+        timestamp = datetime.now()
+        entries = [HistoryEntry.from_analysis_result(result, timestamp) for result in results]
+        for entry in entries:
+            self._entries().setdefault(entry.repository.name, []).append(entry)
+        self._write(entries, background)
+        return entries
+
+    def _write(self, entries: List[HistoryEntry], background: bool = False):
+        if not entries:
+            return
+        # Only backends rewriting the whole file need the history
+        history = self.history if self.backend.rewrites_on_append else None
+        if not background:
+            self.flush()
+            self.backend.append(entries, history)
+            if self._history is None:
+                # Every entry is written: read them through the index rather than keep them in memory
+                self._index.update()
+                self._added = {}
+            return
+        if self._writer is None:
+            # A single writer keeps the writes in order
+            self._writer = ThreadPoolExecutor(max_workers=1)
+        snapshot = {repo: list(repo_entries) for repo, repo_entries in history.items()} if history else None
+        self._writes.append(self._writer.submit(self.backend.append, entries, snapshot))
+
+    def flush(self):
+        """Wait for the background writes, raising the error of a failed one."""
+        writes, self._writes = self._writes, []
+        for write in writes:
+            write.result()
+
+    def migrate(self, destination: str) -> int:
+        """Copy the whole history to `destination`, in the format of its extension; return the entry count."""
+        open_history_backend(destination).rewrite(self.history)
+        return sum(len(entries) for entries in self.history.values())
+
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        """Stream the stored entries without loading the history (JSONL files are read line by line)."""
+        self.flush()
+        if self._history is not None:
+            for entries in self._history.values():
+                yield from entries
+        else:
+            yield from self.backend.iter_entries()
+
+    def compact(self, now: Optional[datetime] = None, downsample_after: Optional[timedelta] = timedelta(days=90),
+                downsample_interval: timedelta = timedelta(days=7),
+                retention: Optional[timedelta] = None) -> Tuple[int, int]:
+        """Compact the stored history and return the number of entries (before, after).
+
+        Consecutive identical snapshots of a repository are merged into one entry, and
+        old entries are downsampled (see `compact_entries`). The history is rewritten
+        atomically; other processes must not write to it meanwhile.
+        """
+        self.flush()
+        history = self.history
+        before = sum(len(entries) for entries in history.values())
+        for repo_name, entries in history.items():
+            history[repo_name] = compact_entries(entries, now, downsample_after, downsample_interval, retention)
+        self.backend.rewrite(history)
+        if self._index is not None:
+            self._index.close()
+            self._index = self.backend.open_index()
+        return before, sum(len(entries) for entries in history.values())
+
+    def _latest_entry(self, repo_name: str) -> Optional[HistoryEntry]:
+        if self._history is not None:
+            entries = self._history.get(repo_name)
+            return entries[-1] if entries else None
+        if self._added.get(repo_name):
+            return self._added[repo_name][-1]
+        return self._index.latest(repo_name)
+
+    def _successful_entries(self, repo_name: str, count: int) -> List[HistoryEntry]:
+        """Return the last `count` entries of a repository without error, oldest first."""
+        if self._history is not None:
+            entries = self._history.get(repo_name, [])
+        else:
+            entries = self._index.successful(repo_name) + self._added.get(repo_name, [])
+        return [entry for entry in entries if not entry.error][-count:]
 
     def get_repository_names(self) -> List[str]:
-        return list(self.history.keys())
+        if self._history is not None:
+            return list(self._history.keys())
+        return self._index.names() + [name for name in self._added if name not in self._index.repositories]
 
-    def get_repository_history(self, repo_name: str) -> Optional[RepositoryHistory]:
-        if repo_name not in self.history or not self.history[repo_name]:
-            return None
+    def get_latest_successful_entry(self, repo_name: str) -> Optional[HistoryEntry]:
+        """Return the most recent entry of a repository that has no error."""
+        entries = self._successful_entries(repo_name, 1)
+        return entries[0] if entries else None
 
-        latest_entry = self.history[repo_name][-1]
-        if latest_entry.error:
+    def get_repository_history(self, repo_name: str) -> Optional[RepositoryHistory]:
+        latest_entry = self._latest_entry(repo_name)
+        if latest_entry is None or latest_entry.error:
             return None
 
         provider_versions = {}
@@ -66,16 +167,15 @@ class HistoryManager:
         )
 
     def get_version_changes(self, repo_name: str) -> List[VersionChange]:
-        if repo_name not in self.history or len(self.history[repo_name]) < 2:
-            return []
-
-        entries = self.history[repo_name]
         changes = []
 
         # Compare the last two successful entries
-        valid_entries = [e for e in entries if not e.error]
+        valid_entries = self._successful_entries(repo_name, 2)
         if len(valid_entries) < 2:
             return []
+        if valid_entries[-1].run_count > 1:
+            # Compacted entry: the last two runs recorded the same versions
+            return []
 
         old_entry = valid_entries[-2]
         new_entry = valid_entries[-1]
@@ -0,0 +1,100 @@
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from ..analyzers.static_analyzer import LOCK_FILE_NAME, StaticAnalyzer
+from .filesystem import disk_usage
+
+
+class PluginCache:
+    """Provider plugin cache shared by every `terraform init` of the analyzer.
+
+    Terraform does not support concurrent writes to TF_PLUGIN_CACHE_DIR, so inits are
+    serialized with an exclusive lock when they may download providers. Inits whose
+    locked providers are all cached only read from it and run concurrently under a
+    shared lock.
+    """
+
+    def __init__(self, cache_dir: str, mirror_dir: Optional[str] = None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.mirror_dir = os.path.abspath(mirror_dir) if mirror_dir else None
+        self.bytes_downloaded = 0
+        self.bytes_from_cache = 0
+        self._stats_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._cli_config_file = self._write_cli_config() if self.mirror_dir else None
+
+    def _write_cli_config(self) -> str:
+        """Write a CLI configuration installing providers from the filesystem mirror first."""
+        path = os.path.join(self.cache_dir, '.terraformrc')
+        with open(path, 'w') as f:
+            f.write(
+                'provider_installation {\n'
+                '  filesystem_mirror {\n'
+                f'    path = "{self.mirror_dir}"\n'
+                '  }\n'
+                '  direct {}\n'
+                '}\n'
+            )
+        return path
+
+    def environment(self) -> Dict[str, str]:
+        """Return the environment of a terraform command using the cache."""
+        env = dict(os.environ)
+        env['TF_PLUGIN_CACHE_DIR'] = self.cache_dir
+        # Temporary checkouts without a lock file would otherwise bypass the cache
+        env['TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE'] = 'true'
+        if self._cli_config_file:
+            env['TF_CLI_CONFIG_FILE'] = self._cli_config_file
+        return env
+
+    def is_cached(self, terraform_path: str) -> bool:
+        """Check whether every provider of the directory's lock file is already in the cache."""
+        lock_path = os.path.join(terraform_path, LOCK_FILE_NAME)
+        if not os.path.isfile(lock_path):
+            return False
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                locked = StaticAnalyzer.parse_lock_file(f.read())
+        except Exception:
+            return False
+        return bool(locked) and all(
+            info['version'] and os.path.isdir(os.path.join(self.cache_dir, provider, info['version']))
+            for provider, info in locked.items()
+        )
+
+    @contextmanager
+    def locked_init(self, terraform_path: str):
+        """Hold the cache lock around a `terraform init` and account for the bytes it installed."""
+        exclusive = not self.is_cached(terraform_path)
+        with open(os.path.join(self.cache_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                size_before = disk_usage(self.cache_dir) if exclusive else 0
+                yield
+                downloaded = disk_usage(self.cache_dir) - size_before if exclusive else 0
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        installed = self._installed_size(terraform_path)
+        with self._stats_lock:
+            self.bytes_downloaded += max(0, downloaded)
+            self.bytes_from_cache += max(0, installed - downloaded)
+
+    @staticmethod
+    def _installed_size(terraform_path: str) -> int:
+        """Size of the providers installed in the directory, following the links into the cache."""
+        total = 0
+        providers_dir = os.path.join(terraform_path, '.terraform', 'providers')
+        for root, _, files in os.walk(providers_dir, followlinks=True):
+            for name in files:
+                try:
+                    total += os.stat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {'downloaded': self.bytes_downloaded, 'from_cache': self.bytes_from_cache}
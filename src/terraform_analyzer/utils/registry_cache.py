@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote, unquote
+
+
+class RegistryCache:
+    """Persistent cache of registry `versions` responses, one JSON file per provider address."""
+
+    DEFAULT_TTL = 3600  # seconds
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, provider: str) -> str:
+        return os.path.join(self.cache_dir, quote(provider, safe='') + '.json')
+
+    def load(self, provider: str) -> Optional[dict]:
+        """Return the cached record of a provider, or None if missing or unreadable."""
+        try:
+            with open(self._path(provider), 'r') as f:
+                record = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(record, dict) or 'versions' not in record:
+            return None
+        return record
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield every readable cached record, fresh or not, in provider order."""
+        for name in sorted(os.listdir(self.cache_dir)):
+            if not name.endswith('.json'):
+                continue
+            record = self.load(unquote(name[:-len('.json')]))
+            if record is not None:
+                yield record
+
+    def is_fresh(self, record: dict) -> bool:
+        return time.time() - record.get('fetched_at', 0) < self.ttl
+
+    def store(self, provider: str, versions: List[dict], etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> dict:
+        """Atomically write the record of a provider and return it."""
+        record = {
+            'provider': provider,
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'versions': versions
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(provider))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return record
+
+    def conditional_headers(self, record: Optional[dict]) -> Dict[str, str]:
+        """Build the revalidation headers for a stale record."""
+        headers = {}
+        if record:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('last_modified'):
+                headers['If-Modified-Since'] = record['last_modified']
+        return headers
+
+    def count(self, outcome: str):
+        """Count a lookup outcome: 'hit', 'revalidated' or 'miss'."""
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
@@ -0,0 +1,158 @@
+import threading
+import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from requests.adapters import HTTPAdapter
+from .registry_cache import RegistryCache
+from .registry_versions import parse_versions, reduce_versions
+
+
+class RegistryClient:
+    """Terraform Registry client sharing a pooled keep-alive session between lookups.
+
+    With the 'registry' protocol, `base_url` is the providers endpoint of a registry
+    (e.g. "https://registry.terraform.io/v1/providers"). With the 'mirror' protocol, it
+    is the base URL of a provider network mirror, whose `index.json` files list the
+    versions of each provider.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+    DEFAULT_TIMEOUT = 30
+    CHUNK_SIZE = 64 * 1024
+    PROTOCOLS = ('registry', 'mirror')
+
+    def __init__(self, base_url: str, max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, cache: Optional[RegistryCache] = None,
+                 protocol: str = 'registry'):
+        if max_workers < 1:
+            raise ValueError(f"Invalid registry concurrency: {max_workers}")
+        if protocol not in self.PROTOCOLS:
+            raise ValueError(f"Invalid registry protocol: {protocol} (expected one of {', '.join(self.PROTOCOLS)})")
+        self.base_url = base_url.rstrip('/')
+        self.protocol = protocol
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Lazily create the shared session, sized for `max_workers` connections."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _versions_url(self, provider: str) -> Optional[str]:
+        """Build the URL listing the versions of a provider address (e.g. "registry.terraform.io/hashicorp/aws")."""
+        parts = provider.split('/')
+        if len(parts) < 3:
+            return None
+        hostname, namespace, name = parts[-3:]
+        if self.protocol == 'mirror':
+            return f"{self.base_url}/{hostname}/{namespace}/{name}/index.json"
+        return f"{self.base_url}/{namespace}/{name}/versions"
+
+    def get_versions(self, provider: str) -> Optional[List[dict]]:
+        """Return the `versions` list published for a provider, or None if unavailable.
+
+        Each version only keeps its `version` and `protocols` fields.
+
+        Concurrent lookups of the same provider share a single in-flight fetch.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(provider)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[provider] = future
+
+        if not owner:
+            if self.cache is not None:
+                self.cache.count('hit')
+            return future.result()
+
+        try:
+            versions = self._fetch_versions(provider)
+            future.set_result(versions)
+            return versions
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[provider]
+
+    def _fetch_versions(self, provider: str) -> Optional[List[dict]]:
+        url = self._versions_url(provider)
+        if url is None:
+            return None
+
+        record = self.cache.load(provider) if self.cache is not None else None
+        if record is not None and self.cache.is_fresh(record):
+            self.cache.count('hit')
+            return record['versions']
+
+        headers = self.cache.conditional_headers(record) if self.cache is not None else {}
+        # Streamed: large providers publish a `platforms` list for each of their releases
+        response = self.session.get(
+            url,
+            headers=headers,
+            timeout=self.timeout,
+            stream=True
+        )
+
+        try:
+            if response.status_code == 304 and record is not None:
+                self.cache.count('revalidated')
+                # Records written before versions were reduced shrink on revalidation
+                versions = reduce_versions(record['versions'])
+                self.cache.store(provider, versions,
+                                 etag=response.headers.get('ETag', record.get('etag')),
+                                 last_modified=response.headers.get('Last-Modified', record.get('last_modified')))
+                return versions
+            if response.status_code != 200:
+                return None
+
+            versions = parse_versions(response.iter_content(chunk_size=self.CHUNK_SIZE))
+        finally:
+            response.close()
+
+        if self.cache is not None:
+            self.cache.count('miss')
+            self.cache.store(provider, versions,
+                             etag=response.headers.get('ETag'),
+                             last_modified=response.headers.get('Last-Modified'))
+        return versions
+
+    def get_versions_many(self, providers: Iterable[str]) -> Dict[str, List[dict]]:
+        """Fetch the versions of several providers concurrently, at most `max_workers` at a time."""
+        providers = list(dict.fromkeys(providers))
+        if not providers:
+            return {}
+
+        def fetch(provider):
+            try:
+                return self.get_versions(provider)
+            except Exception as e:
+                # Log error but continue with other providers
+                print(f"Failed to get latest version for provider {provider}: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(providers))) as executor:
+            fetched = dict(zip(providers, executor.map(fetch, providers)))
+
+        return {provider: versions for provider, versions in fetched.items() if versions}
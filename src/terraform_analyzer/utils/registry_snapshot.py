@@ -0,0 +1,81 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+from ..models.exceptions import RegistryError
+from .filesystem import atomic_write
+from .registry_cache import RegistryCache
+from .registry_versions import parse_versions, reduce_versions
+
+SNAPSHOT_FORMAT_VERSION = 1
+MIRROR_INDEX = 'index.json'
+_READ_SIZE = 64 * 1024
+
+
+class RegistrySnapshot:
+    """Provider versions loaded from local files, standing in for the registry client without network calls.
+
+    A snapshot is either a JSON file written by `export_snapshot`, or a provider mirror
+    directory (as created by `terraform providers mirror`) whose `HOST/NAMESPACE/TYPE/index.json`
+    files list the versions of each provider. Providers missing from the snapshot are
+    unavailable, like providers unknown to the registry.
+    """
+
+    cache = None  # Snapshots are never cached
+
+    def __init__(self, versions: Dict[str, List[dict]]):
+        self.versions = versions
+
+    @classmethod
+    def load(cls, path: str) -> 'RegistrySnapshot':
+        if os.path.isdir(path):
+            return cls(cls._read_mirror(path))
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise RegistryError(f"Cannot read registry snapshot {path}: {str(e)}")
+        if not isinstance(data, dict) or data.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise RegistryError(f"Unsupported registry snapshot {path} (expected format_version {SNAPSHOT_FORMAT_VERSION})")
+        return cls(data.get('providers', {}))
+
+    @staticmethod
+    def _read_mirror(directory: str) -> Dict[str, List[dict]]:
+        versions = {}
+        for root, _, files in os.walk(directory):
+            if MIRROR_INDEX not in files:
+                continue
+            parts = os.path.relpath(root, directory).split(os.sep)
+            if len(parts) != 3:
+                continue
+            path = os.path.join(root, MIRROR_INDEX)
+            try:
+                with open(path, 'rb') as f:
+                    versions['/'.join(parts)] = parse_versions(iter(lambda: f.read(_READ_SIZE), b''))
+            except ValueError as e:
+                raise RegistryError(f"Invalid provider mirror index {path}: {str(e)}")
+        return versions
+
+    def get_versions(self, provider: str) -> Optional[List[dict]]:
+        """Return the versions of a provider, or None if the snapshot does not have it."""
+        return self.versions.get(provider)
+
+    def get_versions_many(self, providers: Iterable[str]) -> Dict[str, List[dict]]:
+        return {
+            provider: self.versions[provider]
+            for provider in dict.fromkeys(providers)
+            if provider in self.versions
+        }
+
+    def close(self):
+        pass
+
+
+def export_snapshot(cache: RegistryCache, path: str) -> int:
+    """Write the versions of every provider in the registry cache to a snapshot file; return the provider count."""
+    providers = {
+        record['provider']: reduce_versions(record['versions'])
+        for record in cache.iter_records()
+        if record.get('provider')
+    }
+    atomic_write(path, json.dumps({'format_version': SNAPSHOT_FORMAT_VERSION, 'providers': providers}))
+    return len(providers)
@@ -0,0 +1,204 @@
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, List, Optional, Union
+
+# The fields of a registry version kept by the analyzer; `platforms` is skipped
+VERSION_FIELDS = ('version', 'protocols')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_KEY = re.compile(r'[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_DECODER = json.JSONDecoder()
+
+
+class _Scanner:
+    """Incremental reader of a JSON document arriving in chunks.
+
+    Consumed text is dropped as the scan moves on, so only the unread part of the
+    document, about one chunk, is held in memory.
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at the end of the document."""
+        while not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                text = self._decoder.decode(b'', final=True)
+            else:
+                text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        return False
+
+    def _complete(self, end: int) -> bool:
+        # A token ending with the buffer may continue in the next chunk
+        return end < len(self._buffer) or self._eof
+
+    def _complete_value(self, end: int) -> bool:
+        # A number cut by the end of the chunk ("2." | "5") decodes as its integer part:
+        # it is complete only once something other than number characters follows it
+        if self._eof:
+            return True
+        return _NUMBER_TAIL.fullmatch(self._buffer, end) is None
+
+    def _skip_whitespace(self):
+        if self._pos < len(self._buffer) and self._buffer[self._pos] not in ' \t\n\r':
+            return
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def peek(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of registry response")
+        return self._buffer[self._pos]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expecting '{char}' at offset {self._pos} of registry response chunk")
+        self._pos += 1
+
+    def next_item(self, closing: str) -> bool:
+        """Move past a separator; return False (and move past `closing`) at the end of a container."""
+        char = self.peek()
+        if char == ',':
+            self._pos += 1
+            return True
+        if char == closing:
+            self._pos += 1
+            return False
+        raise ValueError(f"Expecting ',' or '{closing}' at offset {self._pos} of registry response chunk")
+
+    def key(self) -> str:
+        while True:
+            match = _KEY.match(self._buffer, self._pos)
+            if match and self._complete(match.end()):
+                self._pos = match.end()
+                name = match.group(1)
+                return json.loads(f'"{name}"') if '\\' in name else name
+            if not self._fill():
+                raise ValueError(f"Expecting an object key at offset {self._pos} of registry response chunk")
+
+    def value(self):
+        """Decode the next value."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if self._complete_value(end) or not self._fill():
+                self._pos = end
+                return value
+
+    def skip(self):
+        """Move past the next value, without building it when it is a container of scalars or flat containers."""
+        self._skip_whitespace()
+        while True:
+            start = self._pos
+            opening = self._buffer[start]
+            if opening not in '[{':
+                break
+            end = self._buffer.find(']' if opening == '[' else '}', start + 1)
+            if end < 0:
+                if self._fill():
+                    continue
+                raise ValueError("Unexpected end of registry response")
+            # The first closing bracket ends the container unless it is nested or in a string
+            if (self._buffer.find(opening, start + 1, end) < 0 and self._buffer.find('\\', start, end) < 0
+                    and self._buffer.count('"', start, end) % 2 == 0):
+                self._pos = end + 1
+                return
+            break
+        self.value()
+
+
+def _read_version(scanner: _Scanner) -> dict:
+    fields = {}
+    scanner.expect('{')
+    if scanner.peek() == '}':
+        scanner.expect('}')
+        return fields
+    while True:
+        name = scanner.key()
+        if name in VERSION_FIELDS:
+            fields[name] = scanner.value()
+        else:
+            scanner.skip()
+        if not scanner.next_item('}'):
+            return fields
+
+
+def _iter_versions(scanner: _Scanner) -> Iterator[dict]:
+    scanner.expect('[')
+    if scanner.peek() == ']':
+        scanner.expect(']')
+        return
+    while True:
+        if scanner.peek() == '{':
+            yield _read_version(scanner)
+        else:
+            scanner.skip()
+        if not scanner.next_item(']'):
+            return
+
+
+def _iter_version_keys(scanner: _Scanner) -> Iterator[dict]:
+    # Network mirrors map each version to an (empty) object
+    scanner.expect('{')
+    if scanner.peek() == '}':
+        scanner.expect('}')
+        return
+    while True:
+        yield {'version': scanner.key()}
+        scanner.skip()
+        if not scanner.next_item('}'):
+            return
+
+
+def parse_versions(chunks: Iterable[Union[bytes, str]]) -> List[dict]:
+    """Extract the `versions` of a registry response streamed in chunks.
+
+    Only the fields in VERSION_FIELDS are kept: the `platforms` list published for
+    every version is scanned over without being built. The `versions` object of a
+    provider network mirror `index.json` is read as a list of versions too. Raise
+    ValueError if the response is not a JSON object.
+    """
+    scanner = _Scanner(chunks)
+    versions: List[dict] = []
+    scanner.expect('{')
+    if scanner.peek() == '}':
+        return versions
+    while True:
+        if scanner.key() != 'versions':
+            scanner.skip()
+        elif scanner.peek() == '[':
+            versions.extend(_iter_versions(scanner))
+        elif scanner.peek() == '{':
+            versions.extend(_iter_version_keys(scanner))
+        else:
+            scanner.skip()
+        if not scanner.next_item('}'):
+            return versions
+
+
+def reduce_versions(versions: Optional[List[dict]]) -> Optional[List[dict]]:
+    """Drop the fields of registry versions that are not in VERSION_FIELDS."""
+    if versions is None:
+        return None
+    return [{name: ver[name] for name in VERSION_FIELDS if name in ver} for ver in versions]
@@ -0,0 +1,308 @@
+"""End-to-end scale benchmark of the analyzer on a synthetic fleet.
+
+For each fleet size, N bare git repositories holding a Terraform root module with a
+lock file are generated locally, a local HTTP stand-in of the Terraform Registry
+answers version lookups after a configurable latency, and a stub `terraform` is put
+first on PATH. `main.main` then analyzes the fleet in a fresh process, and the run
+is reported as throughput, per-stage latency percentiles and peak RSS. Nothing is
+downloaded: the numbers only depend on the analyzer and the local machine.
+
+    PYTHONPATH=src python tests/benchmarks/fleet_benchmark.py [--sizes 10,100,1000] [--jobs 8]
+
+Stages are the ones timed by the analyzer for each repository (clone, terraform init,
+terraform version) plus `resolve`, the registry resolution of a batch of results.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+DEFAULT_SIZES = (10, 100, 1000)
+PROVIDER_POOL = 40  # Distinct providers across the fleet
+PROVIDERS_PER_REPOSITORY = 6
+RELEASES_PER_PROVIDER = 300
+PLATFORMS = [{"os": os_name, "arch": arch}
+             for os_name in ("linux", "darwin", "windows", "freebsd") for arch in ("amd64", "arm64", "386")]
+PERCENTILES = (50, 90, 99)
+
+STUB_TERRAFORM = '''#!{python}
+"""Stub terraform: `init` sleeps, `version -json` reports the selections of the lock file."""
+import json, os, re, sys, time
+time.sleep(float(os.environ.get('STUB_TERRAFORM_DELAY', '0')))
+if sys.argv[1:2] == ['version']:
+    with open('.terraform.lock.hcl') as f:
+        lock = f.read()
+    selections = dict(re.findall(r'provider "([^"]+)" {{\\s*version\\s*=\\s*"([^"]+)"', lock))
+    print(json.dumps({{"terraform_version": "1.9.0", "provider_selections": selections}}))
+'''
+
+
+def provider_address(index: int) -> str:
+    return f"registry.terraform.io/bench/p{index:03d}"
+
+
+def release(index: int) -> str:
+    return f"{index // 100 + 1}.{index % 100 // 10}.{index % 10}"
+
+
+# Fleet -----------------------------------------------------------------------
+
+def _module_files(rng: random.Random) -> Dict[str, str]:
+    """The Terraform root module of a repository: a few providers of the pool, each locked at some release."""
+    providers = sorted(rng.sample(range(PROVIDER_POOL), PROVIDERS_PER_REPOSITORY))
+    required = []
+    locked = []
+    for provider in providers:
+        address = provider_address(provider)
+        version = release(rng.randrange(RELEASES_PER_PROVIDER))
+        major = version.split('.')[0]
+        required.append(f'    p{provider:03d} = {{\n      source  = "bench/p{provider:03d}"\n'
+                        f'      version = "~> {major}.0"\n    }}\n')
+        locked.append(f'provider "{address}" {{\n  version     = "{version}"\n'
+                      f'  constraints = "~> {major}.0"\n  hashes = [\n    "h1:{"0" * 43}=",\n  ]\n}}\n')
+    return {
+        'terraform/versions.tf': ('terraform {\n  required_version = ">= 1.5"\n  required_providers {\n'
+                                  + ''.join(required) + '  }\n}\n'),
+        'terraform/.terraform.lock.hcl': '# This file is maintained automatically by "terraform init".\n\n'
+                                         + '\n'.join(locked)
+    }
+
+
+def _create_bare_repository(path: str, files: Dict[str, str]):
+    """Create a bare repository whose `main` branch has a single commit, with one git process."""
+    stream = [b'commit refs/heads/main\n', b'committer Bench <bench@example.com> 1700000000 +0000\n',
+              b'data 5\nbench\n']
+    for name, content in files.items():
+        data = content.encode()
+        stream.append(f'M 100644 inline {name}\ndata {len(data)}\n'.encode() + data + b'\n')
+    subprocess.run(['git', 'init', '--bare', '-q', path], check=True)
+    with open(os.path.join(path, 'HEAD'), 'w') as f:
+        f.write('ref: refs/heads/main\n')
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=path, input=b''.join(stream), check=True)
+
+
+def build_fleet(directory: str, count: int, seed: int = 0) -> str:
+    """Generate `count` bare repositories under `directory` and return the analyzer config listing them."""
+    rng = random.Random(seed)
+    repos_dir = os.path.join(directory, 'repos')
+    os.makedirs(repos_dir)
+    lines = ['repos:']
+    for index in range(count):
+        path = os.path.join(repos_dir, f'repo-{index:04d}.git')
+        _create_bare_repository(path, _module_files(rng))
+        lines += [f'- name: repo-{index:04d}', f'  repository: {path}', '  terraform-path: terraform']
+    config = os.path.join(directory, 'config.yaml')
+    with open(config, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return config
+
+
+def install_stub_terraform(directory: str) -> str:
+    """Write the stub terraform into `directory` and return that directory, to put on PATH."""
+    bin_dir = os.path.join(directory, 'bin')
+    os.makedirs(bin_dir)
+    path = os.path.join(bin_dir, 'terraform')
+    with open(path, 'w') as f:
+        f.write(STUB_TERRAFORM.format(python=sys.executable))
+    os.chmod(path, 0o755)
+    return bin_dir
+
+
+# Registry stand-in -----------------------------------------------------------
+
+class FakeRegistry:
+    """Local HTTP server answering `/v1/providers/NAMESPACE/NAME/versions` after `latency` seconds."""
+
+    def __init__(self, latency: float = 0.0, releases: int = RELEASES_PER_PROVIDER):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        payload = json.dumps({
+            "versions": [{"version": release(index), "protocols": ["5.0"], "platforms": PLATFORMS}
+                         for index in range(releases)]
+        }).encode()
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with registry._lock:
+                    registry.requests += 1
+                time.sleep(registry.latency)
+                if not (self.path.startswith('/v1/providers/bench/') and self.path.endswith('/versions')):
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('ETag', '"bench"')
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1/providers"
+
+    def __enter__(self) -> 'FakeRegistry':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# Measurement -----------------------------------------------------------------
+
+def percentile(values: List[float], rank: int) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, -(-rank * len(ordered) // 100) - 1)]
+
+
+def _run_analyzer(argv: List[str]) -> dict:
+    """Run main.main in this process and measure it (runs in the child process)."""
+    sys.path.insert(0, SRC_DIR)
+    from terraform_analyzer import main
+    from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+
+    stages: Dict[str, List[float]] = {}
+
+    class MeasuredSummary(main.RunSummary):
+        def add(self, result):
+            super().add(result)
+            for stage, duration in (result.timings or {}).items():
+                stages.setdefault(stage, []).append(duration)
+
+    resolve_version_indexes = TerraformAnalyzer.resolve_version_indexes
+
+    def measured_resolve(providers):
+        start = time.perf_counter()
+        try:
+            return resolve_version_indexes(providers)
+        finally:
+            stages.setdefault('resolve', []).append(time.perf_counter() - start)
+
+    main.RunSummary = MeasuredSummary
+    TerraformAnalyzer.resolve_version_indexes = staticmethod(measured_resolve)
+    sys.argv = ['terraform-analyzer'] + argv
+    start = time.perf_counter()
+    status = main.main()
+    wall = time.perf_counter() - start
+    return {
+        'status': status,
+        'wall': wall,
+        'stages': stages,
+        # Kilobytes on Linux, bytes on macOS
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    }
+
+
+def run_fleet(count: int, jobs: int = 8, latency: float = 0.02, terraform_delay: float = 0.0,
+              runs: int = 1, extra_args: Optional[List[str]] = None, work_dir: Optional[str] = None) -> List[dict]:
+    """Benchmark the analysis of a synthetic fleet of `count` repositories; return one report per run.
+
+    Runs share the work directory: the first one starts with cold caches and an empty
+    history, the next ones reuse what the previous runs left.
+    """
+    directory = tempfile.mkdtemp(prefix=f'fleet-{count}-', dir=work_dir)
+    try:
+        config = build_fleet(directory, count)
+        env = dict(os.environ)
+        env['PATH'] = install_stub_terraform(directory) + os.pathsep + env.get('PATH', '')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+        env['STUB_TERRAFORM_DELAY'] = str(terraform_delay)
+
+        reports = []
+        with FakeRegistry(latency) as registry:
+            argv = ['--config', config, '--history-file', os.path.join(directory, 'history.jsonl'),
+                    '--cache-dir', os.path.join(directory, 'cache'), '--registry-url', registry.url,
+                    '--jobs', str(jobs), '--ndjson-output', os.path.join(directory, 'report.ndjson')]
+            argv += extra_args or []
+            for run in range(1, runs + 1):
+                requests_before = registry.requests
+                output = os.path.join(directory, f'run-{run}.json')
+                process = subprocess.run([sys.executable, __file__, '--child', output, '--'] + argv,
+                                         env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                if process.returncode != 0 or not os.path.exists(output):
+                    raise RuntimeError(f"Benchmark run failed: {process.stderr.strip()}")
+                with open(output) as f:
+                    report = json.load(f)
+                with open(os.path.join(directory, 'report.ndjson')) as f:
+                    results = [json.loads(line) for line in f]
+                report.update({
+                    'repositories': count,
+                    'run': run,
+                    'failed': sum(1 for result in results if result['error']),
+                    'registry_requests': registry.requests - requests_before,
+                    'throughput': count / report['wall'] if report['wall'] else 0.0
+                })
+                reports.append(report)
+        return reports
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"N={report['repositories']} run {report['run']}: {report['wall']:.2f}s, "
+        f"{report['throughput']:.1f} repos/s, peak RSS {report['peak_rss'] / 1024 ** 2:.0f} MB, "
+        f"{report['registry_requests']} registry requests, {report['failed']} failed"
+    ]
+    for stage, durations in sorted(report['stages'].items()):
+        quantiles = ', '.join(f"p{rank} {percentile(durations, rank) * 1000:.1f}ms" for rank in PERCENTILES)
+        lines.append(f"  {stage:<8} {quantiles} ({len(durations)} samples)")
+    return '\n'.join(lines)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        # The analyzer runs in its own process, so that its peak RSS and class state are its own
+        output = sys.argv[2]
+        report = _run_analyzer(sys.argv[sys.argv.index('--') + 1:])
+        with open(output, 'w') as f:
+            json.dump(report, f)
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated fleet sizes (default: 10,100,1000)')
+    parser.add_argument('--jobs', type=int, default=8, help='Analyzer --jobs (default: 8)')
+    parser.add_argument('--latency-ms', type=float, default=20, help='Registry latency per request (default: 20)')
+    parser.add_argument('--terraform-delay-ms', type=float, default=0, help='Duration of each stub terraform command')
+    parser.add_argument('--runs', type=int, default=1, help='Runs per fleet, the next ones with warm caches')
+    parser.add_argument('--json', metavar='FILE', help='Also write the reports to FILE, to compare revisions')
+    parser.add_argument('analyzer_args', nargs='*', help='Extra analyzer arguments, after -- (e.g. -- --static)')
+    args = parser.parse_args()
+
+    reports = []
+    for count in (int(size) for size in args.sizes.split(',')):
+        for report in run_fleet(count, jobs=args.jobs, latency=args.latency_ms / 1000,
+                                terraform_delay=args.terraform_delay_ms / 1000, runs=args.runs,
+                                extra_args=args.analyzer_args):
+            print(format_report(report), flush=True)
+            reports.append(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Microbenchmark of the registry `versions` payload parse.
+
+Compares a full `json.loads` of the response (what `response.json()` does) with the
+streaming `parse_versions`, on a synthetic payload shaped like the one of a large
+provider. Run with:
+
+    PYTHONPATH=src python tests/benchmarks/registry_versions.py [--versions N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from terraform_analyzer.utils.registry_versions import parse_versions
+
+CHUNK_SIZE = 64 * 1024
+PLATFORMS = [{"os": os_name, "arch": arch}
+             for os_name in ("linux", "darwin", "windows", "freebsd", "openbsd", "solaris")
+             for arch in ("amd64", "arm64", "386", "arm")]
+
+
+def make_payload(count: int) -> bytes:
+    versions = [{"version": f"{index // 100}.{index % 100}.0", "protocols": ["5.0"], "platforms": PLATFORMS}
+                for index in range(count)]
+    return json.dumps({"id": "hashicorp/aws", "versions": versions, "warnings": None}).encode()
+
+
+def chunks(payload: bytes):
+    for start in range(0, len(payload), CHUNK_SIZE):
+        yield payload[start:start + CHUNK_SIZE]
+
+
+def full_parse(payload: bytes):
+    # Like response.json(): the whole body is joined, then parsed
+    return json.loads(b''.join(chunks(payload)))['versions']
+
+
+def streaming_parse(payload: bytes):
+    return parse_versions(chunks(payload))
+
+
+def measure(parse, payload: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(payload)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--versions', type=int, default=1500, help='Releases in the payload (default: 1500)')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per parser (default: 10)')
+    args = parser.parse_args()
+
+    payload = make_payload(args.versions)
+    print(f"Payload: {args.versions} versions, {len(payload) / 1024:.0f} KiB")
+    for name, parse in (('json.loads', full_parse), ('parse_versions', streaming_parse)):
+        seconds, peak = measure(parse, payload, args.repeat)
+        print(f"{name:>15}: {seconds * 1000:8.2f} ms  peak {peak / 1024:8.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
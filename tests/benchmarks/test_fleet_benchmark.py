@@ -0,0 +1,21 @@
+import pytest
+from fleet_benchmark import format_report, percentile, run_fleet
+
+
+def test_percentile():
+    assert percentile([0.3, 0.1, 0.2], 50) == 0.2
+    assert percentile([float(value) for value in range(1, 101)], 99) == 99.0
+
+
+@pytest.mark.parametrize("extra_args", [[], ["--static"]])
+def test_fleet_smoke(tmp_path, extra_args):
+    """A tiny fleet is analyzed end to end, the second run answered by the warm registry cache."""
+    first, second = run_fleet(3, jobs=2, latency=0.0, runs=2, extra_args=extra_args, work_dir=str(tmp_path))
+
+    assert first["status"] == 0 and first["failed"] == 0
+    assert first["registry_requests"] > 0 and second["registry_requests"] == 0
+    assert len(first["stages"]["clone"]) == 3
+    assert ("init" in first["stages"]) == (not extra_args)
+    assert first["stages"]["resolve"]
+    assert first["peak_rss"] > 0 and first["throughput"] > 0
+    assert "N=3 run 1" in format_report(first)
@@ -1,10 +1,15 @@
 import os
 import yaml
+import git
 import pytest
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 from terraform_analyzer.models.repository import RepositoryInfo
 from terraform_analyzer.models.exceptions import RepositoryAnalysisError
+from terraform_analyzer.models.history import HistoryEntry
 from terraform_analyzer.analyzers.repository_analyzer import RepositoryAnalyzer
+from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+from terraform_analyzer.analyzers.version_index import ProviderVersionIndex
 
 @pytest.fixture
 def repo_info(test_config):
@@ -166,4 +171,259 @@ def test_repository_analyzer_with_config(config_repo_info):
                     config_repo_info.repository,
                     analyzer.repo_path,
                     branch=config_repo_info.branch
-                )
\ No newline at end of file
+                )
+
+def test_repository_analyzer_analyze_without_resolution(repo_info):
+    """Test l'extraction seule des versions, sans interroger le registre."""
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo'), \
+             patch('terraform_analyzer.analyzers.repository_analyzer.TerraformAnalyzer') as mock_terraform, \
+             patch('os.path.exists', return_value=True):
+            mock_terraform.extract_directory.return_value = ("1.0.0", {"aws": "3.0.0"})
+
+            result = analyzer.analyze(resolve_latest=False)
+
+            mock_terraform.analyze_directory.assert_not_called()
+            assert result.error is None
+            assert result.provider_versions["aws"].current_version == "3.0.0"
+            assert result.provider_versions["aws"].latest_version is None
+
+@pytest.mark.parametrize("strategy,options", [
+    ("shallow", {"depth": 1}),
+    ("blobless", {"filter": "blob:none"}),
+])
+@patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo')
+def test_repository_analyzer_clone_strategies(mock_git_repo, repo_info, strategy, options):
+    """Test les options de clonage de chaque stratégie."""
+    repo_info.clone_strategy = strategy
+
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        analyzer._clone_repository()
+
+        mock_git_repo.clone_from.assert_called_once_with(
+            repo_info.repository,
+            analyzer.repo_path,
+            branch=repo_info.branch,
+            **options
+        )
+        assert analyzer.clone_stats.strategy == strategy
+
+@patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo')
+def test_repository_analyzer_sparse_clone(mock_git_repo, repo_info):
+    """Test le clonage partiel limité au chemin Terraform."""
+    repo_info.clone_strategy = "sparse"
+    mock_repo = MagicMock()
+    mock_git_repo.clone_from.return_value = mock_repo
+
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        analyzer._clone_repository()
+
+        mock_git_repo.clone_from.assert_called_once_with(
+            repo_info.repository,
+            analyzer.repo_path,
+            branch=repo_info.branch,
+            depth=1,
+            filter='blob:none',
+            no_checkout=True
+        )
+        mock_repo.git.sparse_checkout.assert_called_once_with('set', repo_info.terraform_path.strip('/'))
+        mock_repo.git.checkout.assert_called_once_with()
+
+def test_repository_analyzer_sparse_clone_local(tmp_path, repo_info):
+    """Test qu'un clone partiel réel ne récupère que le chemin Terraform."""
+    source = git.Repo.init(tmp_path / "source")
+    (tmp_path / "source" / "infra").mkdir()
+    (tmp_path / "source" / "infra" / "main.tf").write_text("terraform {}\n")
+    (tmp_path / "source" / "app").mkdir()
+    (tmp_path / "source" / "app" / "big.bin").write_bytes(b"0" * 4096)
+    source.index.add(["infra/main.tf", "app/big.bin"])
+    source.index.commit("init", author=git.Actor("test", "test@example.com"),
+                        committer=git.Actor("test", "test@example.com"))
+
+    repo_info.repository = (tmp_path / "source").as_uri()
+    repo_info.terraform_path = "infra"
+    repo_info.branch = None
+    repo_info.clone_strategy = "sparse"
+
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        analyzer._clone_repository()
+
+        assert os.path.exists(os.path.join(analyzer.repo_path, "infra", "main.tf"))
+        assert not os.path.exists(os.path.join(analyzer.repo_path, "app"))
+        assert analyzer.clone_stats.size > 0
+
+def test_repository_analyzer_unknown_clone_strategy(repo_info):
+    """Test le rejet d'une stratégie de clonage inconnue."""
+    repo_info.clone_strategy = "magic"
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with pytest.raises(RepositoryAnalysisError):
+            analyzer._clone_repository()
+
+def test_repository_analyzer_checkout_from_mirror(repo_info):
+    """Test l'utilisation du miroir local à la place d'un clone temporaire."""
+    repo_info.clone_strategy = "sparse"
+    mirror_cache = MagicMock()
+    mirror_cache.update.return_value = ("/cache/mirror.git", "abc123")
+
+    with RepositoryAnalyzer(repo_info, mirror_cache=mirror_cache) as analyzer:
+        with patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo') as mock_git_repo:
+            analyzer._clone_repository()
+
+            mock_git_repo.clone_from.assert_not_called()
+            mirror_cache.update.assert_called_once_with(repo_info.repository, repo_info.branch, shallow=True)
+            mirror_cache.export.assert_called_once_with(
+                "/cache/mirror.git", "abc123", analyzer.repo_path, [repo_info.terraform_path.strip('/')]
+            )
+            assert analyzer.clone_stats.strategy == "mirror:sparse"
+
+@pytest.fixture
+def previous_entry(repo_info):
+    """Dernière analyse réussie du dépôt, telle que stockée dans l'historique."""
+    return HistoryEntry(
+        timestamp=datetime(2024, 1, 1),
+        repository=repo_info,
+        terraform_version="1.0.0",
+        provider_versions={"aws": {"current_version": "3.0.0", "latest_version": "4.0.0"}},
+        error=None,
+        commit_sha="abc123",
+        fingerprint="terraform:lock:deadbeef"
+    )
+
+def test_repository_analyzer_skips_unchanged_commit(repo_info, previous_entry):
+    """Test qu'un dépôt dont le commit distant n'a pas changé n'est pas cloné."""
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with patch('terraform_analyzer.analyzers.repository_analyzer.git') as mock_git, \
+             patch('terraform_analyzer.analyzers.repository_analyzer.TerraformAnalyzer') as mock_terraform:
+            ref = f"refs/heads/{repo_info.branch}"
+            mock_git.cmd.Git.return_value.ls_remote.return_value = f"abc123\t{ref}"
+            mock_terraform.static_analysis = False
+            mock_terraform.resolve_version_indexes.return_value = {"aws": ProviderVersionIndex.from_registry(
+                [{"version": v} for v in ("3.0.0", "3.2.0", "4.0.0", "5.0.0")]
+            )}
+            mock_terraform.describe_version.side_effect = TerraformAnalyzer.describe_version
+
+            result = analyzer.analyze(previous=previous_entry)
+
+            mock_git.Repo.clone_from.assert_not_called()
+            mock_git.cmd.Git.return_value.ls_remote.assert_called_once_with(repo_info.repository, ref)
+            assert result.unchanged
+            assert result.commit_sha == "abc123"
+            assert result.provider_versions["aws"].current_version == "3.0.0"
+            assert result.provider_versions["aws"].latest_version == "5.0.0"
+            assert result.provider_versions["aws"].latest_in_major == "3.2.0"
+            assert result.provider_versions["aws"].releases_behind == 3
+
+def test_repository_analyzer_skips_unchanged_fingerprint(repo_info, previous_entry, tmp_path):
+    """Test qu'un nouveau commit sans changement du fichier de verrouillage ne relance pas terraform."""
+    terraform_dir = tmp_path / "checkout" / repo_info.terraform_path
+    terraform_dir.mkdir(parents=True)
+    (terraform_dir / ".terraform.lock.hcl").write_text('provider "registry.terraform.io/hashicorp/aws" {}\n')
+    previous_entry.fingerprint = RepositoryAnalyzer._fingerprint(str(terraform_dir))
+
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with patch.object(RepositoryAnalyzer, '_remote_commit', return_value="def456"), \
+             patch.object(RepositoryAnalyzer, '_clone_repository'), \
+             patch('terraform_analyzer.analyzers.repository_analyzer.TerraformAnalyzer') as mock_terraform:
+            mock_terraform.static_analysis = False
+            analyzer.repo_path = str(tmp_path / "checkout")
+
+            result = analyzer.analyze(resolve_latest=False, previous=previous_entry)
+
+            mock_terraform.extract_directory.assert_not_called()
+            assert result.unchanged
+            assert result.provider_versions["aws"].latest_version is None
+
+def test_fingerprint_covers_required_version(tmp_path):
+    """Test qu'un changement de required_version invalide l'empreinte malgré le fichier de verrouillage."""
+    (tmp_path / ".terraform.lock.hcl").write_text('provider "registry.terraform.io/hashicorp/aws" {}\n')
+    (tmp_path / "versions.tf").write_text('terraform {\n  required_version = ">= 1.0"\n}\n')
+    before = RepositoryAnalyzer._fingerprint(str(tmp_path))
+
+    (tmp_path / "versions.tf").write_text('terraform {\n  required_version = ">= 1.5"\n}\n')
+
+    assert RepositoryAnalyzer._fingerprint(str(tmp_path)) != before
+
+def test_repository_analyzer_reanalyzes_after_mode_change(repo_info, previous_entry):
+    """Test qu'une entrée produite par l'analyse terraform n'est pas réutilisée en mode statique."""
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with patch.object(RepositoryAnalyzer, '_remote_commit', return_value="abc123") as mock_remote, \
+             patch.object(TerraformAnalyzer, 'static_analysis', True), \
+             patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo') as mock_git_repo:
+            mock_git_repo.clone_from.side_effect = Exception("Clone failed")
+            result = analyzer.analyze(previous=previous_entry)
+
+            mock_remote.assert_not_called()
+            assert not result.unchanged
+
+def test_repository_analyzer_ignores_previous_entry_of_other_path(repo_info, previous_entry):
+    """Test qu'une entrée d'historique d'une autre configuration n'est pas réutilisée."""
+    previous_entry.repository = RepositoryInfo(
+        name=repo_info.name,
+        repository=repo_info.repository,
+        terraform_path="other/path",
+        branch=repo_info.branch
+    )
+    with RepositoryAnalyzer(repo_info) as analyzer:
+        with patch.object(RepositoryAnalyzer, '_remote_commit') as mock_remote, \
+             patch('terraform_analyzer.analyzers.repository_analyzer.git.Repo') as mock_git_repo:
+            mock_git_repo.clone_from.side_effect = Exception("Clone failed")
+            analyzer.analyze(previous=previous_entry)
+
+            mock_remote.assert_not_called()
+
+@pytest.fixture
+def monorepo(tmp_path):
+    """Dépôt local contenant plusieurs modules racines et un module enfant."""
+    source_path = tmp_path / "monorepo"
+    source = git.Repo.init(source_path)
+    lock = 'provider "registry.terraform.io/hashicorp/aws" {\n  version = "5.0.0"\n}\n'
+    files = {
+        "envs/prod/main.tf": 'terraform {}\nmodule "net" {\n  source = "../../modules/net"\n}\n',
+        "envs/prod/.terraform.lock.hcl": lock,
+        "envs/dev/main.tf": 'terraform {}\n',
+        "envs/dev/.terraform.lock.hcl": lock,
+        "modules/net/main.tf": 'terraform {\n  required_version = ">= 1.0"\n}\n',
+        "README.md": "monorepo\n",
+    }
+    for path, content in files.items():
+        (source_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (source_path / path).write_text(content)
+    source.index.add(list(files))
+    source.index.commit("init", author=git.Actor("test", "test@example.com"),
+                        committer=git.Actor("test", "test@example.com"))
+    return source_path.as_uri()
+
+def test_repository_analyzer_analyze_many_clones_once(monorepo):
+    """Test que plusieurs chemins d'un même dépôt sont analysés depuis un seul clone."""
+    entries = [
+        RepositoryInfo(name="prod", repository=monorepo, terraform_path="envs/prod"),
+        RepositoryInfo(name="dev", repository=monorepo, terraform_path="envs/dev"),
+        RepositoryInfo(name="missing", repository=monorepo, terraform_path="envs/missing"),
+    ]
+    with RepositoryAnalyzer(entries[0]) as analyzer:
+        with patch.object(RepositoryAnalyzer, '_clone_repository', autospec=True,
+                          side_effect=RepositoryAnalyzer._clone_repository) as mock_clone, \
+             patch('terraform_analyzer.analyzers.repository_analyzer.TerraformAnalyzer') as mock_terraform:
+            mock_terraform.extract_directory.return_value = ("1.5.0", {"aws": "5.0.0"})
+            results = analyzer.analyze_many(entries, resolve_latest=False)
+
+    assert mock_clone.call_count == 1
+    assert [[r.repository.name for r in entry] for entry in results] == [["prod"], ["dev"], ["missing"]]
+    assert results[0][0].clone_stats is not None
+    assert results[1][0].clone_stats is None
+    assert results[1][0].error is None
+    assert "does not exist" in results[2][0].error
+
+def test_repository_analyzer_discovers_root_modules(monorepo):
+    """Test la découverte des modules racines, les modules enfants étant ignorés."""
+    entry = RepositoryInfo(name="mono", repository=monorepo, terraform_path=".", discover=True)
+    with RepositoryAnalyzer(entry) as analyzer:
+        with patch('terraform_analyzer.analyzers.repository_analyzer.TerraformAnalyzer') as mock_terraform:
+            mock_terraform.extract_directory.return_value = ("1.5.0", {"aws": "5.0.0"})
+            results = analyzer.analyze_many([entry], resolve_latest=False)
+
+    assert [(r.repository.name, r.repository.terraform_path) for r in results[0]] == [
+        ("mono/envs/dev", "envs/dev"),
+        ("mono/envs/prod", "envs/prod"),
+    ]
+    assert all(not r.repository.discover and r.error is None for r in results[0])
@@ -0,0 +1,145 @@
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.analyzers.static_analyzer import LOCK_FILE_NAME, StaticAnalyzer
+from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+from terraform_analyzer.models.exceptions import TerraformAnalysisError
+
+LOCK_FILE = """
+# This file is maintained automatically by "terraform init".
+# Manual edits may be lost in future updates.
+
+provider "registry.terraform.io/hashicorp/aws" {
+  version     = "4.67.0"
+  constraints = "~> 4.0"
+  hashes = [
+    "h1:dCRc4GqsyfqHEMjgtlM1EympBcgTmcTkWaJmtd91+KA=",
+    "zh:0843017ecc24385f2b45f2c5fce79dc25b258e50d516877b3affee3bef34f060",
+  ]
+}
+
+provider "registry.terraform.io/integrations/github" {
+  version = "5.42.0"
+  hashes = [
+    "h1:vHTDsHEbTAAwB+S1ntsEpxAXLxlbXqbFPb0LqPHOcuI=",
+  ]
+}
+"""
+
+VERSIONS_TF = """
+terraform {
+  # required_version = "0.12"
+  required_version = ">= 1.3.0" // minimum
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = "~> 4.0"
+    }
+    github = {
+      source = "integrations/github"
+    }
+  }
+
+  backend "s3" {}
+}
+
+data "terraform_remote_state" "network" {
+  backend = "s3"
+}
+"""
+
+
+@pytest.fixture
+def terraform_dir(tmp_path):
+    terraform_dir = tmp_path / "terraform"
+    terraform_dir.mkdir()
+    (terraform_dir / ".terraform.lock.hcl").write_text(LOCK_FILE)
+    (terraform_dir / "versions.tf").write_text(VERSIONS_TF)
+    return terraform_dir
+
+
+def test_parse_lock_file():
+    providers = StaticAnalyzer.parse_lock_file(LOCK_FILE)
+    assert providers == {
+        "registry.terraform.io/hashicorp/aws": {"version": "4.67.0", "constraints": "~> 4.0"},
+        "registry.terraform.io/integrations/github": {"version": "5.42.0", "constraints": None}
+    }
+
+
+def test_parse_terraform_blocks():
+    required_version, required_providers = StaticAnalyzer.parse_terraform_blocks(VERSIONS_TF)
+    assert required_version == ">= 1.3.0"
+    assert required_providers == {
+        "registry.terraform.io/hashicorp/aws": "~> 4.0",
+        "registry.terraform.io/integrations/github": None
+    }
+
+
+def test_parse_terraform_blocks_legacy_syntax():
+    _, required_providers = StaticAnalyzer.parse_terraform_blocks(
+        'terraform {\n  required_providers {\n    google = "~> 3.0"\n  }\n}\n'
+    )
+    assert required_providers == {"registry.terraform.io/hashicorp/google": "~> 3.0"}
+
+
+def test_parse_terraform_blocks_unbalanced():
+    with pytest.raises(TerraformAnalysisError):
+        StaticAnalyzer.parse_terraform_blocks('terraform {\n  required_version = ">= 1.0"\n')
+
+
+def test_analyze_directory(terraform_dir):
+    assert StaticAnalyzer.can_analyze(str(terraform_dir))
+    terraform_version, provider_versions = StaticAnalyzer.analyze_directory(str(terraform_dir))
+    assert terraform_version == ">= 1.3.0"
+    assert provider_versions == {
+        "registry.terraform.io/hashicorp/aws": "4.67.0",
+        "registry.terraform.io/integrations/github": "5.42.0"
+    }
+
+
+def test_cannot_analyze_without_complete_lock_file(terraform_dir):
+    """A missing lock file or a provider missing from it requires terraform init."""
+    (terraform_dir / "google.tf").write_text(
+        'terraform {\n  required_providers {\n    google = { source = "hashicorp/google" }\n  }\n}\n'
+    )
+    assert not StaticAnalyzer.can_analyze(str(terraform_dir))
+    (terraform_dir / ".terraform.lock.hcl").unlink()
+    assert not StaticAnalyzer.can_analyze(str(terraform_dir))
+
+
+def test_read_constraints(terraform_dir):
+    """Lock file constraints take precedence over required_providers, which remain the fallback."""
+    (terraform_dir / "versions.tf").write_text(VERSIONS_TF.replace('version = "~> 4.0"', 'version = ">= 4.0"'))
+    assert StaticAnalyzer.read_constraints(str(terraform_dir)) == {"registry.terraform.io/hashicorp/aws": "~> 4.0"}
+
+    (terraform_dir / ".terraform.lock.hcl").unlink()
+    assert StaticAnalyzer.read_constraints(str(terraform_dir)) == {"registry.terraform.io/hashicorp/aws": ">= 4.0"}
+
+
+def test_extract_directory_static_mode(terraform_dir):
+    """In static mode terraform is not run when the lock file is usable."""
+    TerraformAnalyzer.set_static_analysis(True)
+    try:
+        with patch('subprocess.Popen') as mock_run:
+            terraform_version, provider_versions = TerraformAnalyzer.extract_directory(str(terraform_dir))
+        mock_run.assert_not_called()
+    finally:
+        TerraformAnalyzer.set_static_analysis(False)
+
+    assert terraform_version == ">= 1.3.0"
+    assert provider_versions["registry.terraform.io/hashicorp/aws"] == "4.67.0"
+
+
+def test_find_root_modules(tmp_path):
+    """Directories with a lock file or a terraform block are root modules, local module sources are not."""
+    (tmp_path / "live").mkdir()
+    (tmp_path / "live" / "main.tf").write_text('terraform {}\nmodule "vpc" {\n  source = "../modules/vpc"\n}\n')
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / LOCK_FILE_NAME).write_text("")
+    (tmp_path / "modules" / "vpc").mkdir(parents=True)
+    (tmp_path / "modules" / "vpc" / "main.tf").write_text("terraform {}\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "example.tf").write_text('# terraform {}\nresource "null" "x" {}\n')
+    (tmp_path / "live" / ".terraform" / "modules").mkdir(parents=True)
+    (tmp_path / "live" / ".terraform" / "modules" / "main.tf").write_text("terraform {}\n")
+
+    assert StaticAnalyzer.find_root_modules(str(tmp_path)) == ["live", "locked"]
@@ -33,13 +33,10 @@ terraform {
 
 def mock_terraform_command(mocker, stdout="", stderr="", returncode=0):
     """Helper to mock terraform command responses"""
-    mock_run = mocker.patch('subprocess.run')
-    mock_run.return_value = MagicMock(
-        stdout=stdout,
-        stderr=stderr,
-        returncode=returncode
-    )
-    return mock_run
+    mock_popen = mocker.patch('subprocess.Popen')
+    mock_popen.return_value.communicate.return_value = (stdout, stderr)
+    mock_popen.return_value.returncode = returncode
+    return mock_popen
 
 @pytest.fixture
 def mock_terraform_version(mocker):
@@ -55,10 +52,10 @@ def mock_terraform_version(mocker):
 
 def test_analyze_directory(terraform_dir, mock_terraform_version):
     """Test analyzing a valid Terraform directory."""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"versions": [{"version": "4.1.0"}]}
+        mock_response.iter_content.return_value = [json.dumps({"versions": [{"version": "4.1.0"}]}).encode()]
         mock_get.return_value = mock_response
         
         terraform_version, provider_versions = TerraformAnalyzer.analyze_directory(str(terraform_dir))
@@ -94,10 +91,10 @@ def test_get_latest_provider_versions_without_prerelease():
         ]
     }
     
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = mock_versions
+        mock_response.iter_content.return_value = [json.dumps(mock_versions).encode()]
         mock_get.return_value = mock_response
         
         TerraformAnalyzer.set_include_prerelease(False)
@@ -119,10 +116,10 @@ def test_get_latest_provider_versions_with_prerelease():
         ]
     }
     
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = mock_versions
+        mock_response.iter_content.return_value = [json.dumps(mock_versions).encode()]
         mock_get.return_value = mock_response
         
         TerraformAnalyzer.set_include_prerelease(True)
@@ -0,0 +1,76 @@
+import json
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.analyzers.terraform_runner import TerraformRunner
+from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+from terraform_analyzer.models.exceptions import TerraformAnalysisError
+
+VERSION_OUTPUT = {
+    "terraform_version": "1.5.0",
+    "provider_selections": {"registry.terraform.io/hashicorp/aws": "5.0.0"}
+}
+
+
+def test_run_records_timings(tmp_path):
+    runner = TerraformRunner()
+    result = runner.run([sys.executable, "-c", "print('ok')"], str(tmp_path))
+    assert result.returncode == 0
+    assert result.stdout.strip() == "ok"
+    assert "-c" in runner.pop_timings(str(tmp_path))
+    assert runner.pop_timings(str(tmp_path)) == {}
+
+
+def test_run_json_is_memoized(tmp_path):
+    runner = TerraformRunner()
+    args = [sys.executable, "-c", f"print({json.dumps(json.dumps(VERSION_OUTPUT))})"]
+    with patch('subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+        assert runner.run_json(args, str(tmp_path)) == VERSION_OUTPUT
+        assert runner.run_json(args, str(tmp_path)) == VERSION_OUTPUT
+        assert mock_popen.call_count == 1
+
+        runner.forget(str(tmp_path))
+        runner.run_json(args, str(tmp_path))
+        assert mock_popen.call_count == 2
+
+
+def test_run_json_failure(tmp_path):
+    runner = TerraformRunner()
+    with pytest.raises(TerraformAnalysisError):
+        runner.run_json([sys.executable, "-c", "import sys; sys.exit(1)"], str(tmp_path))
+
+
+def test_timeout_kills_process_group(tmp_path):
+    """A hung command and the children it spawned are killed after the timeout."""
+    marker = tmp_path / "survived"
+    child = tmp_path / "child.py"
+    child.write_text(f"import time\ntime.sleep(1)\nopen({str(marker)!r}, 'w').close()\n")
+    script = (
+        "import subprocess, sys, time\n"
+        f"subprocess.Popen([sys.executable, {str(child)!r}])\n"
+        "time.sleep(30)\n"
+    )
+    runner = TerraformRunner(timeout=0.5)
+    start = time.monotonic()
+    with pytest.raises(TerraformAnalysisError, match="timed out"):
+        runner.run([sys.executable, "-c", script], str(tmp_path))
+    assert time.monotonic() - start < 10
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+def test_terraform_version_runs_once(tmp_path, mocker):
+    """`terraform version -json` is spawned once per analyzed directory."""
+    mock_popen = mocker.patch('subprocess.Popen')
+    mock_popen.return_value.communicate.return_value = (json.dumps(VERSION_OUTPUT), "")
+    mock_popen.return_value.returncode = 0
+
+    terraform_version, providers = TerraformAnalyzer.extract_directory(str(tmp_path))
+
+    assert terraform_version == "1.5.0"
+    assert providers == {"registry.terraform.io/hashicorp/aws": "5.0.0"}
+    commands = [call.args[0][1] for call in mock_popen.call_args_list]
+    assert commands == ["init", "version"]
+    assert set(TerraformAnalyzer.runner.pop_timings(str(tmp_path))) == {"init", "version"}
@@ -0,0 +1,59 @@
+import pytest
+from terraform_analyzer.analyzers.version_index import ProviderVersionIndex, parse_constraint
+
+RELEASES = ["3.0.0", "4.0.0", "4.1.0", "4.10.2", "4.11.0-rc1", "5.0.0-beta1", "5.1.0", "invalid", "1.0", "1.0.0"]
+
+@pytest.fixture
+def index():
+    return ProviderVersionIndex(RELEASES)
+
+def test_partitions(index):
+    """Invalid versions are ignored, the first spelling of a version is kept and prereleases are set apart."""
+    assert [str(release) for release in index.stable] == ["1.0", "3.0.0", "4.0.0", "4.1.0", "4.10.2", "5.1.0"]
+    assert len(index.all) == 8
+    assert index.latest() == "5.1.0"
+    assert ProviderVersionIndex(["1.0.0", "1.1.0-beta"]).latest(include_prerelease=True) == "1.1.0-beta"
+    assert ProviderVersionIndex([]).latest() is None
+
+def test_latest_in_major(index):
+    assert index.latest_in_major("4.0.0") == "4.10.2"
+    assert index.latest_in_major("4.0.0", include_prerelease=True) == "4.11.0-rc1"
+    # 5.0.0-beta1 sorts below 5.0.0 but belongs to major 5
+    assert index.latest_in_major("5.0.0-beta1", include_prerelease=True) == "5.1.0"
+    assert index.latest_in_major("2.0.0") is None
+    assert index.latest_in_major("x.y") is None
+
+def test_releases_behind(index):
+    assert index.releases_behind("4.1.0") == 2
+    assert index.releases_behind("4.1.0", include_prerelease=True) == 4
+    assert index.releases_behind("5.1.0") == 0
+    assert index.releases_behind("0.1.0") == 6
+    assert index.releases_behind("x.y") is None
+
+@pytest.mark.parametrize("constraint, expected", [
+    ("~> 4.0", "4.10.2"),
+    ("~> 4.1.0", "4.1.0"),
+    ("~> 3", "5.1.0"),
+    (">= 3.0, < 5.0.0", "4.10.2"),
+    (">= 4.0, != 4.10.2, < 5.0", "4.1.0"),
+    ("4.0.0", "4.0.0"),
+    ("= 3.0.0", "3.0.0"),
+    ("> 6.0", None),
+    ("latest", None),
+    (None, None),
+])
+def test_latest_allowed(index, constraint, expected):
+    """Terraform constraints are converted to specifiers, `~>` becoming `~=`."""
+    assert index.latest_allowed(constraint) == expected
+
+def test_parse_constraint():
+    assert str(parse_constraint("~> 4.0, != 4.2.0")) == "!=4.2.0,~=4.0"
+    assert parse_constraint("~> 4.0,") is None
+
+def test_describe(index):
+    assert index.describe("4.1.0", "~> 4.0") == {
+        "latest_version": "5.1.0",
+        "latest_in_major": "4.10.2",
+        "releases_behind": 2,
+        "latest_allowed": "4.10.2"
+    }
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 import pytest
 from terraform_analyzer.models.repository import RepositoryInfo, ProviderVersion, AnalysisResult
 from terraform_analyzer.formatters.output_formatter import TextFormatter, JsonFormatter, CsvFormatter, FormatterFactory
@@ -94,4 +97,56 @@ def test_error_handling(repo_info):
     
     assert "Error: Test error" in text_output
     assert '"error": "Test error"' in json_output
-    assert "Test error" in csv_output
\ No newline at end of file
+    assert "Test error" in csv_output
+
+def test_ndjson_formatter(sample_results, repo_info):
+    """Test le formateur NDJSON : une ligne JSON complète par dépôt."""
+    results = sample_results + [AnalysisResult(repository=repo_info, terraform_version=None, error="Test error")]
+    output = FormatterFactory.get_formatter("ndjson").format(results)
+
+    lines = output.splitlines()
+    assert len(lines) == 2 and output.endswith("\n")
+    first, second = (json.loads(line) for line in lines)
+    assert first == json.loads(FormatterFactory.get_formatter("json").format(sample_results))[0]
+    assert second["error"] == "Test error"
+
+@pytest.mark.parametrize("format_type", ["text", "json", "csv", "html", "markdown", "ndjson"])
+def test_streaming_matches_format(tmp_path, sample_results, format_type):
+    """Test que chaque dépôt émis est écrit dans le fichier avant la fin du rapport."""
+    path = tmp_path / "report"
+    formatter = FormatterFactory.get_formatter(format_type)
+    with open(path, "w") as f:
+        formatter.begin(f)
+        formatter.emit(sample_results[0])
+        assert "test-repo" in path.read_text()
+        formatter.end()
+
+    assert path.read_bytes().decode() == FormatterFactory.get_formatter(format_type).format(sample_results)
+
+def test_version_index_fields(repo_info):
+    """Test que les champs de l'index de versions sont rapportés par chaque formateur."""
+    results = [
+        AnalysisResult(
+            repository=repo_info,
+            terraform_version="1.0.0",
+            provider_versions={"aws": ProviderVersion(current_version="4.1.0", latest_version="5.1.0",
+                                                      constraint="~> 4.0", latest_in_major="4.2.0",
+                                                      releases_behind=3, latest_allowed="4.2.0")}
+        )
+    ]
+
+    text_output = FormatterFactory.get_formatter("text").format(results)
+    assert "Latest in current major: 4.2.0" in text_output
+    assert "Releases behind: 3" in text_output
+    assert "Constraint: ~> 4.0 (latest allowed: 4.2.0)" in text_output
+
+    details = json.loads(FormatterFactory.get_formatter("json").format(results))[0]["provider_versions"]["aws"]
+    assert (details["latest_in_major"], details["releases_behind"], details["constraint"], details["latest_allowed"]) == \
+        ("4.2.0", 3, "~> 4.0", "4.2.0")
+
+    rows = list(csv.DictReader(io.StringIO(FormatterFactory.get_formatter("csv").format(results))))
+    assert (rows[0]["latest_in_major"], rows[0]["releases_behind"], rows[0]["latest_allowed"]) == ("4.2.0", "3", "4.2.0")
+
+    for format_type in ("html", "markdown"):
+        output = FormatterFactory.get_formatter(format_type).format(results)
+        assert "4.2.0" in output and "~> 4.0" in output
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.models.repository import RepositoryInfo, ProviderVersion, AnalysisResult
+from terraform_analyzer.formatters.output_formatter import FormatterFactory
+from terraform_analyzer.formatters.output_pipeline import OutputSink, render_reports
+from terraform_analyzer.formatters.status_view import ResultView
+
+FORMATS = ['text', 'json', 'csv', 'html', 'markdown']
+
+@pytest.fixture
+def results():
+    return [
+        AnalysisResult(
+            repository=RepositoryInfo(name=f"repo-{index}", repository=f"https://github.com/test/repo-{index}",
+                                      terraform_path="terraform", branch="main"),
+            terraform_version="1.0.0",
+            installed_terraform_version="1.5.0",
+            provider_versions={
+                "aws": ProviderVersion(current_version="3.0.0", latest_version="4.0.0"),
+                "google": ProviderVersion(current_version="5.0.0", latest_version="5.0.0"),
+            }
+        )
+        for index in range(100)
+    ] + [
+        AnalysisResult(
+            repository=RepositoryInfo(name="broken", repository="https://github.com/test/broken",
+                                      terraform_path="."),
+            terraform_version=None,
+            provider_versions={},
+            error="clone failed"
+        )
+    ]
+
+@pytest.mark.parametrize("results_count", [0, 1, 101])
+def test_reports_match_format(tmp_path, results, results_count):
+    """Test que chaque rapport écrit par le pipeline est identique à celui de format()."""
+    results = results[-results_count:] if results_count else []
+    sinks = [OutputSink(FormatterFactory.get_formatter(format_type), str(tmp_path / format_type))
+             for format_type in FORMATS]
+
+    render_reports(results, sinks)
+
+    for format_type in FORMATS:
+        expected = FormatterFactory.get_formatter(format_type).format(results)
+        assert (tmp_path / format_type).read_bytes().decode() == expected
+
+def test_views_computed_once(tmp_path, results):
+    """Test que le statut de chaque résultat est calculé une seule fois pour tous les rapports."""
+    sinks = [OutputSink(FormatterFactory.get_formatter(format_type), str(tmp_path / format_type))
+             for format_type in FORMATS]
+
+    with patch.object(ResultView, 'from_result', wraps=ResultView.from_result) as mock_from_result:
+        render_reports(results, sinks)
+
+    assert mock_from_result.call_count == len(results)
+
+def test_stdout_reports_not_interleaved(capsys, results):
+    """Test que les rapports envoyés sur la sortie standard sont affichés l'un après l'autre."""
+    sinks = [OutputSink(FormatterFactory.get_formatter('text')),
+             OutputSink(FormatterFactory.get_formatter('json'), '-')]
+
+    render_reports(results, sinks)
+
+    text = FormatterFactory.get_formatter('text').format(results)
+    json_report = FormatterFactory.get_formatter('json').format(results)
+    assert capsys.readouterr().out == f"{text}\n{json_report}\n"
+
+def test_unwritable_path_fails_before_rendering(tmp_path, results):
+    """Test qu'un chemin de sortie invalide est signalé avant le rendu de tout rapport."""
+    sinks = [OutputSink(FormatterFactory.get_formatter('json'), str(tmp_path / "report.json")),
+             OutputSink(FormatterFactory.get_formatter('csv'), str(tmp_path / "missing" / "report.csv"))]
+
+    with patch.object(ResultView, 'from_result', wraps=ResultView.from_result) as mock_from_result:
+        with pytest.raises(FileNotFoundError):
+            render_reports(results, sinks)
+
+    mock_from_result.assert_not_called()
+
+def test_sink_error_is_raised(tmp_path, results):
+    """Test qu'une erreur de rendu est remontée sans bloquer les autres rapports."""
+    csv_formatter = FormatterFactory.get_formatter('csv')
+    sinks = [OutputSink(csv_formatter, str(tmp_path / "report.csv")),
+             OutputSink(FormatterFactory.get_formatter('json'), str(tmp_path / "report.json"))]
+
+    with patch.object(csv_formatter, '_emit', side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            render_reports(results, sinks)
+
+    assert (tmp_path / "report.json").read_text() == FormatterFactory.get_formatter('json').format(results)
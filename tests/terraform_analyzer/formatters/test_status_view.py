@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.models.repository import RepositoryInfo, ProviderVersion, AnalysisResult
+from terraform_analyzer.formatters.status_view import ResultView, build_views, parse_version
+from terraform_analyzer.formatters.output_formatter import FormatterFactory
+
+@pytest.fixture
+def result():
+    return AnalysisResult(
+        repository=RepositoryInfo(name="test-repo", repository="https://github.com/test/test-repo",
+                                  terraform_path="terraform"),
+        terraform_version="1.0.0",
+        provider_versions={
+            "aws": ProviderVersion(current_version="3.0.0", latest_version="4.0.0"),
+            "azurerm": ProviderVersion(current_version="3.1.0", latest_version="3.2.0"),
+            "google": ProviderVersion(current_version="5.0.0", latest_version="5.0.0"),
+            "null": ProviderVersion(current_version="3.2.1", latest_version=None),
+        }
+    )
+
+def test_parse_version():
+    """Test le découpage des versions, y compris les pré-versions et les valeurs invalides."""
+    assert parse_version("1.2.3-pre2") == (1, 2, 3)
+    assert parse_version("4.0") == (4, 0, 0)
+    assert parse_version("x.1.y") == (0, 1, 0)
+    assert parse_version(None) == (0, 0, 0)
+
+def test_result_view_counts(result):
+    """Test les statuts et compteurs précalculés d'un résultat."""
+    view = ResultView.from_result(result)
+    statuses = {status.provider: status for status in view.providers}
+
+    assert [status.provider for status in view.providers] == list(result.provider_versions)
+    assert (view.major_updates, view.minor_updates) == (1, 1)
+    assert statuses["aws"].is_major_update and statuses["aws"].needs_update
+    assert statuses["azurerm"].needs_update and not statuses["azurerm"].is_major_update
+    assert statuses["azurerm"].progress == pytest.approx(30100 / 30200 * 100)
+    assert not statuses["google"].needs_update and statuses["google"].progress == 0.0
+    assert not statuses["null"].needs_update
+
+def test_views_are_computed_once_for_all_formats(result):
+    """Test que les versions ne sont analysées qu'une fois pour tous les formats."""
+    with patch('terraform_analyzer.formatters.status_view.parse_version', wraps=parse_version) as mock_parse:
+        views = build_views([result])
+        for format_type in ["text", "json", "csv", "html", "markdown"]:
+            FormatterFactory.get_formatter(format_type).format(views)
+
+    # Current and latest version of the two outdated providers
+    assert mock_parse.call_count == 4
+    assert build_views(views)[0] is views[0]
@@ -0,0 +1,353 @@
+import json
+import sys
+import tracemalloc
+import time
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
+from terraform_analyzer.models.exceptions import RepositoryAnalysisError
+from terraform_analyzer.analyzers.version_index import ProviderVersionIndex
+from terraform_analyzer import main
+
+
+@pytest.fixture
+def repositories():
+    return [
+        RepositoryInfo(
+            name=f"repo-{i}",
+            repository=f"https://example.com/repo-{i}.git",
+            terraform_path="terraform"
+        )
+        for i in range(6)
+    ]
+
+
+class FakeAnalyzer:
+    """Stand-in for RepositoryAnalyzer: repo-2 fails, the others finish in reverse order."""
+
+    def __init__(self, repository, **kwargs):
+        self.repository = repository
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def analyze_many(self, repositories, resolve_latest=True, get_previous=None):
+        return [[self.analyze(repository)] for repository in repositories]
+
+    def analyze(self, repository):
+        index = int(repository.name.split('-')[1])
+        if index == 2:
+            raise RuntimeError("boom")
+        time.sleep(0.01 * (6 - index))
+        return AnalysisResult(
+            repository=repository,
+            terraform_version="1.0.0",
+            provider_versions={
+                "registry.terraform.io/hashicorp/aws": ProviderVersion(current_version="4.0.0", latest_version=None),
+                f"registry.terraform.io/acme/p{index}": ProviderVersion(current_version="1.0.0", latest_version=None)
+            }
+        )
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_analyze_repositories_keeps_config_order(repositories, jobs):
+    """Results come back in config order whatever the number of jobs."""
+    with patch('terraform_analyzer.main.RepositoryAnalyzer', FakeAnalyzer), \
+         patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes', return_value={}):
+        results = main.analyze_repositories(repositories, jobs=jobs)
+
+    assert [r.repository.name for r in results] == [r.name for r in repositories]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_analyze_repositories_isolates_failures(repositories, jobs):
+    """A failing repository yields an error result without aborting the run."""
+    with patch('terraform_analyzer.main.RepositoryAnalyzer', FakeAnalyzer), \
+         patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes', return_value={}):
+        results = main.analyze_repositories(repositories, jobs=jobs)
+
+    assert isinstance(results[2], AnalysisResult)
+    assert results[2].error == "boom"
+    assert all(r.error is None for i, r in enumerate(results) if i != 2)
+
+
+def test_analyze_repositories_resolves_each_provider_once(repositories):
+    """Latest versions are resolved once per unique provider and joined back into each result."""
+    latest = {
+        "registry.terraform.io/hashicorp/aws": "5.0.0",
+        "registry.terraform.io/acme/p0": "2.0.0"
+    }
+    indexes = {provider: ProviderVersionIndex([version]) for provider, version in latest.items()}
+    with patch('terraform_analyzer.main.RepositoryAnalyzer', FakeAnalyzer), \
+         patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes',
+               return_value=indexes) as mock_resolve:
+        results = main.analyze_repositories(repositories, jobs=2)
+
+    mock_resolve.assert_called_once()
+    providers = mock_resolve.call_args.args[0]
+    assert len(providers) == len(set(providers)) == 6  # aws + one provider per successful repo
+    assert all(r.provider_versions["registry.terraform.io/hashicorp/aws"].latest_version == "5.0.0"
+               for r in results if not r.error)
+    assert results[0].provider_versions["registry.terraform.io/acme/p0"].latest_version == "2.0.0"
+    assert results[1].provider_versions["registry.terraform.io/acme/p1"].latest_version is None
+
+
+def test_resolve_latest_versions_fills_version_index_fields():
+    """Latest in major, releases behind and latest allowed by the constraint come from the version index."""
+    result = AnalysisResult(
+        repository=RepositoryInfo(name="a", repository="https://example.com/a.git", terraform_path="."),
+        provider_versions={
+            "registry.terraform.io/hashicorp/aws": ProviderVersion(current_version="4.1.0", latest_version=None,
+                                                                   constraint="~> 4.0"),
+        }
+    )
+    index = ProviderVersionIndex(["4.0.0", "4.1.0", "4.2.0", "5.0.0", "5.1.0"])
+    with patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes',
+               return_value={"registry.terraform.io/hashicorp/aws": index}):
+        main.resolve_latest_versions([result])
+
+    version = result.provider_versions["registry.terraform.io/hashicorp/aws"]
+    assert (version.latest_version, version.latest_in_major, version.releases_behind, version.latest_allowed) == \
+        ("5.1.0", "4.2.0", 3, "4.2.0")
+
+
+def test_analyze_repositories_invalid_jobs(repositories):
+    """A non-positive number of jobs is rejected."""
+    with pytest.raises(RepositoryAnalysisError):
+        main.analyze_repositories(repositories, jobs=0)
+
+
+def test_read_config_clone_strategy(tmp_path):
+    """The global clone strategy applies unless a repository overrides it."""
+    config = tmp_path / "config.yaml"
+    config.write_text("""
+clone-strategy: sparse
+repos:
+- name: a
+  repository: https://example.com/a.git
+  terraform-path: terraform
+- name: b
+  repository: https://example.com/b.git
+  terraform-path: terraform
+  clone-strategy: full
+""")
+    repos = main.read_config(str(config))
+    assert [r.clone_strategy for r in repos] == ["sparse", "full"]
+
+
+def test_read_config_invalid_clone_strategy(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("""
+repos:
+- name: a
+  repository: https://example.com/a.git
+  terraform-path: terraform
+  clone-strategy: magic
+""")
+    with pytest.raises(RepositoryAnalysisError):
+        main.read_config(str(config))
+
+
+class GroupAnalyzer:
+    """Stand-in for RepositoryAnalyzer recording the entries analyzed from each clone."""
+    clones = []
+
+    def __init__(self, repository, **kwargs):
+        self.repository = repository
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def analyze_many(self, repositories, resolve_latest=True, get_previous=None):
+        GroupAnalyzer.clones.append([repository.name for repository in repositories])
+        results = []
+        for repository in repositories:
+            if repository.discover:
+                results.append([
+                    AnalysisResult(repository=RepositoryInfo(
+                        name=f"{repository.name}/{module}",
+                        repository=repository.repository,
+                        terraform_path=module
+                    ))
+                    for module in ("envs/dev", "envs/prod")
+                ])
+            else:
+                results.append([AnalysisResult(repository=repository)])
+        return results
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_extract_repositories_clones_each_repository_once(jobs):
+    """Entries of the same repository and branch share a clone; results keep config order."""
+    repositories = [
+        RepositoryInfo(name="a", repository="https://example.com/mono.git", terraform_path="a"),
+        RepositoryInfo(name="b", repository="https://example.com/other.git", terraform_path="b"),
+        RepositoryInfo(name="c", repository="https://example.com/mono.git", terraform_path="c"),
+        RepositoryInfo(name="d", repository="https://example.com/mono.git", terraform_path="d", branch="dev"),
+        RepositoryInfo(name="e", repository="https://example.com/other.git", terraform_path=".", discover=True),
+    ]
+    GroupAnalyzer.clones = []
+    with patch('terraform_analyzer.main.RepositoryAnalyzer', GroupAnalyzer):
+        results = main.extract_repositories(repositories, jobs=jobs)
+
+    assert sorted(GroupAnalyzer.clones) == [["a", "c"], ["b", "e"], ["d"]]
+    assert [r.repository.name for r in results] == ["a", "b", "c", "d", "e/envs/dev", "e/envs/prod"]
+
+
+def test_read_config_discover(tmp_path):
+    """Discovery entries default to the repository root."""
+    config = tmp_path / "config.yaml"
+    config.write_text("""
+repos:
+- name: mono
+  repository: https://example.com/mono.git
+  discover: true
+""")
+    repos = main.read_config(str(config))
+    assert repos[0].discover
+    assert repos[0].terraform_path == "."
+
+
+def test_main_completes_reports_of_interrupted_run(tmp_path, repositories, monkeypatch):
+    """Reports written while a run fails midway are completed with the results obtained so far."""
+    def iter_analyze_repositories(repositories, **kwargs):
+        yield AnalysisResult(repository=repositories[0], terraform_version="1.0.0")
+        raise RuntimeError("interrupted")
+
+    config = tmp_path / "config.yaml"
+    config.write_text("repos:\n- name: repo-0\n  repository: https://example.com/repo-0.git\n  terraform-path: terraform\n")
+    monkeypatch.setattr(sys, 'argv', [
+        'terraform-analyzer', '--config', str(config), '--history-file', str(tmp_path / "history.json"),
+        '--no-registry-cache', '--no-plugin-cache',
+        '--json-output', str(tmp_path / "report.json"), '--ndjson-output', str(tmp_path / "report.ndjson")
+    ])
+    with patch('terraform_analyzer.main.iter_analyze_repositories', iter_analyze_repositories):
+        assert main.main() == 1
+
+    assert [entry['repository']['name'] for entry in json.loads((tmp_path / "report.json").read_text())] == ["repo-0"]
+    assert json.loads((tmp_path / "report.ndjson").read_text())['repository']['name'] == "repo-0"
+    assert not (tmp_path / "history.json").exists()
+
+
+def test_main_registry_snapshot_is_offline(tmp_path, repositories, monkeypatch):
+    """With --registry-snapshot, latest versions are resolved without any network call."""
+    snapshot_file = tmp_path / "snapshot.json"
+    snapshot_file.write_text(json.dumps({"format_version": 1, "providers": {
+        "registry.terraform.io/hashicorp/aws": [{"version": "4.0.0"}, {"version": "5.2.0"}]
+    }}))
+    monkeypatch.setattr(main.TerraformAnalyzer, 'registry_client', main.TerraformAnalyzer.registry_client)
+    monkeypatch.setattr(sys, 'argv', [
+        'terraform-analyzer', '--history-file', str(tmp_path / "history.json"), '--no-plugin-cache',
+        '--cache-dir', str(tmp_path / "cache"), '--registry-snapshot', str(snapshot_file),
+        '--json-output', str(tmp_path / "report.json")
+    ])
+    with patch('terraform_analyzer.main.read_config', return_value=repositories[:2]), \
+         patch('terraform_analyzer.main.RepositoryAnalyzer', FakeAnalyzer), \
+         patch('requests.Session.get', side_effect=ConnectionError("offline")) as mock_get:
+        assert main.main() == 0
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert [entry['provider_versions']['registry.terraform.io/hashicorp/aws']['latest_version'] for entry in report] == [
+        "5.2.0", "5.2.0"
+    ]
+    assert report[0]['provider_versions']['registry.terraform.io/acme/p0']['latest_version'] is None
+    mock_get.assert_not_called()
+
+
+def _run_main(tmp_path, repositories, monkeypatch, *output_args):
+    monkeypatch.setattr(sys, 'argv', [
+        'terraform-analyzer', '--history-file', str(tmp_path / "history.json"),
+        '--no-registry-cache', '--no-plugin-cache'
+    ] + list(output_args))
+    with patch('terraform_analyzer.main.read_config', return_value=repositories), \
+         patch('terraform_analyzer.main.RepositoryAnalyzer', FakeAnalyzer), \
+         patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes', return_value={}):
+        return main.main()
+
+
+def test_main_keeps_history_when_a_report_fails(tmp_path, repositories, monkeypatch):
+    """A report failing while it is rendered does not lose the history of the completed run."""
+    with patch('terraform_analyzer.formatters.output_formatter.HtmlFormatter._emit',
+               side_effect=OSError("disk full")):
+        status = _run_main(tmp_path, repositories, monkeypatch,
+                           '--html-output', str(tmp_path / "report.html"),
+                           '--json-output', str(tmp_path / "report.json"))
+
+    assert status == 1
+    history = json.loads((tmp_path / "history.json").read_text())
+    assert len(history["repo-0"]) == 1 and len(history) == len(repositories)
+    assert len(json.loads((tmp_path / "report.json").read_text())) == len(repositories)
+
+
+def test_main_checks_output_paths_before_analysis(tmp_path, repositories, monkeypatch):
+    """An output file that cannot be written is reported before any repository is analyzed."""
+    with patch('terraform_analyzer.main.iter_analyze_repositories') as mock_analyze:
+        status = _run_main(tmp_path, repositories, monkeypatch,
+                           '--html-output', str(tmp_path / "missing" / "report.html"))
+
+    assert status == 1
+    mock_analyze.assert_not_called()
+
+
+STREAM_MEMORY_PER_REPOSITORY = 2048  # Bytes, documented in the README
+
+
+class HeavyAnalyzer(FakeAnalyzer):
+    """Stand-in for RepositoryAnalyzer returning results with many providers."""
+    providers = 50
+
+    def analyze(self, repository):
+        return AnalysisResult(
+            repository=repository,
+            terraform_version="1.0.0",
+            provider_versions={
+                f"registry.terraform.io/acme/provider-{index}": ProviderVersion(current_version="1.0.0",
+                                                                                 latest_version=None)
+                for index in range(self.providers)
+            }
+        )
+
+
+def _stream_peak_memory(tmp_path, count):
+    """Peak memory traced while main analyzes `count` repositories with --stream."""
+    repositories = [
+        RepositoryInfo(name=f"repo-{i}", repository=f"https://example.com/repo-{i}.git", terraform_path="terraform")
+        for i in range(count)
+    ]
+    directory = tmp_path / str(count)
+    directory.mkdir()
+    argv = [
+        'terraform-analyzer', '--stream', '--jobs', '4', '--history-file', str(directory / "history.jsonl"),
+        '--no-registry-cache', '--no-plugin-cache',
+        '--ndjson-output', str(directory / "report.ndjson"), '--csv-output', str(directory / "report.csv")
+    ]
+    with patch.object(sys, 'argv', argv), \
+         patch('terraform_analyzer.main.read_config', return_value=repositories), \
+         patch('terraform_analyzer.main.RepositoryAnalyzer', HeavyAnalyzer), \
+         patch('terraform_analyzer.main.TerraformAnalyzer.resolve_version_indexes',
+               side_effect=lambda providers: dict.fromkeys(providers, ProviderVersionIndex(["1.0.0", "2.0.0"]))):
+        tracemalloc.start()
+        try:
+            assert main.main() == 0
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert len((directory / "report.ndjson").read_text().splitlines()) == count
+    assert len((directory / "history.jsonl").read_text().splitlines()) == count
+    return peak
+
+
+def test_stream_memory_is_bounded(tmp_path):
+    """With --stream, results are dropped once reported: only the history index grows, by a few KB per repository."""
+    small = _stream_peak_memory(tmp_path, 100)
+    large = _stream_peak_memory(tmp_path, 500)
+
+    # A result of HeavyAnalyzer takes about 30 KB, keeping the 400 more results would take 12 MB
+    assert large - small < 400 * STREAM_MEMORY_PER_REPOSITORY
@@ -0,0 +1,141 @@
+import hashlib
+import io
+import json
+import os
+import tarfile
+import pytest
+from terraform_analyzer.models.exceptions import CacheBundleError
+from terraform_analyzer.utils.cache_bundle import export_cache, import_cache
+from terraform_analyzer.utils.registry_cache import RegistryCache
+
+AWS = "registry.terraform.io/hashicorp/aws"
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    RegistryCache(str(cache_dir / "registry")).store(AWS, [{"version": "5.0.0"}], etag='"abc"')
+    plugin = cache_dir / "plugins" / AWS / "5.0.0" / "linux_amd64" / "terraform-provider-aws"
+    plugin.parent.mkdir(parents=True)
+    plugin.write_bytes(b"\x7fELF" * 1000)
+    plugin.chmod(0o755)
+    (cache_dir / "plugins" / ".lock").write_text("")
+    (cache_dir / "plugins" / ".terraformrc").write_text("provider_installation {}")
+    mirror = cache_dir / "mirrors" / "repo-0123456789ab.git"
+    (mirror / "refs" / "tags").mkdir(parents=True)
+    (mirror / "HEAD").write_text("ref: refs/heads/main\n")
+    (cache_dir / "mirrors" / "repo-0123456789ab.git.lock").write_text("")
+    return cache_dir
+
+
+def make_bundle(path, files, manifest_files=None, member_type=tarfile.REGTYPE, sections=("registry",)):
+    """Write a bundle whose manifest lists `manifest_files` (sha256 of `files` by default) and `sections`, if any."""
+    if manifest_files is None:
+        manifest_files = {name: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+                          for name, data in files.items()}
+    manifest = {"format_version": 1, "files": manifest_files}
+    if sections is not None:
+        manifest["sections"] = list(sections)
+    manifest = json.dumps(manifest).encode()
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in [("manifest.json", manifest)] + list(files.items()):
+            info = tarfile.TarInfo(name)
+            info.type = member_type if name != "manifest.json" else tarfile.REGTYPE
+            info.size = len(data) if info.type == tarfile.REGTYPE else 0
+            if info.type == tarfile.SYMTYPE:
+                info.linkname = "/etc/passwd"
+            tar.addfile(info, io.BytesIO(data) if info.type == tarfile.REGTYPE else None)
+
+
+def test_export_then_import(tmp_path, cache_dir):
+    """The registry and plugin caches are restored identically, lock files and local configuration excluded."""
+    bundle = tmp_path / "cache.tar.gz"
+    manifest = export_cache(str(cache_dir), str(bundle))
+    assert sorted(manifest["files"]) == [
+        "plugins/registry.terraform.io/hashicorp/aws/5.0.0/linux_amd64/terraform-provider-aws",
+        "registry/registry.terraform.io%2Fhashicorp%2Faws.json"
+    ]
+
+    restored = tmp_path / "restored"
+    import_cache(str(restored), str(bundle))
+
+    record = RegistryCache(str(restored / "registry")).load(AWS)
+    assert record["versions"] == [{"version": "5.0.0"}] and record["etag"] == '"abc"'
+    plugin = restored / "plugins" / AWS / "5.0.0" / "linux_amd64" / "terraform-provider-aws"
+    assert plugin.read_bytes() == b"\x7fELF" * 1000
+    assert os.access(plugin, os.X_OK)
+    assert not (restored / "plugins" / ".terraformrc").exists()
+    assert not (restored / "mirrors").exists()
+    assert [name for name in os.listdir(restored) if name.startswith(".import-")] == []
+
+
+def test_export_with_mirrors_keeps_empty_directories(tmp_path, cache_dir):
+    bundle = tmp_path / "cache.tar.gz"
+    export_cache(str(cache_dir), str(bundle), sections=("registry", "plugins", "mirrors"))
+
+    restored = tmp_path / "restored"
+    import_cache(str(restored), str(bundle))
+
+    mirror = restored / "mirrors" / "repo-0123456789ab.git"
+    assert (mirror / "refs" / "tags").is_dir()
+    assert (mirror / "HEAD").read_text() == "ref: refs/heads/main\n"
+    assert not (restored / "mirrors" / "repo-0123456789ab.git.lock").exists()
+
+
+def test_import_rejects_corrupted_file(tmp_path, cache_dir):
+    """A file not matching its hash aborts the import before the cache is modified."""
+    bundle = tmp_path / "cache.tar.gz"
+    make_bundle(bundle, {"registry/a.json": b"{}", "registry/b.json": b"tampered"},
+                manifest_files={"registry/a.json": {"sha256": "0" * 64, "size": 2},
+                                "registry/b.json": {"sha256": "0" * 64, "size": 8}})
+    before = sorted(os.listdir(cache_dir / "registry"))
+
+    with pytest.raises(CacheBundleError, match="Integrity"):
+        import_cache(str(cache_dir), str(bundle))
+
+    assert sorted(os.listdir(cache_dir / "registry")) == before
+
+
+@pytest.mark.parametrize("name, member_type", [
+    ("../evil", tarfile.REGTYPE),
+    ("registry/../../evil", tarfile.REGTYPE),
+    ("/tmp/evil", tarfile.REGTYPE),
+    ("history.json", tarfile.REGTYPE),
+    ("registry/link", tarfile.SYMTYPE),
+])
+def test_import_rejects_unsafe_members(tmp_path, name, member_type):
+    bundle = tmp_path / "cache.tar.gz"
+    make_bundle(bundle, {name: b"x"}, member_type=member_type)
+
+    with pytest.raises(CacheBundleError):
+        import_cache(str(tmp_path / "cache"), str(bundle))
+
+    assert not (tmp_path / "evil").exists()
+
+
+@pytest.mark.parametrize("sections, manifest_files", [
+    (None, {"registry/a.json": {"sha256": "0" * 64, "size": 1}}),
+    (["history"], {"registry/a.json": {"sha256": "0" * 64, "size": 1}}),
+    (["registry"], {"registry/a.json": {"sha256": "0" * 64}}),
+    (["registry"], {"registry/a.json": {"size": 1}}),
+    (["registry"], {"registry/a.json": {"sha256": "0" * 64, "size": "1"}}),
+    (["registry"], {"registry/a.json": "0" * 64}),
+])
+def test_import_rejects_invalid_manifest(tmp_path, cache_dir, sections, manifest_files):
+    """A manifest without sections or with incomplete file entries is rejected before the cache is modified."""
+    bundle = tmp_path / "cache.tar.gz"
+    make_bundle(bundle, {"registry/a.json": b"x"}, manifest_files=manifest_files, sections=sections)
+    before = sorted(os.listdir(cache_dir / "registry"))
+
+    with pytest.raises(CacheBundleError, match="manifest"):
+        import_cache(str(cache_dir), str(bundle))
+
+    assert sorted(os.listdir(cache_dir / "registry")) == before
+
+
+def test_import_rejects_other_archives(tmp_path):
+    bundle = tmp_path / "cache.tar.gz"
+    bundle.write_bytes(b"not a tar")
+
+    with pytest.raises(CacheBundleError):
+        import_cache(str(tmp_path / "cache"), str(bundle))
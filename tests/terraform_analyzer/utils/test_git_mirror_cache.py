@@ -0,0 +1,82 @@
+import os
+import time
+import git
+import pytest
+from terraform_analyzer.utils.git_mirror_cache import GitMirrorCache
+
+AUTHOR = git.Actor("test", "test@example.com")
+
+
+def commit_file(repo, relative_path, content):
+    path = os.path.join(repo.working_tree_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    repo.index.add([relative_path])
+    return repo.index.commit(f"update {relative_path}", author=AUTHOR, committer=AUTHOR).hexsha
+
+
+@pytest.fixture
+def source(tmp_path):
+    repo = git.Repo.init(tmp_path / "source", initial_branch="main")
+    commit_file(repo, "infra/main.tf", "terraform {}\n")
+    commit_file(repo, "app/readme.md", "hello\n")
+    return repo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitMirrorCache(str(tmp_path / "mirrors"))
+
+
+def test_update_clones_then_fetches_incrementally(source, cache):
+    """The first update creates the mirror, later ones pick up new commits."""
+    url = source.working_tree_dir
+    mirror_path, first = cache.update(url, "main")
+    assert first == source.head.commit.hexsha
+    assert os.path.isdir(mirror_path)
+
+    second_sha = commit_file(source, "infra/versions.tf", "# v2\n")
+    same_path, second = cache.update(url, "main")
+    assert same_path == mirror_path
+    assert second == second_sha
+
+
+def test_update_default_branch(source, cache):
+    """Without a branch the remote HEAD is analyzed."""
+    _, commit = cache.update(source.working_tree_dir)
+    assert commit == source.head.commit.hexsha
+
+
+def test_export_whole_tree_or_path(source, cache, tmp_path):
+    mirror_path, commit = cache.update(source.working_tree_dir, "main")
+
+    cache.export(mirror_path, commit, str(tmp_path / "full"))
+    assert (tmp_path / "full" / "infra" / "main.tf").exists()
+    assert (tmp_path / "full" / "app" / "readme.md").exists()
+
+    cache.export(mirror_path, commit, str(tmp_path / "sparse"), ["infra"])
+    assert (tmp_path / "sparse" / "infra" / "main.tf").exists()
+    assert not (tmp_path / "sparse" / "app").exists()
+
+
+def test_evict_least_recently_used(tmp_path):
+    """Mirrors not used during the run are evicted oldest first until the budget is met."""
+    sources = []
+    for name in ("old", "recent"):
+        repo = git.Repo.init(tmp_path / name, initial_branch="main")
+        commit_file(repo, "main.tf", name * 1000)
+        sources.append(repo)
+
+    warm = GitMirrorCache(str(tmp_path / "mirrors"))
+    old_path, _ = warm.update(sources[0].working_tree_dir, "main")
+    recent_path, _ = warm.update(sources[1].working_tree_dir, "main")
+    past = time.time() - 3600
+    os.utime(old_path, (past, past))
+
+    cache = GitMirrorCache(str(tmp_path / "mirrors"), max_size=1)
+    used_path, _ = cache.update(sources[1].working_tree_dir, "main")
+    assert cache.evict() > 0
+
+    assert not os.path.exists(old_path)
+    assert os.path.exists(used_path)  # Used during this run
@@ -0,0 +1,87 @@
+import pytest
+from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
+from terraform_analyzer.utils.history_backends import (
+    JsonHistoryBackend, JsonLinesHistoryBackend, open_history_backend
+)
+from terraform_analyzer.utils.history_manager import HistoryManager
+
+
+def make_result(name, current_version="4.0.0", error=None):
+    return AnalysisResult(
+        repository=RepositoryInfo(name=name, repository=f"https://example.com/{name}.git", terraform_path="."),
+        terraform_version="1.5.0",
+        provider_versions={
+            "registry.terraform.io/hashicorp/aws": ProviderVersion(current_version=current_version,
+                                                                   latest_version="5.0.0")
+        },
+        error=error
+    )
+
+
+def test_backend_follows_extension(tmp_path):
+    assert isinstance(open_history_backend(str(tmp_path / "h.jsonl")), JsonLinesHistoryBackend)
+    assert isinstance(open_history_backend(str(tmp_path / "h.json")), JsonHistoryBackend)
+
+
+def test_jsonl_only_appends_new_entries(tmp_path):
+    """Each entry adds one line, earlier lines are never rewritten."""
+    history_file = tmp_path / "history.jsonl"
+    manager = HistoryManager(str(history_file))
+    manager.add_entry(make_result("a"))
+    first_line = history_file.read_text()
+    manager.add_entry(make_result("b"))
+    manager.add_entry(make_result("a", current_version="4.1.0"))
+
+    content = history_file.read_text()
+    assert content.startswith(first_line)
+    assert len(content.splitlines()) == 3
+
+    reloaded = HistoryManager(str(history_file))
+    assert [e.provider_versions["registry.terraform.io/hashicorp/aws"]["current_version"]
+            for e in reloaded.history["a"]] == ["4.0.0", "4.1.0"]
+    assert len(reloaded.get_version_changes("a")) == 1
+
+
+def test_jsonl_recovers_from_interrupted_write(tmp_path):
+    """A truncated last line is ignored and the next entry starts on a new line."""
+    history_file = tmp_path / "history.jsonl"
+    manager = HistoryManager(str(history_file))
+    manager.add_entry(make_result("a"))
+    with open(history_file, "a") as f:
+        f.write('{"timestamp": "2024-')
+
+    manager = HistoryManager(str(history_file))
+    assert len(manager.history["a"]) == 1
+    manager.add_entry(make_result("b"))
+    assert sorted(HistoryManager(str(history_file)).history) == ["a", "b"]
+
+
+def test_json_write_is_atomic(tmp_path, monkeypatch):
+    """A failing write leaves the previous JSON history intact."""
+    history_file = tmp_path / "history.json"
+    manager = HistoryManager(str(history_file))
+    manager.add_entry(make_result("a"))
+    before = history_file.read_text()
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr("os.replace", fail)
+    with pytest.raises(OSError):
+        manager.add_entry(make_result("b"))
+    assert history_file.read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["history.json"]
+
+
+def test_migrate_json_to_jsonl(tmp_path):
+    source = HistoryManager(str(tmp_path / "history.json"))
+    source.add_entry(make_result("a"))
+    source.add_entry(make_result("b", error="boom"))
+    source.add_entry(make_result("a", current_version="4.1.0"))
+
+    assert source.migrate(str(tmp_path / "history.jsonl")) == 3
+
+    migrated = HistoryManager(str(tmp_path / "history.jsonl"))
+    assert {name: len(entries) for name, entries in migrated.history.items()} == {"a": 2, "b": 1}
+    assert migrated.history["b"][0].error == "boom"
+    assert migrated.get_repository_history("a").provider_versions[
+        "registry.terraform.io/hashicorp/aws"].current_version == "4.1.0"
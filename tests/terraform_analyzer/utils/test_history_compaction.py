@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from terraform_analyzer.models.repository import RepositoryInfo
+from terraform_analyzer.models.history import HistoryEntry
+from terraform_analyzer.utils.history_compaction import merge_unchanged, downsample, compact_entries
+from terraform_analyzer.utils.history_manager import HistoryManager
+
+AWS = "registry.terraform.io/hashicorp/aws"
+REPOSITORY = RepositoryInfo(name="repo", repository="https://example.com/repo.git", terraform_path=".")
+NOW = datetime(2024, 6, 1)
+
+
+def entry(days_ago, version="4.0.0", error=None, commit="abc"):
+    return HistoryEntry(
+        timestamp=NOW - timedelta(days=days_ago),
+        repository=REPOSITORY,
+        terraform_version="1.5.0",
+        provider_versions={} if error else {AWS: {"current_version": version, "latest_version": "5.0.0"}},
+        error=error,
+        commit_sha=commit
+    )
+
+
+def test_merge_unchanged_keeps_first_and_last_seen():
+    entries = [entry(5), entry(4), entry(3, commit="def"), entry(2, "4.1.0"), entry(1, "4.1.0")]
+    merged = merge_unchanged(entries)
+
+    assert [(e.run_count, e.first_seen, e.timestamp) for e in merged] == [
+        (3, NOW - timedelta(days=5), NOW - timedelta(days=3)),
+        (2, NOW - timedelta(days=2), NOW - timedelta(days=1)),
+    ]
+    assert merged[0].commit_sha == "def"
+
+
+def test_errors_break_runs():
+    entries = [entry(3), entry(2, error="boom"), entry(1)]
+    assert [e.run_count for e in merge_unchanged(entries)] == [1, 1, 1]
+
+
+def test_downsample_old_entries_weekly():
+    """Daily entries older than 90 days are reduced to one per week, recent ones are kept."""
+    entries = [entry(days, version=str(days)) for days in range(200, 0, -1)]
+    kept = downsample(entries, NOW, timedelta(days=90), timedelta(days=7))
+
+    old = [e for e in kept if NOW - e.timestamp > timedelta(days=90)]
+    recent = [e for e in kept if NOW - e.timestamp <= timedelta(days=90)]
+    assert len(recent) == 90
+    assert 15 <= len(old) <= 17
+    weeks = [(e.timestamp - datetime(1970, 1, 5)).days // 7 for e in old]
+    assert len(set(weeks)) == len(weeks)
+
+
+def test_retention_keeps_last_successful_entries():
+    """Entries past retention are dropped, except the latest and the last two successful ones."""
+    entries = [entry(400, "3.0.0"), entry(300, "3.1.0"), entry(200, "3.2.0"), entry(100, error="boom")]
+    kept = downsample(entries, NOW, None, timedelta(days=7), retention=timedelta(days=30))
+    assert [e.provider_versions.get(AWS, {}).get("current_version") for e in kept] == ["3.1.0", "3.2.0", None]
+
+
+@pytest.mark.parametrize("history_name", ["history.json", "history.jsonl"])
+def test_compact_preserves_version_changes(tmp_path, history_name):
+    """get_version_changes answers the same before and after compaction."""
+    scenarios = {
+        "unchanged": [entry(3), entry(2), entry(1)],
+        "upgraded": [entry(4), entry(3), entry(2, "4.1.0")],
+        "upgraded-then-stable": [entry(4), entry(3, "4.1.0"), entry(2, "4.1.0")],
+        "error-between": [entry(4), entry(3, error="boom"), entry(2), entry(1, "4.2.0")],
+    }
+    history_file = str(tmp_path / history_name)
+    manager = HistoryManager(history_file)
+    manager.backend.rewrite({
+        name: [HistoryEntry(**{**vars(e), "repository": RepositoryInfo(name, REPOSITORY.repository, ".")})
+               for e in entries]
+        for name, entries in scenarios.items()
+    })
+
+    before = {name: HistoryManager(history_file).get_version_changes(name) for name in scenarios}
+    assert HistoryManager(history_file).compact(now=NOW) == (13, 9)
+    after = {name: HistoryManager(history_file).get_version_changes(name) for name in scenarios}
+
+    assert after == before
+    assert [len(before[name]) for name in scenarios] == [0, 1, 0, 1]
+
+
+def test_compact_entries_round_trip(tmp_path):
+    """Compacted entries keep their run count and first timestamp in the history file."""
+    manager = HistoryManager(str(tmp_path / "history.jsonl"))
+    manager.backend.rewrite({"repo": compact_entries([entry(3), entry(2), entry(1)], now=NOW)})
+
+    latest = HistoryManager(str(tmp_path / "history.jsonl")).get_latest_successful_entry("repo")
+    assert latest.run_count == 3
+    assert latest.first_seen == NOW - timedelta(days=3)
@@ -0,0 +1,83 @@
+import csv
+import pytest
+from datetime import datetime
+from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
+from terraform_analyzer.models.history import HistoryEntry
+from terraform_analyzer.models.exceptions import HistoryError
+from terraform_analyzer.utils.history_export import export_history, COLUMNS
+from terraform_analyzer.utils.history_manager import HistoryManager
+
+AWS = "registry.terraform.io/hashicorp/aws"
+AZURERM = "registry.terraform.io/hashicorp/azurerm"
+
+
+def make_entry(timestamp, name="repo", error=None):
+    result = AnalysisResult(
+        repository=RepositoryInfo(name=name, repository=f"https://example.com/{name}.git", terraform_path="."),
+        terraform_version="1.5.0",
+        provider_versions={} if error else {
+            AWS: ProviderVersion(current_version="4.0.0", latest_version="5.0.0"),
+            AZURERM: ProviderVersion(current_version="3.0.0", latest_version=None),
+        },
+        error=error
+    )
+    return HistoryEntry.from_analysis_result(result, timestamp)
+
+
+def read_partition(directory, month):
+    with open(directory / f"month={month}" / "history.csv", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_csv_partitioned_by_month(tmp_path):
+    entries = [
+        make_entry(datetime(2024, 1, 31, 23, 0)),
+        make_entry(datetime(2024, 2, 1, 1, 0), name="other"),
+        make_entry(datetime(2024, 2, 2), error="boom"),
+    ]
+    assert export_history(entries, str(tmp_path)) == 4
+
+    january = read_partition(tmp_path, "2024-01")
+    assert list(january[0]) == COLUMNS
+    assert [(r["repository"], r["provider"], r["current_version"]) for r in january] == [
+        ("repo", AWS, "4.0.0"), ("repo", AZURERM, "3.0.0")
+    ]
+    assert january[0]["timestamp"] == "2024-01-31T23:00:00"
+    assert january[1]["latest_version"] == ""
+    assert [r["repository"] for r in read_partition(tmp_path, "2024-02")] == ["other", "other"]
+
+
+def test_export_streams_entries(tmp_path):
+    """Entries are consumed one at a time, never collected in memory."""
+    consumed = []
+
+    def entries():
+        for day in range(1, 4):
+            consumed.append(day)
+            yield make_entry(datetime(2024, 3, day))
+
+    assert export_history(entries(), str(tmp_path)) == 6
+    assert consumed == [1, 2, 3]
+
+
+def test_export_from_history_manager(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    manager = HistoryManager(history_file)
+    manager.backend.rewrite({"repo": [make_entry(datetime(2024, 1, 1)), make_entry(datetime(2024, 2, 1))]})
+
+    manager = HistoryManager(history_file)
+    assert export_history(manager.iter_entries(), str(tmp_path / "export")) == 4
+    assert sorted(p.name for p in (tmp_path / "export").iterdir()) == ["month=2024-01", "month=2024-02"]
+
+
+def test_unknown_export_format(tmp_path):
+    with pytest.raises(HistoryError):
+        export_history([], str(tmp_path), "xlsx")
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    assert export_history([make_entry(datetime(2024, 1, 1))], str(tmp_path), "parquet") == 2
+    table = pq.read_table(str(tmp_path / "month=2024-01" / "history.parquet"))
+    assert table.column_names == COLUMNS
+    assert table.num_rows == 2
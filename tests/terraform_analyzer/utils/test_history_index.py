@@ -0,0 +1,84 @@
+import json
+import pytest
+from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
+from terraform_analyzer.models.history import HistoryEntry
+from terraform_analyzer.utils.history_index import HistoryIndex
+from terraform_analyzer.utils.history_manager import HistoryManager
+
+AWS = "registry.terraform.io/hashicorp/aws"
+
+
+def make_result(name, current_version="4.0.0", error=None):
+    return AnalysisResult(
+        repository=RepositoryInfo(name=name, repository=f"https://example.com/{name}.git", terraform_path="."),
+        terraform_version="1.5.0",
+        provider_versions={AWS: ProviderVersion(current_version=current_version, latest_version="5.0.0")},
+        error=error
+    )
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    history_file = str(tmp_path / "history.jsonl")
+    manager = HistoryManager(history_file)
+    manager.add_entry(make_result("a", "4.0.0"))
+    manager.add_entry(make_result("b"))
+    manager.add_entry(make_result("a", "4.1.0"))
+    manager.add_entry(make_result("a", error="boom"))
+    return history_file
+
+
+def test_queries_do_not_load_history(history_file, mocker):
+    """--show-history and --show-changes only read the indexed entries."""
+    manager = HistoryManager(history_file)
+    mocker.patch.object(manager.backend, "load", side_effect=AssertionError("history loaded"))
+
+    assert manager.get_repository_names() == ["a", "b"]
+    assert manager.get_repository_history("a") is None  # latest entry failed
+    assert manager.get_repository_history("b").provider_versions[AWS].current_version == "4.0.0"
+    assert manager.get_latest_successful_entry("a").provider_versions[AWS]["current_version"] == "4.1.0"
+    changes = manager.get_version_changes("a")
+    assert [(c.old_version.current_version, c.new_version.current_version) for c in changes] == [("4.0.0", "4.1.0")]
+
+
+def test_lazy_results_match_full_load(history_file):
+    lazy = HistoryManager(history_file)
+    eager = HistoryManager(history_file)
+    eager.history  # Force the full load
+
+    for name in ["a", "b", "unknown"]:
+        assert lazy.get_repository_history(name) == eager.get_repository_history(name)
+        assert lazy.get_version_changes(name) == eager.get_version_changes(name)
+        assert lazy.get_latest_successful_entry(name) == eager.get_latest_successful_entry(name)
+
+
+def test_entries_added_after_opening_are_visible(history_file):
+    manager = HistoryManager(history_file)
+    manager.add_entry(make_result("a", "4.2.0"))
+    manager.add_entry(make_result("c"))
+
+    assert manager.get_repository_names() == ["a", "b", "c"]
+    changes = manager.get_version_changes("a")
+    assert [(c.old_version.current_version, c.new_version.current_version) for c in changes] == [("4.1.0", "4.2.0")]
+
+
+def test_index_only_reads_appended_lines(history_file, mocker):
+    """Opening the index parses the lines appended by other writers, not the whole file."""
+    entry = HistoryEntry.from_analysis_result(make_result("b", "4.5.0"))
+    with open(history_file, "a") as f:
+        f.write(json.dumps(entry.to_dict()) + "\n")
+
+    index_line = mocker.spy(HistoryIndex, "_index_line")
+    manager = HistoryManager(history_file)
+
+    assert index_line.call_count == 1
+    assert manager.get_repository_history("b").provider_versions[AWS].current_version == "4.5.0"
+
+
+def test_rewritten_history_is_reindexed(history_file, tmp_path):
+    HistoryManager(history_file).migrate(str(tmp_path / "copy.jsonl"))
+    HistoryManager(str(tmp_path / "copy.jsonl")).migrate(history_file)
+
+    index = HistoryIndex.open(history_file)
+    assert index.latest("a").error == "boom"
+    assert [e.provider_versions[AWS]["current_version"] for e in index.successful("a")] == ["4.0.0", "4.1.0"]
@@ -1,3 +1,4 @@
+import threading
 import pytest
 from datetime import datetime
 from terraform_analyzer.models.repository import RepositoryInfo, AnalysisResult, ProviderVersion
@@ -119,4 +120,67 @@ def test_error_handling(history_manager, sample_repository):
     
     history_manager.add_entry(error_result)
     history = history_manager.get_repository_history(sample_repository.name)
-    assert history is None
\ No newline at end of file
+    assert history is None
+
+def test_latest_successful_entry_keeps_commit_and_fingerprint(tmp_path, sample_repository):
+    """Test that the analyzed commit and fingerprint survive a reload of the history file"""
+    history_file = tmp_path / "test_history.json"
+    manager = HistoryManager(history_file)
+    manager.add_entry(AnalysisResult(
+        repository=sample_repository,
+        terraform_version="1.5.0",
+        provider_versions={
+            "registry.terraform.io/hashicorp/aws": ProviderVersion(current_version="4.0.0", latest_version="5.0.0")
+        },
+        commit_sha="abc123",
+        fingerprint="lock:deadbeef"
+    ))
+    manager.add_entry(AnalysisResult(repository=sample_repository, error="Test error"))
+
+    entry = HistoryManager(history_file).get_latest_successful_entry(sample_repository.name)
+    assert entry.commit_sha == "abc123"
+    assert entry.fingerprint == "lock:deadbeef"
+    assert HistoryManager(history_file).get_latest_successful_entry("unknown") is None
+
+def make_results(sample_repository, count):
+    return [
+        AnalysisResult(
+            repository=RepositoryInfo(
+                name=f"{sample_repository.name}-{i}",
+                repository=sample_repository.repository,
+                terraform_path=sample_repository.terraform_path
+            ),
+            terraform_version="1.5.0",
+            provider_versions={
+                "registry.terraform.io/hashicorp/aws": ProviderVersion(current_version="4.0.0", latest_version="5.0.0")
+            }
+        )
+        for i in range(count)
+    ]
+
+def test_add_entries_writes_once(tmp_path, sample_repository, mocker):
+    """Test that a whole run is committed with a single write sharing one timestamp"""
+    manager = HistoryManager(tmp_path / "test_history.json")
+    append = mocker.spy(manager.backend, "append")
+
+    entries = manager.add_entries(make_results(sample_repository, 5))
+
+    assert append.call_count == 1
+    assert len({entry.timestamp for entry in entries}) == 1
+    assert len(HistoryManager(tmp_path / "test_history.json").history) == 5
+
+def test_background_write(tmp_path, sample_repository, mocker):
+    """Test that a background write returns immediately and flush waits for it"""
+    history_file = tmp_path / "test_history.json"
+    manager = HistoryManager(history_file)
+    release = threading.Event()
+    rewrite = manager.backend.rewrite
+    mocker.patch.object(manager.backend, "rewrite", side_effect=lambda history: (release.wait(5), rewrite(history)))
+
+    manager.add_entries(make_results(sample_repository, 2), background=True)
+    assert not history_file.exists()
+    assert len(manager.history) == 2
+
+    release.set()
+    manager.flush()
+    assert len(HistoryManager(history_file).history) == 2
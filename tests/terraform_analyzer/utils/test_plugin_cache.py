@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from terraform_analyzer.utils.plugin_cache import PluginCache
+from terraform_analyzer.analyzers.terraform_analyzer import TerraformAnalyzer
+
+AWS = "registry.terraform.io/hashicorp/aws"
+LOCK_FILE = f'provider "{AWS}" {{\n  version = "5.0.0"\n}}\n'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PluginCache(str(tmp_path / "plugins"))
+
+
+@pytest.fixture
+def terraform_dir(tmp_path):
+    terraform_dir = tmp_path / "terraform"
+    terraform_dir.mkdir()
+    (terraform_dir / ".terraform.lock.hcl").write_text(LOCK_FILE)
+    return terraform_dir
+
+
+def fake_init(cache, terraform_dir, size=1000):
+    """Simulate terraform init: populate the cache if needed and link the provider from it."""
+    cached = os.path.join(cache.cache_dir, AWS, "5.0.0", "linux_amd64")
+    if not os.path.isdir(cached):
+        os.makedirs(cached)
+        with open(os.path.join(cached, "terraform-provider-aws"), "wb") as f:
+            f.write(b"0" * size)
+    installed = os.path.join(str(terraform_dir), ".terraform", "providers", AWS, "5.0.0")
+    os.makedirs(installed, exist_ok=True)
+    link = os.path.join(installed, "linux_amd64")
+    if not os.path.exists(link):
+        os.symlink(cached, link)
+
+
+def test_environment(tmp_path):
+    cache = PluginCache(str(tmp_path / "plugins"), mirror_dir=str(tmp_path / "mirror"))
+    env = cache.environment()
+    assert env["TF_PLUGIN_CACHE_DIR"] == cache.cache_dir
+    with open(env["TF_CLI_CONFIG_FILE"]) as f:
+        assert f'path = "{tmp_path / "mirror"}"' in f.read()
+
+
+def test_downloaded_then_served_from_cache(cache, terraform_dir, tmp_path):
+    """The first init downloads into the cache, the next ones are served from it."""
+    assert not cache.is_cached(str(terraform_dir))
+    with cache.locked_init(str(terraform_dir)):
+        fake_init(cache, terraform_dir)
+    assert cache.stats() == {"downloaded": 1000, "from_cache": 0}
+
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / ".terraform.lock.hcl").write_text(LOCK_FILE)
+    assert cache.is_cached(str(other_dir))
+    with cache.locked_init(str(other_dir)):
+        fake_init(cache, other_dir)
+    assert cache.stats() == {"downloaded": 1000, "from_cache": 1000}
+
+
+def test_downloading_inits_are_serialized(cache, terraform_dir):
+    """Inits that may write to the cache never overlap."""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def init():
+        with cache.locked_init(str(terraform_dir)):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+    threads = [threading.Thread(target=init) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state["peak"] == 1
+
+
+def test_terraform_init_uses_plugin_cache(cache, terraform_dir):
+    TerraformAnalyzer.set_plugin_cache(cache)
+    try:
+        with patch('subprocess.Popen') as mock_popen:
+            mock_popen.return_value.communicate.return_value = ("", "")
+            mock_popen.return_value.returncode = 0
+            TerraformAnalyzer._terraform_init(str(terraform_dir))
+    finally:
+        TerraformAnalyzer.set_plugin_cache(None)
+
+    assert mock_popen.call_args.kwargs["env"]["TF_PLUGIN_CACHE_DIR"] == cache.cache_dir
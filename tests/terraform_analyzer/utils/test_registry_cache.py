@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from terraform_analyzer.utils.registry_cache import RegistryCache
+from terraform_analyzer.utils.registry_client import RegistryClient
+
+AWS = "registry.terraform.io/hashicorp/aws"
+VERSIONS = [{"version": "5.0.0"}, {"version": "5.1.0"}]
+
+
+def make_response(status_code=200, versions=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.iter_content.return_value = [json.dumps({"versions": versions or []}).encode()]
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RegistryCache(str(tmp_path / "registry"), ttl=3600)
+
+
+def test_store_and_load(cache):
+    """Records survive a new cache instance on the same directory."""
+    cache.store(AWS, VERSIONS, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    record = RegistryCache(cache.cache_dir).load(AWS)
+    assert record["versions"] == VERSIONS
+    assert record["etag"] == '"abc"'
+    assert cache.is_fresh(record)
+
+
+def test_miss_then_hit(cache):
+    """The first lookup downloads, the next one within the TTL is served from disk."""
+    client = RegistryClient("https://registry.example.com", cache=cache)
+    with patch('requests.Session.get', return_value=make_response(versions=VERSIONS,
+                                                                   headers={"ETag": '"abc"'})) as mock_get:
+        assert client.get_versions(AWS) == VERSIONS
+        assert client.get_versions(AWS) == VERSIONS
+
+    assert mock_get.call_count == 1
+    assert cache.stats() == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+def test_stale_record_is_revalidated(cache):
+    """A stale record is revalidated with ETag/If-Modified-Since and reused on 304."""
+    cache.store(AWS, VERSIONS, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.ttl = 0
+    client = RegistryClient("https://registry.example.com", cache=cache)
+
+    with patch('requests.Session.get', return_value=make_response(status_code=304)) as mock_get:
+        assert client.get_versions(AWS) == VERSIONS
+
+    headers = mock_get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_concurrent_lookups_share_one_fetch(cache):
+    """Simultaneous lookups of the same provider trigger a single request."""
+    client = RegistryClient("https://registry.example.com", cache=cache)
+    started = threading.Event()
+
+    def slow_get(url, **kwargs):
+        started.set()
+        time.sleep(0.05)
+        return make_response(versions=VERSIONS)
+
+    results = []
+    with patch('requests.Session.get', side_effect=slow_get) as mock_get:
+        threads = [threading.Thread(target=lambda: results.append(client.get_versions(AWS)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_get.call_count == 1
+    assert results == [VERSIONS] * 5
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_versions_are_reduced(cache):
+    """Only the version and protocols of each release are cached, not their platforms."""
+    client = RegistryClient("https://registry.example.com", cache=cache)
+    versions = [{"version": "5.0.0", "protocols": ["5.0"], "platforms": [{"os": "linux", "arch": "amd64"}]}]
+    with patch('requests.Session.get', return_value=make_response(versions=versions)) as mock_get:
+        assert client.get_versions(AWS) == [{"version": "5.0.0", "protocols": ["5.0"]}]
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    assert cache.load(AWS)["versions"] == [{"version": "5.0.0", "protocols": ["5.0"]}]
@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from terraform_analyzer.utils.registry_client import RegistryClient
+
+PROVIDERS = [f"registry.terraform.io/hashicorp/p{i}" for i in range(10)]
+
+
+def make_response(versions, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.iter_content.return_value = [json.dumps({"versions": versions}).encode()]
+    return response
+
+
+def test_get_versions_uses_pooled_session():
+    """Every lookup goes through the same session."""
+    client = RegistryClient("https://registry.example.com/v1/providers/")
+    with patch('requests.Session.get', return_value=make_response([{"version": "1.0.0"}])) as mock_get:
+        client.get_versions("registry.terraform.io/hashicorp/aws")
+        session = client.session
+        client.get_versions("registry.terraform.io/hashicorp/google")
+
+    assert client.session is session
+    assert mock_get.call_args_list[0].args[0] == "https://registry.example.com/v1/providers/hashicorp/aws/versions"
+    assert mock_get.call_args_list[1].args[0] == "https://registry.example.com/v1/providers/hashicorp/google/versions"
+
+
+def test_get_versions_invalid_address_or_status():
+    """Malformed addresses and non-200 responses yield no versions."""
+    client = RegistryClient("https://registry.example.com")
+    assert client.get_versions("aws") is None
+    with patch('requests.Session.get', return_value=make_response([], status_code=404)):
+        assert client.get_versions("registry.terraform.io/hashicorp/aws") is None
+
+
+def test_get_versions_many_respects_concurrency_cap():
+    """No more than max_workers lookups are in flight at the same time."""
+    client = RegistryClient("https://registry.example.com", max_workers=3)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def slow_get(url, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return make_response([{"version": "1.0.0"}])
+
+    with patch('requests.Session.get', side_effect=slow_get):
+        results = client.get_versions_many(PROVIDERS)
+
+    assert set(results) == set(PROVIDERS)
+    assert 1 < state["peak"] <= 3
+
+
+def test_get_versions_many_isolates_failures():
+    """A failing lookup does not prevent the others from being returned."""
+    client = RegistryClient("https://registry.example.com")
+
+    def flaky_get(url, **kwargs):
+        if url.endswith("/p3/versions"):
+            raise ConnectionError("reset")
+        return make_response([{"version": "1.0.0"}])
+
+    with patch('requests.Session.get', side_effect=flaky_get):
+        results = client.get_versions_many(PROVIDERS)
+
+    assert PROVIDERS[3] not in results
+    assert len(results) == len(PROVIDERS) - 1
+
+
+def test_get_versions_network_mirror():
+    """With the mirror protocol, versions are read from the index.json of the provider."""
+    client = RegistryClient("https://mirror.example.com/providers/", protocol="mirror")
+    response = make_response([])
+    response.iter_content.return_value = [b'{"versions": {"5.0.0": {}, "5.1.0": {}}}']
+    with patch('requests.Session.get', return_value=response) as mock_get:
+        versions = client.get_versions("registry.terraform.io/hashicorp/aws")
+
+    assert versions == [{"version": "5.0.0"}, {"version": "5.1.0"}]
+    assert mock_get.call_args.args[0] == "https://mirror.example.com/providers/registry.terraform.io/hashicorp/aws/index.json"
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        RegistryClient("https://registry.example.com", max_workers=0)
+
+
+def test_invalid_protocol():
+    with pytest.raises(ValueError):
+        RegistryClient("https://registry.example.com", protocol="ftp")
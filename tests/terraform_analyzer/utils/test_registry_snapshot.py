@@ -0,0 +1,46 @@
+import json
+import pytest
+from terraform_analyzer.models.exceptions import RegistryError
+from terraform_analyzer.utils.registry_cache import RegistryCache
+from terraform_analyzer.utils.registry_snapshot import RegistrySnapshot, export_snapshot
+
+AWS = "registry.terraform.io/hashicorp/aws"
+GOOGLE = "registry.terraform.io/hashicorp/google"
+
+
+def test_export_then_load(tmp_path):
+    """A snapshot exported from the cache answers the same lookups, platforms excluded."""
+    cache = RegistryCache(str(tmp_path / "registry"), ttl=0)
+    cache.store(AWS, [{"version": "5.0.0", "protocols": ["5.0"], "platforms": [{"os": "linux"}]}])
+    cache.store(GOOGLE, [{"version": "4.0.0"}])
+    snapshot_file = tmp_path / "snapshot.json"
+
+    assert export_snapshot(cache, str(snapshot_file)) == 2
+
+    snapshot = RegistrySnapshot.load(str(snapshot_file))
+    assert snapshot.get_versions(AWS) == [{"version": "5.0.0", "protocols": ["5.0"]}]
+    assert snapshot.get_versions_many([GOOGLE, "registry.terraform.io/acme/missing", GOOGLE]) == {
+        GOOGLE: [{"version": "4.0.0"}]
+    }
+    assert snapshot.get_versions("registry.terraform.io/acme/missing") is None
+
+
+def test_load_provider_mirror_directory(tmp_path):
+    """A directory is read as a provider mirror, one index.json per provider."""
+    index = tmp_path / "registry.terraform.io" / "hashicorp" / "aws" / "index.json"
+    index.parent.mkdir(parents=True)
+    index.write_text(json.dumps({"versions": {"5.0.0": {}, "5.1.0": {}}}))
+    (index.parent / "5.0.0.json").write_text(json.dumps({"archives": {}}))
+
+    snapshot = RegistrySnapshot.load(str(tmp_path))
+
+    assert snapshot.versions == {AWS: [{"version": "5.0.0"}, {"version": "5.1.0"}]}
+
+
+@pytest.mark.parametrize("content", ["not json", '{"providers": {}}', '{"format_version": 99}'])
+def test_load_invalid_snapshot(tmp_path, content):
+    snapshot_file = tmp_path / "snapshot.json"
+    snapshot_file.write_text(content)
+
+    with pytest.raises(RegistryError):
+        RegistrySnapshot.load(str(snapshot_file))
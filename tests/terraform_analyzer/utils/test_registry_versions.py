@@ -0,0 +1,76 @@
+import json
+import pytest
+from terraform_analyzer.utils.registry_versions import parse_versions, reduce_versions
+
+PLATFORMS = [{"os": os_name, "arch": arch} for os_name in ("linux", "darwin", "windows") for arch in ("amd64", "arm64")]
+
+
+def registry_payload(count):
+    return {
+        "id": "hashicorp/aws",
+        "versions": [
+            {"version": f"5.{minor}.0", "protocols": ["5.0"], "platforms": PLATFORMS}
+            for minor in range(count)
+        ],
+        "warnings": None
+    }
+
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_parse_versions_matches_json(chunk_size):
+    """Whatever the chunking, the versions match a full parse without their platforms."""
+    payload = registry_payload(50)
+    versions = parse_versions(chunked(json.dumps(payload, indent=2), chunk_size))
+
+    assert versions == reduce_versions(payload["versions"])
+    assert versions[0] == {"version": "5.0.0", "protocols": ["5.0"]}
+
+
+def test_parse_versions_any_field_order_and_nesting():
+    """Fields are read in any order and deeply nested values are skipped."""
+    text = ('{"meta": {"a": [[1, [2]], {"b": "}]\\""}]}, "versions": ['
+            '{"platforms": [{"os": "linux", "extra": [[1]]}], "protocols": ["4.0", "5.1"], "version": "1.0.0"},'
+            '{"version": "2.0.0-beta\\u00e9", "n": -1.5e3, "ok": true}, {}],'
+            '"warnings": null}')
+
+    assert parse_versions(chunked(text, 5)) == [
+        {"version": "1.0.0", "protocols": ["4.0", "5.1"]},
+        {"version": "2.0.0-betaé"},
+        {}
+    ]
+
+
+def test_parse_versions_without_versions():
+    assert parse_versions([b'{}']) == []
+    assert parse_versions([b'{"versions": []}']) == []
+
+
+@pytest.mark.parametrize("text", ['', '[]', '{"versions": [{"version": "1.0.0"}', '{"versions": [1 2]}'])
+def test_parse_versions_invalid(text):
+    with pytest.raises(ValueError):
+        parse_versions(chunked(text, 4))
+
+
+def test_parse_versions_network_mirror_index():
+    """The versions object of a network mirror index.json is read as a list."""
+    text = '{"versions": {"2.0.0": {}, "2.0.1": {"extra": [1]}}}'
+
+    assert parse_versions(chunked(text, 3)) == [{"version": "2.0.0"}, {"version": "2.0.1"}]
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(registry_payload(3)),
+    '{"versions":[{"version":"1.0","n":2.5,"m":-10.25e+3,"protocols":["5.0"]},{"version":"1.1","n":10}],"total":125}',
+])
+def test_parse_versions_split_at_every_offset(text):
+    """A response split in two chunks at any byte parses like the whole response."""
+    expected = parse_versions([text.encode()])
+
+    for offset in range(len(text) + 1):
+        data = text.encode()
+        assert parse_versions([data[:offset], data[offset:]]) == expected, offset